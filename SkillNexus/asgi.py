@@ -3,6 +3,10 @@ ASGI config for SkillNexus project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project through this module (e.g. ``uvicorn SkillNexus.asgi:application``)
+to use the match request event stream at /events/matches/: each open stream is
+an async task on the worker's event loop rather than a blocked thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -64,6 +64,7 @@ LOGIN_REDIRECT_URL = '/engagements/'  # Redirect to the engagements page after l
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'home.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -93,6 +94,37 @@ TEMPLATES = [
 WSGI_APPLICATION = 'SkillNexus.wsgi.application'
 
 
+REST_FRAMEWORK = {
+    # orjson-backed when installed, stdlib JSON otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'home.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Token buckets (home.throttling) for views that set throttle_scope; rates
+    # are "<scope>.<user|ip|endpoint>", the endpoint bucket being shared by all clients
+    'DEFAULT_THROTTLE_CLASSES': [
+        'home.throttling.UserBucketThrottle',
+        'home.throttling.IPBucketThrottle',
+        'home.throttling.EndpointBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login.ip': '10/min',
+        'login.endpoint': '20/s',        # PBKDF2 costs ~0.1 s of CPU per attempt
+        'register.ip': '5/h',
+        'register.endpoint': '10/s',
+        'posts.user': '60/min',
+        'posts.ip': '120/min',
+    },
+}
+
+# Where the throttles keep their buckets. The default SQLite file is shared by
+# the workers of one host; with several hosts use home.throttling.CacheBucketStore
+# and point THROTTLE_CACHE at a shared cache, e.g. Django's RedisCache.
+THROTTLE_STORE = os.getenv('THROTTLE_STORE', 'home.throttling.SQLiteBucketStore')
+THROTTLE_SQLITE_PATH = os.getenv('THROTTLE_SQLITE_PATH', str(BASE_DIR / 'throttle.sqlite3'))
+THROTTLE_CACHE = os.getenv('THROTTLE_CACHE', 'default')
+
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
@@ -103,6 +135,66 @@ DATABASES = {
     }
 }
 
+# High-concurrency SQLite profile for small deployments that stay on db.sqlite3.
+# WAL lets readers run alongside the writer, and IMMEDIATE transactions take the
+# write lock up front so concurrent writers wait for it ('timeout' is SQLite's
+# busy timeout, in seconds) instead of failing half-way with "database is locked".
+SQLITE_HIGH_CONCURRENCY = os.getenv('SQLITE_HIGH_CONCURRENCY', 'False').lower() == 'true'
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',     # safe with WAL, skips the fsync per commit
+    'mmap_size': 134217728,      # 128 MB
+    'cache_size': -20000,        # negative means KiB, so ~20 MB per connection
+}
+
+if SQLITE_HIGH_CONCURRENCY:
+    DATABASES['default']['OPTIONS'] = {
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    }
+
+# Async page views run their independent queries in parallel, each on its own
+# connection (home.db.gather_reads). False runs them one after another, which
+# is as fast once a process is CPU-bound (see bench_pages).
+# ASYNC_READ_THREADS caps the threads, and so the extra connections, per process.
+ASYNC_CONCURRENT_READS = os.getenv('ASYNC_CONCURRENT_READS', 'True').lower() == 'true'
+ASYNC_READ_THREADS = int(os.getenv('ASYNC_READ_THREADS', '32'))
+
+# Expensive cached values (home.caching.get_or_compute) are recomputed by one
+# worker at a time while the others serve the stale value; the lock lives in
+# the cache, so it spans processes only with a shared cache such as Redis or
+# Memcached. With background refresh the recompute runs on one of
+# CACHE_REFRESH_THREADS threads instead of delaying the request that won it.
+CACHE_BACKGROUND_REFRESH = os.getenv('CACHE_BACKGROUND_REFRESH', 'True').lower() == 'true'
+CACHE_REFRESH_THREADS = int(os.getenv('CACHE_REFRESH_THREADS', '4'))
+
+# Freelancer matches also list projects that require skills often listed
+# together with the freelancer's (home.cooccurrence, built by build_skill_graph).
+MATCH_RELATED_SKILLS = os.getenv('MATCH_RELATED_SKILLS', 'False').lower() == 'true'
+
+# Share of the freelancer match ranking taken by the precomputed TF-IDF text
+# similarity (home.textmatch); the rest is the share of required skills held.
+TEXT_MATCH_WEIGHT = float(os.getenv('TEXT_MATCH_WEIGHT', '0.3'))
+
+# Response compression (home.compression): (brotli quality 0-11, gzip level
+# 1-9) per content type. Higher levels save bandwidth at the cost of CPU on
+# every response; types not listed are never compressed. Brotli is used when
+# the package is installed and the client accepts it.
+COMPRESSION_LEVELS = {
+    'text/html': (5, 6),
+    'application/json': (4, 6),
+    'text/event-stream': (4, 6),
+    'text/csv': (5, 6),
+    'text/plain': (5, 6),
+    'text/css': (5, 6),
+    'text/javascript': (5, 6),
+    'application/javascript': (5, 6),
+    'image/svg+xml': (5, 6),
+}
+COMPRESSION_MIN_LENGTH = 512  # bytes; smaller bodies are not worth compressing
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -149,5 +241,18 @@ STATICFILES_DIRS = [
 ]
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Match request push notifications (/events/matches/). The in-process backend only
+# reaches clients connected to the same ASGI worker; use RedisBroadcast with
+# several nodes or workers.
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'home.events.InProcessBroadcast')
+EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+EVENTS_HEARTBEAT_SECONDS = 15
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Personal data exports; kept outside MEDIA_ROOT so they are only served to their owner
+EXPORTS_ROOT = BASE_DIR / 'exports'
+
+# Public address of the site, for links in emails sent outside a request
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
@@ -1,11 +1,91 @@
 from django.contrib import admin
-from .models import Profile, Project, Post, MatchRequest, Experience, Tag, Connection, CustomUser
-
-admin.site.register(CustomUser)
-admin.site.register(Profile)
-admin.site.register(Project)
-admin.site.register(Post)
-admin.site.register(MatchRequest)
-admin.site.register(Experience)
-admin.site.register(Tag)
-admin.site.register(Connection)
+from .models import Profile, Project, Post, MatchRequest, Experience, Tag, Connection, CustomUser, AccountDeletion
+from .pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist defaults that stay fast at millions of rows: estimated counts
+    instead of COUNT(*), no second count for "x of y selected", ordering by
+    primary key, and foreign keys entered by id rather than a <select> of
+    every row. Search fields use __startswith/__exact lookups, which the
+    unique indexes on email and name can serve; admin's default icontains
+    cannot use an index.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    list_per_page = 50
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(LargeTableAdmin):
+    list_display = ('id', 'email', 'first_name', 'last_name', 'user_type', 'is_active', 'date_joined')
+    list_filter = ('user_type', 'is_active', 'is_staff')
+    search_fields = ('email__startswith',)
+
+
+@admin.register(Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ('id', 'user', 'company_name', 'industry')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    autocomplete_fields = ('skills',)
+    search_fields = ('user__email__startswith',)
+
+
+@admin.register(Project)
+class ProjectAdmin(LargeTableAdmin):
+    list_display = ('id', '__str__', 'status')
+    list_select_related = ('profile__user',)
+    list_filter = ('status',)
+    raw_id_fields = ('profile',)
+    autocomplete_fields = ('required_skills', 'collaborators')
+    search_fields = ('profile__user__email__startswith',)
+
+
+@admin.register(Post)
+class PostAdmin(LargeTableAdmin):
+    list_display = ('id', 'title', 'user', 'created_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('user__email__startswith',)
+
+
+@admin.register(MatchRequest)
+class MatchRequestAdmin(LargeTableAdmin):
+    list_display = ('id', '__str__', 'status', 'created_at')
+    list_select_related = ('freelancer', 'project__profile')
+    list_filter = ('status',)
+    raw_id_fields = ('freelancer', 'project')
+    search_fields = ('freelancer__email__startswith',)
+
+
+@admin.register(Experience)
+class ExperienceAdmin(LargeTableAdmin):
+    list_display = ('id', '__str__', 'profile')
+    list_select_related = ('profile__user',)
+    raw_id_fields = ('profile',)
+    search_fields = ('profile__user__email__startswith',)
+
+
+@admin.register(Tag)
+class TagAdmin(LargeTableAdmin):
+    list_display = ('id', 'name')
+    ordering = ('name',)
+    search_fields = ('name__startswith',)
+
+
+@admin.register(Connection)
+class ConnectionAdmin(LargeTableAdmin):
+    list_display = ('id', '__str__', 'connected_at')
+    list_select_related = ('user', 'connected_to')
+    raw_id_fields = ('user', 'connected_to')
+    search_fields = ('user__email__startswith',)
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(LargeTableAdmin):
+    list_display = ('user_id', 'email', 'status', 'step', 'rows_deleted', 'requested_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('user_id__exact', 'email__startswith')
@@ -0,0 +1,126 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count, F, Sum
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from home.models import Profile, Project, TagStats
+
+PROJECT_SKILLS = Project.required_skills.through
+PROFILE_SKILLS = Profile.skills.through
+
+
+def record_tag_usage(demand=None, supply=None):
+    """
+    Add per-tag deltas (``{tag_id: n}``) to today's buckets: one insert for
+    missing rows and one ``F()`` update per distinct delta, so concurrent
+    writers never lose increments.
+    """
+    demand = {tag_id: n for tag_id, n in (demand or {}).items() if n}
+    supply = {tag_id: n for tag_id, n in (supply or {}).items() if n}
+    if not demand and not supply:
+        return
+
+    today = timezone.now().date()
+    TagStats.objects.bulk_create(
+        [TagStats(tag_id=tag_id, day=today) for tag_id in demand.keys() | supply.keys()],
+        ignore_conflicts=True,
+    )
+    for field, deltas in (('demand', demand), ('supply', supply)):
+        by_delta = {}
+        for tag_id, n in deltas.items():
+            by_delta.setdefault(n, []).append(tag_id)
+        for n, tag_ids in by_delta.items():
+            TagStats.objects.filter(tag_id__in=tag_ids, day=today).update(**{field: F(field) + n})
+
+
+def _linked_tags(through, owner_field, owner_ids, tag_ids=None):
+    rows = through.objects.filter(**{f'{owner_field}__in': owner_ids})
+    if tag_ids is not None:
+        rows = rows.filter(tag_id__in=tag_ids)
+    return Counter(rows.values_list('tag_id', flat=True))
+
+
+def _skills_changed(field, through, owner_field, instance, action, reverse, pk_set):
+    if action == 'post_add':
+        # Django only passes the rows that were actually inserted
+        if reverse:
+            delta = {instance.pk: len(pk_set)}
+        else:
+            delta = {tag_id: 1 for tag_id in pk_set}
+        record_tag_usage(**{field: delta})
+
+    elif action in ('pre_remove', 'pre_clear'):
+        # Count what is really linked before the rows disappear
+        if reverse:
+            rows = through.objects.filter(tag_id=instance.pk)
+            if pk_set is not None:
+                rows = rows.filter(**{f'{owner_field}__in': pk_set})
+            delta = {instance.pk: -rows.count()}
+        else:
+            delta = {tag_id: -n for tag_id, n in _linked_tags(through, owner_field, [instance.pk], pk_set).items()}
+        record_tag_usage(**{field: delta})
+
+
+@receiver(m2m_changed, sender=PROJECT_SKILLS)
+def project_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _skills_changed('demand', PROJECT_SKILLS, 'project', instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=PROFILE_SKILLS)
+def profile_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _skills_changed('supply', PROFILE_SKILLS, 'profile', instance, action, reverse, pk_set)
+
+
+# Cascading deletes remove through rows without m2m_changed
+@receiver(pre_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    counts = _linked_tags(PROJECT_SKILLS, 'project', [instance.pk])
+    record_tag_usage(demand={tag_id: -n for tag_id, n in counts.items()})
+
+
+@receiver(pre_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    counts = _linked_tags(PROFILE_SKILLS, 'profile', [instance.pk])
+    record_tag_usage(supply={tag_id: -n for tag_id, n in counts.items()})
+
+
+def reconcile_tag_stats():
+    """
+    Compare the bucket totals with the real M2M counts and book the difference
+    in today's bucket. Returns the number of tags that had drifted.
+    """
+    actual_demand = dict(PROJECT_SKILLS.objects.values_list('tag_id').annotate(n=Count('id')).order_by())
+    actual_supply = dict(PROFILE_SKILLS.objects.values_list('tag_id').annotate(n=Count('id')).order_by())
+    recorded = {
+        row['tag_id']: row
+        for row in TagStats.objects.values('tag_id')
+        .annotate(total_demand=Sum('demand'), total_supply=Sum('supply')).order_by()
+    }
+
+    demand, supply = {}, {}
+    for tag_id in actual_demand.keys() | actual_supply.keys() | recorded.keys():
+        row = recorded.get(tag_id, {'total_demand': 0, 'total_supply': 0})
+        demand[tag_id] = actual_demand.get(tag_id, 0) - row['total_demand']
+        supply[tag_id] = actual_supply.get(tag_id, 0) - row['total_supply']
+
+    record_tag_usage(demand=demand, supply=supply)
+    return len({t for t, n in demand.items() if n} | {t for t, n in supply.items() if n})
+
+
+def trending_skills(days=30, limit=10):
+    """Top tags by new demand, new supply and demand-supply gap over the last ``days``."""
+    since = timezone.now().date() - timedelta(days=days - 1)
+    window = TagStats.objects.filter(day__gte=since) \
+        .values('tag_id', 'tag__name') \
+        .annotate(new_demand=Sum('demand'), new_supply=Sum('supply'), gap=Sum('demand') - Sum('supply'))
+
+    def top(field):
+        return [
+            {'id': r['tag_id'], 'name': r['tag__name'], 'demand': r['new_demand'], 'supply': r['new_supply'], 'gap': r['gap']}
+            for r in window.filter(**{f'{field}__gt': 0}).order_by(f'-{field}', 'tag__name')[:limit]
+        ]
+
+    return {'demand': top('new_demand'), 'supply': top('new_supply'), 'gap': top('gap')}
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class HomeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home'
+
+    def ready(self):
+        import home.analytics  # noqa: F401  connects the tag usage counters
+        import home.counters  # noqa: F401  maintains the connection, request and collaborator counts
+        import home.dashboard  # noqa: F401  connects the admin stats cache invalidation
+        import home.discovery  # noqa: F401  connects the facet cache invalidation
+        import home.etags  # noqa: F401  bumps profile versions
+        import home.events  # noqa: F401  connects the match request signals
+        import home.exports  # noqa: F401  removes export files with their rows
+        import home.skills  # noqa: F401  keeps tag aliases and trigrams in step
+        import home.sync  # noqa: F401  records post tombstones
+        import home.textmatch  # noqa: F401  queues edited texts for reindexing
@@ -10,7 +10,7 @@ class EmailAuthBackend(ModelBackend):
         try:
             user = User.objects.get(email=username)  # Match with email
             print("User found:", user.email)  # Debugging
-            if user.check_password(password):
+            if user.check_password(password) and self.user_can_authenticate(user):
                 print("Password matched")  # Debugging
                 return user
             else:
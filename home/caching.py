@@ -0,0 +1,125 @@
+import logging
+import math
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Single-flight caching for expensive computations (admin stats, match
+# rankings, facet counts). When an entry goes stale, exactly one worker - the
+# one that wins a lock in the shared cache - recomputes it while everyone else
+# keeps serving the stale value. Entries are refreshed a little early, at
+# random, with a probability that grows as the expiry nears and with the time
+# the computation takes ("XFetch", Vattani et al.), so a hot key is usually
+# replaced before anyone sees it expire.
+
+LOCK_TIMEOUT = 30    # seconds a recompute may hold the lock
+WAIT_INTERVAL = 0.05  # seconds between polls while waiting on a cold key
+
+_refresh_executor = None
+
+
+def _get_refresh_executor():
+    global _refresh_executor
+    if _refresh_executor is None:
+        _refresh_executor = ThreadPoolExecutor(settings.CACHE_REFRESH_THREADS, thread_name_prefix='cache_refresh')
+    return _refresh_executor
+
+
+def _should_refresh(entry, version, beta):
+    if entry['version'] != version:
+        return True
+    # -log(U) is exponentially distributed: mostly small, now and then large
+    # enough to start the recompute before the entry expires
+    early = entry['delta'] * beta * -math.log(1.0 - random.random())
+    return time.time() + early >= entry['expires_at']
+
+
+def _compute_and_store(cache, key, compute, timeout, stale, version):
+    started = time.monotonic()
+    value = compute()
+    entry = {
+        'value': value,
+        'version': version,
+        'expires_at': time.time() + timeout,
+        'delta': time.monotonic() - started,
+    }
+    # Kept past its expiry so there is a stale value to serve during the recompute
+    cache.set(key, entry, timeout + stale)
+    return value
+
+
+def _release(cache, lock_key, token):
+    # Not atomic, but a lock taken over after its timeout is deleted only if
+    # the holder changed in the few microseconds between these two calls
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _refresh_in_background(cache, key, lock_key, token, compute, timeout, stale, version):
+    try:
+        _compute_and_store(cache, key, compute, timeout, stale, version)
+    except Exception:
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        _release(cache, lock_key, token)
+        # Executor threads outlive the request, like gather_reads' threads
+        close_old_connections()
+
+
+def get_or_compute(key, compute, timeout, *, version=None, stale=None, beta=1.0,
+                   lock_timeout=LOCK_TIMEOUT, background=True, using='default'):
+    """
+    The cached value of ``key``, computed with ``compute()`` by a single
+    worker at a time.
+
+    Values are fresh for ``timeout`` seconds and kept ``stale`` seconds longer
+    (default: ``timeout`` again) to be served while one worker recomputes. An
+    entry stored under another ``version`` counts as stale, so a version bump
+    refreshes it without the stampede a new key would cause. With
+    ``background`` the winner serves the stale value too and recomputes on a
+    worker thread; otherwise it recomputes before returning. Only a key with
+    no value at all makes requests wait, for the winner or at most
+    ``lock_timeout`` seconds before computing it themselves. ``beta`` above
+    1 refreshes earlier, 0 turns early refresh off.
+    """
+    cache = caches[using]
+    stale = timeout if stale is None else stale
+    entry = cache.get(key)
+    if entry is not None and not _should_refresh(entry, version, beta):
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, lock_timeout):
+        if entry is not None and background and settings.CACHE_BACKGROUND_REFRESH \
+                and not transaction.get_connection().in_atomic_block:
+            # Inside atomic(), as in tests, another connection could not see
+            # the transaction's rows; recompute inline there instead
+            _get_refresh_executor().submit(
+                _refresh_in_background, cache, key, lock_key, token, compute, timeout, stale, version,
+            )
+            return entry['value']
+        try:
+            return _compute_and_store(cache, key, compute, timeout, stale, version)
+        finally:
+            _release(cache, lock_key, token)
+
+    if entry is not None:
+        return entry['value']  # someone else is already recomputing it
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+        if not cache.has_key(lock_key):
+            break  # the winner failed; compute it here rather than wait out the timeout
+    return _compute_and_store(cache, key, compute, timeout, stale, version)
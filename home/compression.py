@@ -0,0 +1,220 @@
+import secrets
+import struct
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import get_random_string
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional, responses fall back to gzip
+    brotli = None
+
+# Response compression. Each response is compressed with the best encoding
+# the client accepts (brotli, then gzip) at the level configured for its
+# content type in COMPRESSION_LEVELS; types not listed there (images,
+# archives, anything already compressed) are sent as they are. Streaming
+# responses are compressed incrementally as the view yields chunks, in
+# constant memory; event streams are flushed after every chunk so each event
+# still reaches the client as soon as it is sent.
+
+# Streamed types whose chunks must not wait in the compressor's buffer
+FLUSH_EVERY_CHUNK = {'text/event-stream'}
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` for an Accept-Encoding header; codings with q=0 are refused."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """``"br"``, ``"gzip"`` or None, preferring brotli when the client rates both equally."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    candidates = [
+        (accepted.get(coding, wildcard), coding)
+        for coding in (('br', 'gzip') if brotli is not None else ('gzip',))
+    ]
+    q, coding = max(candidates, key=lambda candidate: candidate[0])  # max() keeps the first of equals
+    return coding if q > 0 else None
+
+
+# BREACH recovers secrets reflected in compressed pages (CSRF tokens, session
+# data) from the response length, so each response also carries 1 to
+# RANDOM_BYTES random bytes, as Django's GZipMiddleware does. They make the
+# lengths too noisy to compare.
+RANDOM_BYTES = 100
+
+
+def _random_padding():
+    return get_random_string(secrets.randbelow(RANDOM_BYTES) + 1).encode()
+
+
+class GzipCompressor:
+    """
+    A gzip stream whose header carries a random file name, the padding
+    Django's compress_string() adds, at any level.
+    """
+
+    # Magic, deflate, FNAME flag, no mtime, no extra flags, unknown OS
+    HEADER = b'\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff'
+
+    def __init__(self, level):
+        # Negative wbits: a raw deflate stream, the header and trailer are written here
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._crc = 0
+        self._size = 0
+
+    def start(self):
+        return self.HEADER + _random_padding() + b'\x00'
+
+    def compress(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush() + struct.pack('<II', self._crc, self._size & 0xffffffff)
+
+
+class BrotliCompressor:
+    """
+    Brotli has no header field to pad, so the stream starts with a metadata
+    meta-block instead, which decoders skip (RFC 7932, section 9.2).
+    """
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def start(self):
+        # Before any input, flush() returns just the window size and an empty
+        # block padded to a byte boundary, where the metadata block can go
+        padding = _random_padding()
+        skip = len(padding) - 1
+        # ISLAST=0, MNIBBLES=0 (coded 3), reserved bit, MSKIPBYTES=1, MSKIPLEN-1, aligned
+        metadata = bytes([0b0110 | 0b01 << 4 | (skip & 0b11) << 6, skip >> 2])
+        return self._compressor.flush() + metadata + padding
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+COMPRESSORS = {'br': BrotliCompressor, 'gzip': GzipCompressor}
+
+
+def media_type(content_type):
+    return content_type.split(';')[0].strip().lower()
+
+
+def compression_level(content_type, encoding):
+    """The configured level for a Content-Type header, or None to leave the body alone."""
+    levels = settings.COMPRESSION_LEVELS.get(media_type(content_type))
+    if levels is None:
+        return None
+    return levels[0] if encoding == 'br' else levels[1]
+
+
+def compress(data, encoding, level):
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.start() + compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding, level, flush=False):
+    """
+    Compress an iterable of bytes incrementally. Without ``flush`` the
+    compressor emits output as its buffer fills, and empty pieces are skipped.
+    """
+    compressor = COMPRESSORS[encoding](level)
+    yield compressor.start()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if flush:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding, level, flush=False):
+    """compress_stream() for the async iterators of async views."""
+    compressor = COMPRESSORS[encoding](level)
+    yield compressor.start()
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if flush:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Like Django's GZipMiddleware, with brotli and a compression level per
+    content type. Bodies shorter than ``COMPRESSION_MIN_LENGTH`` are not
+    worth the CPU and are sent as they are.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if compression_level(content_type, 'gzip') is None:
+            return response
+        # Caches must key on Accept-Encoding even when this particular
+        # response goes out uncompressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        level = compression_level(content_type, encoding)
+
+        if response.streaming:
+            flush = media_type(content_type) in FLUSH_EVERY_CHUNK
+            wrap = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = wrap(response.streaming_content, encoding, level, flush)
+            # The length is unknown until the stream ends
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+                return response
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The compressed body is not byte-identical to the original, so a
+        # strong ETag becomes weak (If-None-Match still matches it)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
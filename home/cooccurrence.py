@@ -0,0 +1,231 @@
+import math
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from itertools import combinations, groupby
+from operator import itemgetter
+
+from home.analytics import PROFILE_SKILLS, PROJECT_SKILLS
+from home.models import SkillGraph, Tag
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional speedup, the pure Python build gives the same graph
+    np = sparse = None
+
+# "Related skills" come from a tag co-occurrence matrix: every profile and every
+# project is a document, and two tags co-occur when a document lists both. The
+# matrix is built in one batch (manage.py build_skill_graph), pruned to the
+# strongest neighbours of each tag, scored by cosine similarity and stored as
+# compressed CSR arrays in SkillGraph. Each process keeps the newest build in
+# memory, so lookups run no query.
+
+NEIGHBOURS = 25        # strongest neighbours kept per tag
+MIN_COUNT = 2          # pairs seen together less often are noise
+RELOAD_SECONDS = 300   # how often a process looks for a newer build
+
+HEADER = struct.Struct('<4sII')  # magic, tags, pairs
+MAGIC = b'SKG1'
+
+
+class CooccurrenceMatrix:
+    """
+    Row ``i`` holds the neighbours of ``tag_ids[i]``, best first:
+    ``indices[indptr[i]:indptr[i + 1]]`` point back into ``tag_ids`` and
+    ``scores`` holds their similarities.
+    """
+
+    def __init__(self, tag_ids, indptr, indices, scores):
+        self.tag_ids = tag_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+        self.rows = {tag_id: row for row, tag_id in enumerate(tag_ids)}
+
+    def __len__(self):
+        return len(self.indices)
+
+    def neighbours(self, tag_id):
+        """``[(tag_id, score)]`` for the tags most often listed with ``tag_id``."""
+        row = self.rows.get(tag_id)
+        if row is None:
+            return []
+        tag_ids, indices, scores = self.tag_ids, self.indices, self.scores
+        return [(tag_ids[indices[i]], scores[i]) for i in range(self.indptr[row], self.indptr[row + 1])]
+
+    def related(self, tag_ids, limit=10):
+        """
+        Tags related to the set ``tag_ids`` as ``[(tag_id, score)]``, best
+        first: neighbour scores summed over the set, its own tags left out.
+        """
+        tag_ids = set(tag_ids)
+        totals = defaultdict(float)
+        for tag_id in tag_ids:
+            for other, score in self.neighbours(tag_id):
+                if other not in tag_ids:
+                    totals[other] += score
+        return sorted(totals.items(), key=lambda pair: (-pair[1], pair[0]))[:limit]
+
+    def encode(self):
+        parts = [HEADER.pack(MAGIC, len(self.tag_ids), len(self.indices))]
+        parts += [a.tobytes() for a in (self.tag_ids, self.indptr, self.indices, self.scores)]
+        return zlib.compress(b''.join(parts))
+
+    @classmethod
+    def decode(cls, data):
+        data = zlib.decompress(data)
+        magic, tags, pairs = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a skill graph")
+        offset, arrays = HEADER.size, []
+        for typecode, length in (('q', tags), ('I', tags + 1), ('I', pairs), ('f', pairs)):
+            values = array(typecode)
+            values.frombytes(data[offset:offset + values.itemsize * length])
+            offset += values.itemsize * length
+            arrays.append(values)
+        return cls(*arrays)
+
+
+EMPTY = CooccurrenceMatrix(array('q'), array('I', [0]), array('I'), array('f'))
+
+
+# ---------- Building ----------
+
+def _links():
+    """``(document, tag_id)`` ordered by document; profiles and projects are both documents."""
+    for kind, (through, owner_field) in enumerate(((PROFILE_SKILLS, 'profile_id'), (PROJECT_SKILLS, 'project_id'))):
+        rows = through.objects.order_by(owner_field, 'tag_id').values_list(owner_field, 'tag_id')
+        for owner_id, tag_id in rows.iterator(chunk_size=10000):
+            yield (kind, owner_id), tag_id
+
+
+def _build_python(links, neighbours, min_count):
+    totals, pairs = Counter(), Counter()
+    for _, group in groupby(links, key=itemgetter(0)):
+        tags = sorted({tag_id for _, tag_id in group})
+        totals.update(tags)
+        pairs.update(combinations(tags, 2))
+
+    rows = defaultdict(list)
+    for (a, b), count in pairs.items():
+        if count >= min_count:
+            score = count / math.sqrt(totals[a] * totals[b])
+            rows[a].append((-score, b))
+            rows[b].append((-score, a))
+
+    tag_ids = sorted(totals)
+    columns = {tag_id: column for column, tag_id in enumerate(tag_ids)}
+    indptr, indices, scores = array('I', [0]), array('I'), array('f')
+    for tag_id in tag_ids:
+        best = sorted(rows.get(tag_id, ()))[:neighbours]
+        indices.extend(columns[other] for _, other in best)
+        scores.extend(-score for score, _ in best)
+        indptr.append(len(indices))
+    return CooccurrenceMatrix(array('q', tag_ids), indptr, indices, scores)
+
+
+def _build_sparse(links, neighbours, min_count):
+    documents, tags = array('q'), array('q')
+    document, last = -1, None
+    for key, tag_id in links:
+        if key != last:
+            document, last = document + 1, key
+        documents.append(document)
+        tags.append(tag_id)
+    if not tags:
+        return EMPTY
+
+    # Incidence matrix X (documents x tags); X.T @ X counts the documents
+    # shared by every pair of tags, with each tag's total on the diagonal
+    tag_ids, columns = np.unique(np.frombuffer(tags, dtype=np.int64), return_inverse=True)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(columns), dtype=np.float64), (np.frombuffer(documents, dtype=np.int64), columns)),
+        shape=(document + 1, len(tag_ids)),
+    )
+    counts = (incidence.T @ incidence).tocoo()
+    totals = np.zeros(len(tag_ids))
+    diagonal = counts.row == counts.col
+    totals[counts.row[diagonal]] = counts.data[diagonal]
+
+    keep = ~diagonal & (counts.data >= min_count)
+    row, col, count = counts.row[keep], counts.col[keep], counts.data[keep]
+    score = count / np.sqrt(totals[row] * totals[col])
+
+    # Best first within each row, ties broken by tag id, then the top few per row
+    order = np.lexsort((tag_ids[col], -score, row))
+    row, col, score = row[order], col[order], score[order]
+    starts = np.searchsorted(row, np.arange(len(tag_ids)))
+    top = np.arange(len(row)) - starts[row] < neighbours
+    row, col, score = row[top], col[top], score[top]
+
+    indptr = np.zeros(len(tag_ids) + 1, dtype=np.uint32)
+    np.cumsum(np.bincount(row, minlength=len(tag_ids)), out=indptr[1:])
+    return CooccurrenceMatrix(
+        array('q', tag_ids.astype(np.int64).tobytes()),
+        array('I', indptr.tobytes()),
+        array('I', col.astype(np.uint32).tobytes()),
+        array('f', score.astype(np.float32).tobytes()),
+    )
+
+
+def build_graph(neighbours=NEIGHBOURS, min_count=MIN_COUNT):
+    """
+    Count tag co-occurrences over every profile and project and store the
+    result as the newest SkillGraph. Uses SciPy's sparse matrices when
+    installed and plain Counters otherwise.
+    """
+    build = _build_sparse if sparse is not None else _build_python
+    matrix = build(_links(), neighbours, min_count)
+    graph = SkillGraph.objects.create(tags=len(matrix.tag_ids), pairs=len(matrix), data=matrix.encode())
+    SkillGraph.objects.filter(id__lt=graph.id).delete()
+    _use(graph.id, matrix)
+    return graph, matrix
+
+
+# ---------- Lookups ----------
+
+_lock = threading.Lock()
+_loaded = (None, EMPTY)  # (SkillGraph id, matrix)
+_checked_at = None
+
+
+def _use(graph_id, matrix):
+    global _loaded, _checked_at
+    _loaded, _checked_at = (graph_id, matrix), time.monotonic()
+
+
+def get_graph():
+    """The newest build, loaded once per process and looked up again every RELOAD_SECONDS."""
+    if _checked_at is not None and time.monotonic() - _checked_at < RELOAD_SECONDS:
+        return _loaded[1]
+    with _lock:
+        if _checked_at is None or time.monotonic() - _checked_at >= RELOAD_SECONDS:
+            latest = SkillGraph.objects.order_by('-id').values_list('id', flat=True).first()
+            if latest is None:
+                _use(None, EMPTY)
+            elif latest != _loaded[0]:
+                _use(latest, CooccurrenceMatrix.decode(SkillGraph.objects.get(id=latest).data))
+            else:
+                _use(*_loaded)
+    return _loaded[1]
+
+
+def related_skills(tag_ids, limit=10):
+    """Tags most often listed together with ``tag_ids``, as ``[(tag_id, score)]``."""
+    return get_graph().related(tag_ids, limit)
+
+
+def related_skill_names(tag_ids, limit=10):
+    related = related_skills(tag_ids, limit)
+    tags = Tag.objects.in_bulk([tag_id for tag_id, _ in related])
+    # Tags deleted since the build are skipped
+    return [tags[tag_id].name for tag_id, _ in related if tag_id in tags]
+
+
+def expand_skills(tag_ids, limit=10, min_score=0.3):
+    """Related tags strong enough to widen a skill search with."""
+    return [tag_id for tag_id, score in related_skills(tag_ids, limit) if score >= min_score]
@@ -0,0 +1,184 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from home.db import write_transaction
+from home.models import Connection, CustomUser, MatchRequest, Profile, Project
+
+# Denormalized counts shown on profiles and projects: connections and pending
+# match requests per profile, pending requests and collaborators per project.
+# Single-row writes are counted by the signal handlers below; bulk paths that
+# skip signals call the adjust functions themselves. Every change is an F()
+# update, so concurrent writers never lose an increment.
+
+PENDING = MatchRequest.StatusChoices.PENDING
+COLLABORATORS = Project.collaborators.through
+RECONCILE_BATCH_SIZE = 1000
+
+
+def _adjust(queryset, field, key, deltas):
+    """Add ``{key value: n}`` to ``field``, one update per distinct delta."""
+    by_delta = defaultdict(list)
+    for value, n in deltas.items():
+        if n:
+            by_delta[n].append(value)
+    for n, values in by_delta.items():
+        queryset.filter(**{f'{key}__in': values}).update(**{field: F(field) + n})
+
+
+def adjust_connections(deltas):
+    """``{user_id: n}`` connections gained (or lost, when negative)."""
+    _adjust(Profile.objects, 'connections_count', 'user_id', deltas)
+
+
+def adjust_collaborators(deltas):
+    """``{project_id: n}``."""
+    _adjust(Project.objects, 'collaborators_count', 'id', deltas)
+
+
+def adjust_pending_requests(pairs, n):
+    """
+    Add ``n`` pending requests for each ``(freelancer_id, project_id)``: to
+    the project, the freelancer's profile and the organization's profile.
+    """
+    pairs = list(pairs)
+    projects = Counter(project_id for _, project_id in pairs)
+    organizations = Counter()
+    for project_id, profile_id in Project.objects.filter(id__in=projects).values_list('id', 'profile_id'):
+        organizations[profile_id] += projects[project_id]
+    _adjust(Project.objects, 'pending_requests_count', 'id', {pk: n * count for pk, count in projects.items()})
+    _adjust(Profile.objects, 'pending_requests_count', 'id', {pk: n * count for pk, count in organizations.items()})
+    _adjust(Profile.objects, 'pending_requests_count', 'user_id',
+            {pk: n * count for pk, count in Counter(user_id for user_id, _ in pairs).items()})
+
+
+def _remove_collaborators(rows):
+    projects = Counter(rows.values_list('project_id', flat=True))
+    adjust_collaborators({project_id: -n for project_id, n in projects.items()})
+
+
+def count_deleted_rows(model, ids):
+    """Counter changes for rows about to be removed with a raw DELETE (account purge)."""
+    if model is Connection:
+        users = Counter(Connection.objects.filter(pk__in=ids).values_list('user_id', flat=True))
+        adjust_connections({user_id: -n for user_id, n in users.items()})
+    elif model is COLLABORATORS:
+        _remove_collaborators(COLLABORATORS.objects.filter(pk__in=ids))
+    elif model is MatchRequest:
+        adjust_pending_requests(
+            MatchRequest.objects.filter(pk__in=ids, status=PENDING).values_list('freelancer_id', 'project_id'), -1,
+        )
+
+
+# ---------- Signals ----------
+
+@receiver(post_save, sender=Connection)
+def connection_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_connections({instance.user_id: 1})
+
+
+@receiver(post_delete, sender=Connection)
+def connection_deleted(sender, instance, **kwargs):
+    adjust_connections({instance.user_id: -1})
+
+
+@receiver(post_save, sender=MatchRequest)
+def match_request_saved(sender, instance, created, **kwargs):
+    if created:
+        was_pending = False
+    elif hasattr(instance, '_loaded_status'):
+        was_pending = instance._loaded_status == PENDING
+    else:
+        return  # not loaded from the database, so the old status is unknown
+    delta = (instance.status == PENDING) - was_pending
+    if delta:
+        adjust_pending_requests([(instance.freelancer_id, instance.project_id)], delta)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=MatchRequest)
+def match_request_deleted(sender, instance, **kwargs):
+    if instance.status == PENDING:
+        adjust_pending_requests([(instance.freelancer_id, instance.project_id)], -1)
+
+
+@receiver(m2m_changed, sender=COLLABORATORS)
+def collaborators_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        # Django only passes the rows that were actually inserted
+        deltas = {pk: 1 for pk in pk_set} if reverse else {instance.pk: len(pk_set)}
+    elif action in ('pre_remove', 'pre_clear'):
+        # Count what is really linked before the rows disappear
+        rows = COLLABORATORS.objects.filter(**{'customuser_id' if reverse else 'project_id': instance.pk})
+        if pk_set is not None:
+            rows = rows.filter(**{'project_id__in' if reverse else 'customuser_id__in': pk_set})
+        deltas = {project_id: -n for project_id, n in Counter(rows.values_list('project_id', flat=True)).items()}
+    else:
+        return
+    adjust_collaborators(deltas)
+
+
+@receiver(pre_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    # The delete cascade removes the user's collaborator rows with a plain
+    # DELETE, without m2m_changed; count them while they are still there
+    _remove_collaborators(COLLABORATORS.objects.filter(customuser_id=instance.pk))
+
+
+# ---------- Reconciliation ----------
+
+def _count(queryset, key):
+    """Correlated ``COUNT(*)`` of ``queryset`` rows whose ``key`` is the outer row's."""
+    counted = queryset.order_by().values(key).annotate(n=Count('*')).values('n')
+    return Coalesce(Subquery(counted), Value(0))
+
+
+def actual_counts(model):
+    """``{field: expression}`` recounting each counter column of ``model`` from the source rows."""
+    pending = MatchRequest.objects.filter(status=PENDING)
+    if model is Profile:
+        return {
+            'connections_count': _count(Connection.objects.filter(user_id=OuterRef('user_id')), 'user_id'),
+            'pending_requests_count':
+                _count(pending.filter(freelancer_id=OuterRef('user_id')), 'freelancer_id')
+                + _count(pending.filter(project__profile_id=OuterRef('pk')), 'project__profile_id'),
+        }
+    return {
+        'pending_requests_count': _count(pending.filter(project_id=OuterRef('pk')), 'project_id'),
+        'collaborators_count': _count(COLLABORATORS.objects.filter(project_id=OuterRef('pk')), 'project_id'),
+    }
+
+
+@write_transaction
+def _reconcile_batch(model, low, high):
+    counts = actual_counts(model)
+    rows = model.objects.filter(pk__gte=low, pk__lt=high)
+    drifted = rows.alias(**{f'actual_{field}': expression for field, expression in counts.items()}).filter(
+        Q(*(~Q(**{field: F(f'actual_{field}')}) for field in counts), _connector=Q.OR)
+    )
+    ids = list(drifted.values_list('pk', flat=True))
+    if ids:
+        model.objects.filter(pk__in=ids).update(**counts)
+    return len(ids)
+
+
+def reconcile_counters(batch_size=RECONCILE_BATCH_SIZE, on_batch=None):
+    """
+    Recount every counter from the source rows in primary key ranges of
+    ``batch_size``, each in its own short transaction, and fix the rows that
+    drifted. Returns ``{model name: rows corrected}``.
+    """
+    corrected = {}
+    for model in (Profile, Project):
+        corrected[model.__name__] = 0
+        last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        for low in range(0, last + 1, batch_size):
+            fixed = _reconcile_batch(model, low, low + batch_size)
+            corrected[model.__name__] += fixed
+            if on_batch:
+                on_batch(model, low + batch_size, fixed)
+    return corrected
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from home.caching import get_or_compute
+from home.models import CustomUser, MatchRequest, Post, Project
+
+STATS_TIMEOUT = 60
+STATS_VERSION_KEY = 'admin_dashboard:stats:version'
+
+
+def dashboard_stats():
+    """
+    The admin dashboard's stat card counts. Creating or deleting a user, post,
+    project or match request bumps the version the entry is stored with, and
+    one request recounts while the others get the previous numbers.
+    """
+    version = cache.get_or_set(STATS_VERSION_KEY, 1, None)
+    return get_or_compute('admin_dashboard:stats', _count, STATS_TIMEOUT, version=version)
+
+
+def _count():
+    users = CustomUser.objects.aggregate(
+        users=Count('id'),
+        freelancers=Count('id', filter=Q(user_type='freelancer')),
+        organizations=Count('id', filter=Q(user_type='organization')),
+    )
+    return {
+        **users,
+        'projects': Project.objects.count(),
+        'posts': Post.objects.count(),
+        'matches': MatchRequest.objects.count(),
+    }
+
+
+def invalidate_dashboard_stats():
+    try:
+        cache.incr(STATS_VERSION_KEY)
+    except ValueError:
+        cache.set(STATS_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=MatchRequest)
+def counted_row_saved(sender, created, **kwargs):
+    # A user's type is set at signup, so only new rows change the counts; a
+    # type changed in the Django admin shows up once the entry expires
+    if created:
+        invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=MatchRequest)
+def counted_row_deleted(sender, **kwargs):
+    invalidate_dashboard_stats()
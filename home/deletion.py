@@ -0,0 +1,144 @@
+from collections import Counter
+
+from django.contrib.admin.models import LogEntry
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from home.analytics import record_tag_usage
+from home.counters import count_deleted_rows
+from home.db import write_transaction
+from home.discovery import invalidate_facets
+from home.etags import bump_profile_versions
+from home.queue import enqueue_task
+from home.sync import record_post_deletions
+from home.textmatch import count_deleted_vectors
+from home.models import (
+    AccountDeletion, Connection, CustomUser, Experience, MatchRequest, Post, Profile, Project, TextMatch,
+    TextVector,
+)
+
+PURGE_BATCH_SIZE = 500
+
+PROJECT_SKILLS = Project.required_skills.through
+PROFILE_SKILLS = Profile.skills.through
+PROJECT_COLLABORATORS = Project.collaborators.through
+
+
+def request_account_deletion(user):
+    """
+    Disable the account right away and queue the purge of its data. The user
+    can no longer log in from here on, even before the worker gets to it.
+    """
+    @write_transaction
+    def disable():
+        CustomUser.objects.filter(id=user.id).update(is_active=False)
+        deletion, _ = AccountDeletion.objects.get_or_create(user_id=user.id, defaults={'email': user.email})
+        enqueue_task("delete_user", {"user_id": user.id}, idempotency_key=f"delete_user:{user.id}")
+        return deletion
+
+    user.is_active = False
+    return disable()
+
+
+def _purge_steps(user_id, profile_id):
+    """
+    Dependents of a user in the order they can be removed without violating a
+    foreign key, leaves first. The profile and user rows are removed afterwards.
+    """
+    projects = Project.objects.filter(profile_id=profile_id).values('id')
+    return [
+        ('match requests received', MatchRequest.objects.filter(project__in=projects), None),
+        ('match requests sent', MatchRequest.objects.filter(freelancer_id=user_id), None),
+        ('collaborators', PROJECT_COLLABORATORS.objects.filter(Q(project__in=projects) | Q(customuser_id=user_id)), None),
+        ('project skills', PROJECT_SKILLS.objects.filter(project__in=projects), 'demand'),
+        ('text matches', TextMatch.objects.filter(Q(project__in=projects) | Q(profile_id=profile_id)), None),
+        # Plain ids, no foreign key: nothing else would remove the indexed bio and descriptions
+        ('text vectors', TextVector.objects.filter(
+            Q(kind=TextVector.KindChoices.PROJECT, object_id__in=projects)
+            | Q(kind=TextVector.KindChoices.PROFILE, object_id=profile_id)
+        ), None),
+        ('projects', Project.objects.filter(profile_id=profile_id), None),
+        ('profile skills', PROFILE_SKILLS.objects.filter(profile_id=profile_id), 'supply'),
+        ('experiences', Experience.objects.filter(profile_id=profile_id), None),
+        ('posts', Post.objects.filter(user_id=user_id), None),
+        ('connections', Connection.objects.filter(Q(user_id=user_id) | Q(connected_to_id=user_id)), None),
+        ('admin log', LogEntry.objects.filter(user_id=user_id), None),
+    ]
+
+
+def _raw_delete(model, ids):
+    """DELETE by primary key without collecting related objects or sending signals."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({placeholders})", ids)
+        return cursor.rowcount
+
+
+@write_transaction
+def _delete_batch(deletion, step, queryset, tag_usage, batch_size):
+    ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0
+
+    if tag_usage:
+        # Raw deletes skip m2m_changed, so keep TagStats in step by hand
+        tags = Counter(queryset.model.objects.filter(pk__in=ids).values_list('tag_id', flat=True))
+        record_tag_usage(**{tag_usage: {tag_id: -n for tag_id, n in tags.items()}})
+
+    if queryset.model is Connection:
+        # The other side's connection list changes too
+        others = Connection.objects.filter(pk__in=ids).values_list('user_id', 'connected_to_id')
+        bump_profile_versions(user_id__in={user for pair in others for user in pair})
+
+    if queryset.model is Post:
+        # Raw deletes skip post_delete, so leave the tombstones for delta sync here
+        record_post_deletions(ids)
+
+    # ... and the other side's connection, request and collaborator counts
+    count_deleted_rows(queryset.model, ids)
+
+    if queryset.model is TextVector:
+        # The vocabulary's document frequencies drop with the texts
+        count_deleted_vectors(ids)
+
+    deleted = _raw_delete(queryset.model, ids)
+    AccountDeletion.objects.filter(id=deletion.id).update(
+        step=step, rows_deleted=deletion.rows_deleted + deleted,
+    )
+    deletion.rows_deleted += deleted
+    return deleted
+
+
+def purge_account(user_id, batch_size=PURGE_BATCH_SIZE):
+    """
+    Remove a disabled user's data in bounded batches, each in its own short
+    transaction, so no request waits on one long cascade. Safe to re-run after
+    a crash: every step just picks up whatever rows are left.
+    """
+    deletion = AccountDeletion.objects.filter(user_id=user_id).first()
+    user = CustomUser.objects.filter(id=user_id, is_active=False).first()
+    if deletion is None or user is None:
+        return
+
+    AccountDeletion.objects.filter(id=deletion.id).update(status=AccountDeletion.StatusChoices.RUNNING)
+    profile_id = Profile.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+
+    for step, queryset, tag_usage in _purge_steps(user_id, profile_id):
+        while _delete_batch(deletion, step, queryset, tag_usage, batch_size):
+            pass
+
+    # Raw deletes skip post_delete, so the facet counts would go on counting
+    # the projects until they expire. Done on every run, after the batches
+    # have committed, so a purge resumed after a crash still refreshes them.
+    invalidate_facets()
+
+    # Whatever is left (the profile, the user row and any relation added later)
+    # is small enough for the regular cascade.
+    deleted, _ = write_transaction(user.delete)()
+    AccountDeletion.objects.filter(id=deletion.id).update(
+        status=AccountDeletion.StatusChoices.DONE, step='', rows_deleted=deletion.rows_deleted + deleted,
+        finished_at=timezone.now(),
+    )
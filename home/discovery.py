@@ -0,0 +1,111 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from home.caching import get_or_compute
+from home.models import Project, Tag
+from home.skills import canonical_tag_ids, tag_key
+
+FACETS_TIMEOUT = 60 * 5
+FACETS_VERSION_KEY = 'project_facets:version'
+
+
+def parse_filters(params):
+    """Normalize the discovery query string so equivalent searches share a cache entry."""
+    skills = sorted({tag_key(s) for s in params.get('skills', '').split(',') if s.strip()})
+    return {
+        'skills': skills,
+        'match': 'all' if params.get('match') == 'all' else 'any',
+        'status': params.get('status', '') if params.get('status') in Project.StatusChoices.values else '',
+        'industry': params.get('industry', '').strip(),
+    }
+
+
+def filter_projects(filters):
+    projects = Project.objects.all()
+
+    if filters['status']:
+        projects = projects.filter(status=filters['status'])
+    if filters['industry']:
+        projects = projects.filter(profile__industry__iexact=filters['industry'])
+
+    if filters['skills']:
+        # Any spelling of a skill finds its tag; unknown names match nothing
+        canonical = canonical_tag_ids(filters['skills'], create=False)
+        tag_ids = list(set(canonical.values()))
+        if filters['match'] == 'all':
+            if len(canonical) < len(filters['skills']):
+                return projects.none()
+            projects = projects.filter(required_skills__in=tag_ids) \
+                .annotate(matched_skills=Count('required_skills', distinct=True)) \
+                .filter(matched_skills=len(tag_ids))
+        else:
+            projects = projects.filter(required_skills__in=tag_ids).distinct()
+
+    return projects
+
+
+def project_facets(filters):
+    """
+    Tag and status counts for the projects matching ``filters`` (the status
+    counts ignore the status filter), cached per filter signature. Project and
+    required skill changes bump the version the entry is stored with, and one
+    request recomputes it while the others get the previous counts.
+    Organization industry edits show up once the entry expires.
+    """
+    version = cache.get_or_set(FACETS_VERSION_KEY, 1, None)
+    signature = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    return get_or_compute(
+        f'project_facets:{signature}', lambda: _compute_facets(filters), FACETS_TIMEOUT,
+        version=version,
+    )
+
+
+def _compute_facets(filters):
+    matching = Project.objects.filter(id__in=filter_projects(filters).values('id'))
+
+    # One grouped pass over the through table for the skill sidebar...
+    tag_rows = Project.required_skills.through.objects \
+        .filter(project__in=matching) \
+        .values('tag_id', 'tag__name') \
+        .annotate(count=Count('project_id')) \
+        .order_by('-count', 'tag__name')
+
+    # ...and one over the projects for the status filter, leaving out the
+    # status filter itself so the other statuses keep their counts
+    any_status = Project.objects.filter(id__in=filter_projects({**filters, 'status': ''}).values('id'))
+    status_rows = any_status.values('status').annotate(count=Count('id')).order_by()
+
+    return {
+        'skills': [{'id': r['tag_id'], 'name': r['tag__name'], 'count': r['count']} for r in tag_rows],
+        'status': {r['status']: r['count'] for r in status_rows},
+    }
+
+
+def invalidate_facets():
+    try:
+        cache.incr(FACETS_VERSION_KEY)
+    except ValueError:
+        cache.set(FACETS_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, **kwargs):
+    invalidate_facets()
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, **kwargs):
+    # Tags merged away or removed in the admin leave the skill sidebar
+    invalidate_facets()
+
+
+@receiver(m2m_changed, sender=Project.required_skills.through)
+def project_skills_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_facets()
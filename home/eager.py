@@ -0,0 +1,97 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+
+
+def _walk(model, parts, prefix, inside_many):
+    """
+    Follow ``parts`` through the model's relations. Returns the joined lookup,
+    the model it ends on, whether a to-many hop was crossed and the relation
+    lookups met on the way as ``(lookup, is_prefetch)``.
+    """
+    lookups = []
+    path = prefix
+    for part in parts:
+        if model is None:
+            break
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        path = f"{path}__{part}" if path else part
+        inside_many = inside_many or field.many_to_many or field.one_to_many
+        lookups.append((path, inside_many))
+        model = field.related_model
+    return path, model, inside_many, lookups
+
+
+def eager_load_lookups(serializer, model=None, prefix='', inside_many=False):
+    """
+    Work out the ``select_related`` and ``prefetch_related`` lookups a
+    serializer needs from its declared fields, ``source=`` paths and nested
+    serializers. ``SerializerMethodField`` bodies cannot be inspected, so a
+    serializer lists the relations they use in ``Meta.eager_load``.
+    """
+    model = model or getattr(getattr(serializer, 'Meta', None), 'model', None)
+    select, prefetch = set(), set()
+    if model is None:
+        return select, prefetch
+
+    def add(lookups):
+        for lookup, is_prefetch in lookups:
+            (prefetch if is_prefetch else select).add(lookup)
+
+    for name in getattr(getattr(serializer, 'Meta', None), 'eager_load', ()):
+        add(_walk(model, name.split('__'), prefix, inside_many)[3])
+
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        parts = field.source.split('.')
+
+        if isinstance(field, serializers.ListSerializer):
+            path, child_model, _, lookups = _walk(model, parts, prefix, inside_many)
+            add(lookups)
+            child_select, child_prefetch = eager_load_lookups(field.child, child_model, path, True)
+            prefetch |= child_select | child_prefetch
+        elif isinstance(field, serializers.BaseSerializer):
+            path, child_model, nested_many, lookups = _walk(model, parts, prefix, inside_many)
+            add(lookups)
+            child_select, child_prefetch = eager_load_lookups(field, child_model, path, nested_many)
+            select |= child_select
+            prefetch |= child_prefetch
+        elif isinstance(field, ManyRelatedField):
+            add(_walk(model, parts, prefix, inside_many)[3])
+        elif isinstance(field, RelatedField):
+            # A plain primary key is read from the local "<name>_id" column
+            if isinstance(field, PrimaryKeyRelatedField) and len(parts) == 1:
+                continue
+            add(_walk(model, parts, prefix, inside_many)[3])
+        elif len(parts) > 1:
+            # "user.email" style sources: every hop but the attribute itself
+            add(_walk(model, parts[:-1], prefix, inside_many)[3])
+
+    # Prefetching through a path already joined is fine; joining one that is
+    # also prefetched would just fetch it twice.
+    return select - prefetch, prefetch
+
+
+class EagerLoadingMixin:
+    """
+    For DRF views: applies the lookups ``eager_load_lookups`` derives from the
+    view's serializer to its queryset, so adding a field to a serializer never
+    silently adds a query per row.
+    """
+
+    def eager_load(self, queryset):
+        select, prefetch = eager_load_lookups(self.get_serializer())
+        if select:
+            queryset = queryset.select_related(*sorted(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*sorted(prefetch))
+        return queryset
+
+    def get_queryset(self):
+        return self.eager_load(super().get_queryset())
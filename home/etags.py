@@ -0,0 +1,75 @@
+import hashlib
+
+from django.db.models import Count, F, Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from home.models import Connection, Experience, Post, Profile
+
+# ETag functions for django.views.decorators.http.condition. Each one answers
+# from a single small query, so an If-None-Match hit returns 304 without the
+# queryset ever being serialized. They return None for anonymous requests,
+# which leaves those to the view's own permission check.
+
+
+def _etag(*parts):
+    return hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def post_list_etag(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    # A new or edited post moves the max, a deletion lowers the count.
+    # The user id is included because can_edit/is_owner differ per viewer.
+    state = Post.objects.aggregate(latest=Max('updated_at'), count=Count('id'))
+    return _etag('posts', request.user.id, state['latest'], state['count'], request.GET.urlencode())
+
+
+def profile_etag(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    version = Profile.objects.filter(user=request.user).values_list('id', 'version').first()
+    return _etag('profile', request.user.id, version) if version else None
+
+
+# ---------- Profile version counter ----------
+
+def bump_profile_versions(**lookup):
+    """Invalidate the cached profile payloads of the matching profiles."""
+    Profile.objects.filter(**lookup).update(version=F('version') + 1)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    if not created:
+        bump_profile_versions(pk=instance.pk)
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def experience_changed(sender, instance, **kwargs):
+    bump_profile_versions(pk=instance.profile_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_profile_versions(user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+def connection_changed(sender, instance, **kwargs):
+    bump_profile_versions(user_id=instance.user_id)
+
+
+@receiver(m2m_changed, sender=Profile.skills.through)
+def profile_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # instance is a Tag; find the profiles while the links still exist
+        if action == 'pre_clear':
+            bump_profile_versions(skills=instance)
+        elif action in ('post_add', 'post_remove'):
+            bump_profile_versions(pk__in=pk_set)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        bump_profile_versions(pk=instance.pk)
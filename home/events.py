@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from home.models import MatchRequest, Profile
+
+
+class InProcessBroadcast:
+    """
+    Fan-out of events to the event streams open in this process.
+
+    Every subscriber is an asyncio queue bound to the loop serving its stream,
+    so one async worker can hold many lightweight connections. Publishing is
+    thread-safe and can be called from sync views and signal handlers.
+    """
+
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        return entry
+
+    def unsubscribe(self, user_id, entry):
+        with self._lock:
+            self._subscribers[user_id].discard(entry)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            entries = list(self._subscribers.get(user_id, ()))
+        for loop, queue in entries:
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue, event):
+        # A client that stopped reading loses events rather than growing memory.
+        if not queue.full():
+            queue.put_nowait(event)
+
+
+class RedisBroadcast(InProcessBroadcast):
+    """
+    Multi-node backend: events go through Redis pub/sub and every node relays
+    them to its own in-process subscribers. Requires the ``redis`` package and
+    ``EVENTS_REDIS_URL``.
+    """
+
+    channel = "skillnexus:events"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroadcast requires the 'redis' package.") from exc
+
+        self._redis = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: self._relay})
+        pubsub.run_in_thread(sleep_time=0.1, daemon=True)
+
+    def publish(self, user_id, event):
+        self._redis.publish(self.channel, json.dumps({"user_id": user_id, "event": event}))
+
+    def _relay(self, message):
+        data = json.loads(message["data"])
+        super().publish(data["user_id"], data["event"])
+
+
+_broadcast = None
+_broadcast_lock = threading.Lock()
+
+
+def get_broadcast():
+    global _broadcast
+    if _broadcast is None:
+        with _broadcast_lock:
+            if _broadcast is None:
+                _broadcast = import_string(settings.EVENTS_BACKEND)()
+    return _broadcast
+
+
+def publish_match_event(match_request, created=False, organization_id=None):
+    """
+    Notify the organization owning the project and the freelancer that a match
+    request was created or changed status. Sent once the transaction commits.
+    Pass ``organization_id`` when it is already known to skip its lookup.
+    """
+    event = {
+        "type": "match_request.created" if created else f"match_request.{match_request.status}",
+        "id": match_request.id,
+        "project_id": match_request.project_id,
+        "status": match_request.status,
+    }
+    if organization_id is None:
+        organization_id = Profile.objects.filter(projects=match_request.project_id) \
+            .values_list('user_id', flat=True).first()
+
+    def send():
+        broadcast = get_broadcast()
+        broadcast.publish(organization_id, event)
+        broadcast.publish(match_request.freelancer_id, event)
+
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=MatchRequest)
+def match_request_saved(sender, instance, created, **kwargs):
+    publish_match_event(instance, created=created)
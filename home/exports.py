@@ -0,0 +1,130 @@
+import json
+import os
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils import timezone
+
+from home.db import write_transaction
+from home.models import (
+    Connection, CustomUser, DataExport, Experience, MatchRequest, Post, Profile, Project,
+)
+from home.queue import enqueue_task
+
+EXPORT_CHUNK_SIZE = 2000
+# Finished exports are deleted, file and all, after this long
+EXPORT_RETENTION = timedelta(days=7)
+
+
+def start_export(user):
+    """
+    Queue a data export for ``user``, or return the one still being built:
+    ``(export, created)``. At most one export per user is pending at a time.
+    """
+    pending = DataExport.objects.filter(user=user, status=DataExport.StatusChoices.PENDING).first()
+    if pending is not None:
+        return pending, False
+
+    @write_transaction
+    def create():
+        export = DataExport.objects.create(user=user)
+        enqueue_task("export_user_data", {"export_id": export.id}, idempotency_key=f"export_user_data:{export.id}")
+        return export
+
+    try:
+        return create(), True
+    except IntegrityError:
+        # Another request started one in the meantime
+        return DataExport.objects.get(user=user, status=DataExport.StatusChoices.PENDING), False
+
+
+def _export_sections(user):
+    """
+    (file name, queryset of dicts) for everything the user owns or took part
+    in. Every queryset is consumed with ``iterator()`` so nothing is held in
+    memory beyond one chunk.
+    """
+    return [
+        ('account.jsonl', CustomUser.objects.filter(id=user.id).values(
+            'id', 'email', 'first_name', 'last_name', 'user_type', 'date_joined', 'last_login')),
+        ('profile.jsonl', Profile.objects.filter(user=user).values(
+            'id', 'bio', 'website', 'industry', 'social_links', 'company_name', 'profile_picture')),
+        ('skills.jsonl', Profile.skills.through.objects.filter(profile__user=user).values('tag__name')),
+        ('experiences.jsonl', Experience.objects.filter(profile__user=user).values(
+            'id', 'organization', 'role', 'years', 'details')),
+        ('posts.jsonl', Post.objects.filter(user=user).values('id', 'title', 'content', 'created_at')),
+        ('projects.jsonl', Project.objects.filter(profile__user=user).values(
+            'id', 'project_description', 'terms_of_contract', 'status')),
+        ('project_skills.jsonl', Project.required_skills.through.objects.filter(
+            project__profile__user=user).values('project_id', 'tag__name')),
+        ('collaborations.jsonl', Project.collaborators.through.objects.filter(
+            Q(customuser=user) | Q(project__profile__user=user)).values(
+            'project_id', 'project__project_description', 'customuser__email')),
+        ('match_requests.jsonl', MatchRequest.objects.filter(
+            Q(freelancer=user) | Q(project__profile__user=user)).values(
+            'id', 'project_id', 'freelancer__email', 'status', 'created_at')),
+        ('connections.jsonl', Connection.objects.filter(user=user).values(
+            'connected_to__email', 'connected_to__first_name', 'connected_to__last_name', 'connected_at')),
+    ]
+
+
+def build_export(export):
+    """Stream every section as JSON Lines straight into a zip file on disk."""
+    os.makedirs(settings.EXPORTS_ROOT, exist_ok=True)
+    file_name = f"skillnexus-export-{export.user_id}-{export.id}.zip"
+    path = os.path.join(settings.EXPORTS_ROOT, file_name)
+
+    rows = 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, queryset in _export_sections(export.user):
+            with archive.open(name, 'w', force_zip64=True) as member:
+                for row in queryset.order_by().iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                    member.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b'\n')
+                    rows += 1
+
+    DataExport.objects.filter(id=export.id).update(
+        status=DataExport.StatusChoices.DONE, file_path=file_name, rows_exported=rows,
+        finished_at=timezone.now(),
+    )
+    # The new export replaces the user's earlier ones, files included
+    DataExport.objects.filter(user_id=export.user_id, id__lt=export.id).delete()
+    return path
+
+
+def is_expired(export):
+    return export.finished_at is not None and export.finished_at < timezone.now() - EXPORT_RETENTION
+
+
+def prune_exports():
+    """Delete exports, and their files, that finished more than EXPORT_RETENTION ago."""
+    expired = DataExport.objects.filter(finished_at__lt=timezone.now() - EXPORT_RETENTION)
+    return expired.exclude(status=DataExport.StatusChoices.PENDING).delete()[0]
+
+
+def notify_export_ready(export):
+    # Mail clients need an absolute link
+    link = settings.SITE_URL.rstrip('/') + reverse('download_data_export', args=[export.id])
+    send_mail(
+        "Your SkillNexus data export is ready",
+        f"Your data export is ready. Log in and download it within {EXPORT_RETENTION.days} days from {link}",
+        None,
+        [export.user.email],
+        fail_silently=True,
+    )
+
+
+@receiver(post_delete, sender=DataExport)
+def remove_export_file(sender, instance, **kwargs):
+    if instance.file_path:
+        try:
+            os.remove(os.path.join(settings.EXPORTS_ROOT, instance.file_path))
+        except FileNotFoundError:
+            pass
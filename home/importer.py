@@ -0,0 +1,249 @@
+import csv
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from home.analytics import record_tag_usage
+from home.db import write_transaction
+from home.dashboard import invalidate_dashboard_stats
+from home.discovery import invalidate_facets
+from home.etags import bump_profile_versions
+from home.models import CustomUser, Experience, Profile, Project
+from home.skills import canonical_tag_ids
+from home.textmatch import PROFILE, mark_stale
+
+KINDS = ('users', 'experiences', 'projects')
+
+PROFILE_FIELDS = ('bio', 'website', 'industry', 'company_name')
+
+
+def read_rows(path):
+    """Yield one dict per CSV row or JSONL line without loading the file."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.endswith('.jsonl'):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(handle)
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def split_skills(value):
+    """Skills come as a list in JSONL and as "Python;Django" in CSV."""
+    if isinstance(value, list):
+        names = value
+    else:
+        names = (value or '').replace(',', ';').split(';')
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+# ---------- Validation ----------
+
+def validate_row(kind, row):
+    """Return a list of problems with ``row``; empty when it can be imported."""
+    errors = []
+
+    def required(*fields):
+        for field in fields:
+            if not str(row.get(field) or '').strip():
+                errors.append(f"missing {field}")
+
+    def email(field):
+        try:
+            validate_email(row.get(field) or '')
+        except ValidationError:
+            errors.append(f"invalid {field}")
+
+    if kind == 'users':
+        email('email')
+        if row.get('user_type', 'freelancer') not in CustomUser.UserType.values:
+            errors.append("invalid user_type")
+    elif kind == 'experiences':
+        email('email')
+        required('organization', 'role', 'years')
+        try:
+            Decimal(str(row.get('years')))
+        except InvalidOperation:
+            errors.append("invalid years")
+    elif kind == 'projects':
+        email('organization_email')
+        required('project_description', 'terms_of_contract')
+        if row.get('status', 'ongoing') not in Project.StatusChoices.values:
+            errors.append("invalid status")
+    return errors
+
+
+def validate_file(path, kind):
+    """Streaming pass over the file. Returns ``(rows, [(line, errors), ...])``."""
+    problems = []
+    seen_emails = set()
+    rows = 0
+    for rows, row in enumerate(read_rows(path), start=1):
+        errors = validate_row(kind, row)
+        if kind == 'users':
+            email = CustomUser.objects.normalize_email(row.get('email') or '')
+            if email in seen_emails:
+                errors.append("duplicate email in file")
+            seen_emails.add(email)
+        if errors:
+            problems.append((rows, errors))
+    return rows, problems
+
+
+# ---------- Import ----------
+
+def _init_hasher():
+    # Worker processes started with "spawn" need the app registry too
+    django.setup()
+
+
+def _tag_ids(names):
+    """Canonical tag ids by name, creating the unknown ones in a few queries."""
+    # Deduplicated in order, so the first spelling in the file names a new tag
+    return canonical_tag_ids(dict.fromkeys(names))
+
+
+def _import_users(batch, hasher_pool):
+    for row in batch:
+        row['email'] = CustomUser.objects.normalize_email(row['email'])
+    existing = set(CustomUser.objects.filter(email__in=[r['email'] for r in batch]).values_list('email', flat=True))
+    batch = [row for row in batch if row['email'] not in existing]
+    if not batch:
+        return 0
+
+    # PBKDF2 dominates the import; hash in parallel and outside the transaction
+    passwords = list(hasher_pool.map(make_password, [row.get('password') or None for row in batch], chunksize=16))
+    return _create_users(batch, passwords)
+
+
+@write_transaction
+def _create_users(batch, passwords):
+    # Another writer may have registered some of these emails since the check
+    taken = set(CustomUser.objects.filter(email__in=[r['email'] for r in batch]).values_list('email', flat=True))
+    pairs = [(row, password) for row, password in zip(batch, passwords) if row['email'] not in taken]
+    batch = [row for row, _ in pairs]
+
+    CustomUser.objects.bulk_create([
+        CustomUser(
+            email=row['email'],
+            password=password,
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+            user_type=row.get('user_type') or CustomUser.UserType.FREELANCER,
+        )
+        for row, password in pairs
+    ])
+    user_ids = dict(CustomUser.objects.filter(email__in=[r['email'] for r in batch]).values_list('email', 'id'))
+
+    # What create_user_profile does for each user, as one insert
+    Profile.objects.bulk_create([
+        Profile(user_id=user_ids[row['email']], **{f: row.get(f) or None for f in PROFILE_FIELDS})
+        for row in batch
+    ])
+    profile_ids = dict(Profile.objects.filter(user_id__in=user_ids.values()).values_list('user_id', 'id'))
+
+    skills = {row['email']: split_skills(row.get('skills')) for row in batch}
+    tag_ids = _tag_ids(name for names in skills.values() for name in names)
+    # Two spellings of one skill give a single link
+    pairs = dict.fromkeys(
+        (profile_ids[user_ids[email]], tag_ids[name]) for email, names in skills.items() for name in names
+    )
+    links = [Profile.skills.through(profile_id=profile_id, tag_id=tag_id) for profile_id, tag_id in pairs]
+    Profile.skills.through.objects.bulk_create(links, ignore_conflicts=True)
+    record_tag_usage(supply=Counter(link.tag_id for link in links))
+    return len(batch)
+
+
+@write_transaction
+def _import_experiences(batch, hasher_pool=None):
+    emails = {CustomUser.objects.normalize_email(row['email']) for row in batch}
+    profile_ids = dict(Profile.objects.filter(user__email__in=emails).values_list('user__email', 'id'))
+    experiences = [
+        Experience(
+            profile_id=profile_ids[email],
+            organization=row['organization'],
+            role=row['role'],
+            years=Decimal(str(row['years'])),
+            details=row.get('details') or None,
+        )
+        for row in batch
+        if (email := CustomUser.objects.normalize_email(row['email'])) in profile_ids
+    ]
+    Experience.objects.bulk_create(experiences)
+    bump_profile_versions(pk__in={experience.profile_id for experience in experiences})
+    mark_stale(PROFILE, {experience.profile_id for experience in experiences})
+    return len(experiences)
+
+
+@write_transaction
+def _import_projects(batch, hasher_pool=None):
+    emails = {CustomUser.objects.normalize_email(row['organization_email']) for row in batch}
+    profile_ids = dict(
+        Profile.objects.filter(user__email__in=emails, user__user_type=CustomUser.UserType.ORGANIZATION)
+        .values_list('user__email', 'id')
+    )
+    rows = [
+        row for row in batch
+        if CustomUser.objects.normalize_email(row['organization_email']) in profile_ids
+    ]
+    # bulk_create sets the primary keys on SQLite 3.35+ and Postgres
+    projects = Project.objects.bulk_create([
+        Project(
+            profile_id=profile_ids[CustomUser.objects.normalize_email(row['organization_email'])],
+            project_description=row['project_description'],
+            terms_of_contract=row['terms_of_contract'],
+            status=row.get('status') or Project.StatusChoices.ONGOING,
+        )
+        for row in rows
+    ])
+
+    skills = [split_skills(row.get('required_skills')) for row in rows]
+    tag_ids = _tag_ids(name for names in skills for name in names)
+    pairs = dict.fromkeys(
+        (project.id, tag_ids[name]) for project, names in zip(projects, skills) for name in names
+    )
+    links = [Project.required_skills.through(project_id=project_id, tag_id=tag_id) for project_id, tag_id in pairs]
+    Project.required_skills.through.objects.bulk_create(links, ignore_conflicts=True)
+    record_tag_usage(demand=Counter(link.tag_id for link in links))
+    return len(projects)
+
+
+IMPORTERS = {
+    'users': _import_users,
+    'experiences': _import_experiences,
+    'projects': _import_projects,
+}
+
+
+def import_file(path, kind, batch_size=1000, workers=None, on_batch=None):
+    """
+    Import ``path`` in batches of ``batch_size``, one transaction per batch.
+    Returns the number of rows created; ``on_batch(created_so_far)`` is called
+    after every batch for progress reporting.
+    """
+    created = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hasher) as hasher_pool:
+        for batch in batched(read_rows(path), batch_size):
+            created += IMPORTERS[kind](batch, hasher_pool)
+            if on_batch:
+                on_batch(created)
+
+    # bulk_create sends no post_save, so the cached counts are refreshed here
+    if kind != 'experiences':
+        invalidate_dashboard_stats()
+    if kind == 'projects':
+        invalidate_facets()
+    return created
@@ -0,0 +1,49 @@
+from django.db.models import Count, Q
+
+from home.models import MatchRequest
+from home.pagination import paginate_by_cursor
+
+MATCH_INBOX_PAGE_SIZE = 20
+
+
+def match_inbox(user, params):
+    """
+    Filtered page of an organization's incoming match requests, plus per-status
+    counts for the selected project in one aggregate query. Shared by the
+    organization's inbox page and the match request API.
+    """
+    base = MatchRequest.objects.filter(project__profile__user=user)
+
+    project_id = params.get('project', '')
+    if project_id.isdigit():
+        base = base.filter(project_id=project_id)
+
+    counts = base.aggregate(
+        total=Count('id'),
+        **{
+            choice: Count('id', filter=Q(status=choice))
+            for choice in MatchRequest.StatusChoices.values
+        }
+    )
+
+    status_filter = params.get('status', '')
+    match_requests = base
+    if status_filter in MatchRequest.StatusChoices.values:
+        match_requests = match_requests.filter(status=status_filter)
+
+    match_requests = match_requests.select_related('freelancer', 'project').only(
+        'id', 'status', 'created_at', 'project_id', 'freelancer_id',
+        'project__project_description',
+        'freelancer__first_name', 'freelancer__last_name', 'freelancer__email',
+    )
+    items, next_cursor = paginate_by_cursor(
+        match_requests, params.get('cursor'), MATCH_INBOX_PAGE_SIZE
+    )
+
+    return {
+        'match_requests': items,
+        'counts': counts,
+        'next_cursor': next_cursor,
+        'selected_project': project_id,
+        'selected_status': status_filter,
+    }
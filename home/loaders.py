@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+
+from home.models import CustomUser, Profile, Project
+
+# Request-scoped batch loading (the DataLoader pattern). Related objects are
+# looked up by key in one in_bulk() per model, and every row fetched during a
+# request is kept in an identity map, so dereferencing the same user, profile
+# or project again costs no query.
+
+
+class Loader:
+    """Identity map and batched lookups for one model, keyed on a unique field."""
+
+    def __init__(self, model, field='pk'):
+        self.model = model
+        self.field = model._meta.pk if field == 'pk' else model._meta.get_field(field)
+        self._objects = {}
+        self._pending = set()
+        self._linked = []
+
+    def link(self, other):
+        """Share loaded rows with a loader of the same model keyed on another field."""
+        self._linked.append(other)
+        other._linked.append(self)
+
+    def prime(self, *objects, _linked=True):
+        for obj in objects:
+            if obj is not None:
+                # The first instance seen for a row stays the one handed out
+                self._objects.setdefault(getattr(obj, self.field.attname), obj)
+        if _linked:
+            for other in self._linked:
+                other.prime(*objects, _linked=False)
+
+    def queue(self, keys):
+        self._pending.update(key for key in keys if key is not None and key not in self._objects)
+
+    def flush(self):
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, set()
+        found = self.model._default_manager.in_bulk(keys, field_name=self.field.attname)
+        self.prime(*found.values())
+        # Remember misses too, so a missing row is not asked for again
+        self._objects.update((key, None) for key in keys - found.keys())
+
+    def get_many(self, keys):
+        keys = list(keys)
+        self.queue(keys)
+        self.flush()
+        return {key: self._objects[key] for key in keys if self._objects.get(key) is not None}
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+
+class RequestLoaders:
+    """The loaders for one request; get it with ``loaders_for(request)``."""
+
+    def __init__(self):
+        self.users = Loader(CustomUser)
+        self.profiles = Loader(Profile)
+        self.profiles_by_user = Loader(Profile, 'user')
+        self.projects = Loader(Project)
+        self.profiles.link(self.profiles_by_user)
+        self._by_model = {
+            CustomUser: self.users, Profile: self.profiles, Project: self.projects,
+        }
+        self._batch = None
+
+    def prime(self, *objects):
+        for obj in objects:
+            loader = self._by_model.get(type(obj))
+            if loader is not None:
+                loader.prime(obj)
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect every ``attach()`` in the block and resolve them together on
+        exit, one ``in_bulk`` per model per hop across all of them.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+            work, self._batch = self._batch, None
+            self._resolve(work)
+        finally:
+            self._batch = None
+
+    def attach(self, objects, *paths):
+        """
+        Set the foreign keys named by ``paths`` (``'freelancer'``,
+        ``'project__profile__user'``) on ``objects`` from the identity map,
+        loading whatever is missing. Like ``prefetch_related`` for forward
+        foreign keys, except that rows are shared across the request.
+        """
+        objects = list(objects)
+        work = [(objects, path.split('__')) for path in paths]
+        if self._batch is not None:
+            self._batch.extend(work)
+        else:
+            self._resolve(work)
+        return objects
+
+    def _resolve(self, work):
+        # One hop at a time: queue the keys of every pending path, flush each
+        # loader once, assign, then carry on from the related objects.
+        while work:
+            hops = []
+            for objects, (name, *rest) in work:
+                field = objects[0]._meta.get_field(name) if objects else None
+                if field is None:
+                    continue
+                loader = self._by_model[field.related_model]
+                loader.queue(getattr(obj, field.attname) for obj in objects)
+                hops.append((objects, field, loader, rest))
+
+            for loader in {id(loader): loader for _, _, loader, _ in hops}.values():
+                loader.flush()
+
+            work = []
+            for objects, field, loader, rest in hops:
+                related = []
+                for obj in objects:
+                    value = loader._objects.get(getattr(obj, field.attname))
+                    field.set_cached_value(obj, value)
+                    if value is not None:
+                        related.append(value)
+                if rest:
+                    work.append((related, rest))
+
+
+def loaders_for(request):
+    """The request's loaders, created on first use and primed with the user."""
+    loaders = getattr(request, '_loaders', None)
+    if loaders is None:
+        loaders = request._loaders = RequestLoaders()
+        if request.user.is_authenticated:
+            loaders.users.prime(request.user)
+    return loaders
@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+
+from home.compression import brotli, compress, compress_stream, compression_level
+from home.models import CustomUser, Post
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 5, 9, 11)}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure response compression: bytes sent and CPU time per request for a few "
+        "pages and API responses at several gzip and brotli levels, the configured "
+        "level marked with *. The streamed /api/posts/ list is compressed chunk by "
+        "chunk as the middleware does. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if brotli is None:
+            self.stderr.write("brotli is not installed; only gzip is measured")
+        try:
+            with transaction.atomic(), override_settings(ASYNC_CONCURRENT_READS=False):
+                self._bench(options["posts"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _bench(self, posts, repeat):
+        user = CustomUser.objects.create_user(
+            email="bench-compression@example.com", first_name="Bench", last_name="User", user_type="freelancer",
+        )
+        Post.objects.bulk_create(
+            Post(user=user, title=f"Post {i}", content="Lorem ipsum dolor sit amet. " * 10) for i in range(posts)
+        )
+        client = Client()
+        client.force_login(user)
+
+        self.stdout.write(f"{'response':<24}{'coding':<10}{'bytes':>10}{'ratio':>8}{'CPU µs':>10}")
+        for url in ("/", "/portfolio/", "/freelancer_matches/", "/api/posts/"):
+            # No Accept-Encoding, so the middleware leaves the body alone
+            response = client.get(url)
+            content_type = response["Content-Type"]
+            if response.streaming:
+                chunks = list(response.streaming_content)
+                body = b"".join(chunks)
+                name = f"{url} (stream)"
+            else:
+                chunks, body = None, response.content
+                name = url
+            self.stdout.write(f"{name:<24}{'identity':<10}{len(body):>10}{1:>8.2f}{0:>10}")
+
+            for encoding, levels in LEVELS.items():
+                if encoding == "br" and brotli is None:
+                    continue
+                configured = compression_level(content_type, encoding)
+                for level in levels:
+                    if chunks is None:
+                        def run():
+                            return compress(body, encoding, level)
+                    else:
+                        def run():
+                            return b"".join(compress_stream(chunks, encoding, level))
+                    best, size = None, 0
+                    for _ in range(repeat):
+                        started = time.process_time()
+                        size = len(run())
+                        elapsed = time.process_time() - started
+                        best = elapsed if best is None else min(best, elapsed)
+                    marker = "*" if level == configured else ""
+                    self.stdout.write(
+                        f"{'':<24}{f'{encoding} {level}{marker}':<10}{size:>10}"
+                        f"{len(body) / size:>8.2f}{best * 1e6:>10.0f}"
+                    )
+
+        self.stdout.write(f"Bodies under {settings.COMPRESSION_MIN_LENGTH} bytes are sent uncompressed.")
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from home.models import CustomUser, Post
+from home.renderers import FastJSONRenderer, orjson
+from home.serializers import PostSerializer
+from home.views import PostListView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare CPU time to render the /api/posts/ payload: PostSerializer + JSONRenderer, "
+        "PostSerializer + the orjson renderer, and the streamed .values() fast path. "
+        "Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write("orjson is not installed; the fast renderer falls back to the stdlib encoder")
+        try:
+            with transaction.atomic():
+                self._bench(options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _bench(self, rows, repeat):
+        user = CustomUser.objects.create_user(email="bench-json@example.com", first_name="Bench", last_name="User")
+        Post.objects.bulk_create(
+            Post(user=user, title=f"Post {i}", content="Lorem ipsum dolor sit amet. " * 10) for i in range(rows)
+        )
+
+        factory = APIRequestFactory()
+        request = Request(factory.get("/api/posts/"))
+        request.user = user
+        view = PostListView()
+
+        def serializer_path(renderer):
+            def run():
+                data = PostSerializer(Post.objects.select_related("user"), many=True,
+                                      context={"request": request}).data
+                return renderer.render(data)
+            return run
+
+        def values_path():
+            request.accepted_renderer = FastJSONRenderer()
+            return b"".join(view.stream_list(request).streaming_content)
+
+        paths = [
+            ("serializer + JSONRenderer", serializer_path(JSONRenderer())),
+            ("serializer + orjson", serializer_path(FastJSONRenderer())),
+            (".values() + orjson stream", values_path),
+        ]
+
+        self.stdout.write(f"{rows} posts, best of {repeat}")
+        self.stdout.write(f"{'path':<28}{'CPU ms':>10}{'per 10k':>10}{'bytes':>12}")
+        for name, run in paths:
+            best, size = None, 0
+            for _ in range(repeat):
+                started = time.process_time()
+                size = len(run())
+                elapsed = time.process_time() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(f"{name:<28}{best * 1000:>10.0f}{best * 1000 * 10000 / rows:>10.0f}{size:>12}")
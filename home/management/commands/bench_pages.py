@@ -0,0 +1,126 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, override_settings
+
+from home.models import Connection, CustomUser, Experience, MatchRequest, Post, Project, Tag
+
+EMAIL = "bench-pages-{}@example.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the async page views (network, connection profile, matches, portfolio) "
+        "in-process with concurrent clients, running each page's queries one after another "
+        "as the sync views did and concurrently through gather_reads. --latency adds a "
+        "simulated database round trip to every query. Creates its own users and removes "
+        "them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--latency", type=float, default=5.0, help="Milliseconds added to every query.")
+        parser.add_argument("--projects", type=int, default=50)
+
+    def handle(self, *args, **options):
+        freelancer, organization = self._create_data(options["projects"])
+        urls = ["/network/", f"/network/{organization.id}/", "/freelancer_matches/", "/portfolio/"]
+
+        latency = options["latency"] / 1000
+
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_latency(sender, connection, **kwargs):
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        if latency:
+            connection_created.connect(add_latency)
+        try:
+            self.stdout.write(
+                f"{options['requests']} requests, {options['concurrency']} concurrent clients, "
+                f"{options['latency']:g} ms per query"
+            )
+            self.stdout.write(f"{'reads':<12}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}{'threads':>10}")
+            for name, concurrent in (("sequential", False), ("concurrent", True)):
+                # AsyncClient sends Host: testserver
+                with override_settings(ASYNC_CONCURRENT_READS=concurrent,
+                                       ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                    latencies, elapsed, threads, errors = asyncio.run(
+                        self._load(freelancer, urls, options["requests"], options["concurrency"])
+                    )
+                if errors:
+                    # Timing error pages would compare nothing
+                    raise CommandError(f"{len(errors)} of {options['requests']} {name} requests failed: {errors[0]}")
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                self.stdout.write(
+                    f"{name:<12}{statistics.median(latencies) * 1000:>10.1f}{p95 * 1000:>10.1f}"
+                    f"{len(latencies) / elapsed:>10.0f}{threads:>10}"
+                )
+        finally:
+            connection_created.disconnect(add_latency)
+            CustomUser.objects.filter(email__in=[freelancer.email, organization.email]).delete()
+            Tag.objects.filter(name__startswith="bench-pages-").delete()
+
+    async def _load(self, user, urls, requests, concurrency):
+        latencies, errors = [], []
+        peak_threads = threading.active_count()
+        counter = iter(range(requests))
+
+        async def client_loop():
+            nonlocal errors, peak_threads
+            client = AsyncClient()
+            await client.aforce_login(user)
+            for i in counter:
+                started = time.perf_counter()
+                # One thread-sensitive context per request, as ASGIHandler does
+                async with ThreadSensitiveContext():
+                    response = await client.get(urls[i % len(urls)])
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors.append(f"{response.status_code} from {urls[i % len(urls)]}")
+                peak_threads = max(peak_threads, threading.active_count())
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - started, peak_threads, errors
+
+    def _create_data(self, projects):
+        CustomUser.objects.filter(email__in=[EMAIL.format("freelancer"), EMAIL.format("organization")]).delete()
+        freelancer = CustomUser.objects.create_user(
+            email=EMAIL.format("freelancer"), first_name="Bench", last_name="Freelancer", user_type="freelancer",
+        )
+        organization = CustomUser.objects.create_user(
+            email=EMAIL.format("organization"), first_name="Bench", last_name="Org", user_type="organization",
+        )
+        tags = [Tag.objects.get_or_create(name=f"bench-pages-{i}")[0] for i in range(5)]
+        freelancer.profile.skills.add(*tags)
+
+        Connection.objects.bulk_create([
+            Connection(user=freelancer, connected_to=organization),
+            Connection(user=organization, connected_to=freelancer),
+        ])
+        Post.objects.bulk_create(Post(user=user, title=f"Post {i}", content="Lorem ipsum " * 20)
+                                 for user in (freelancer, organization) for i in range(20))
+        Experience.objects.bulk_create(
+            Experience(profile=freelancer.profile, organization=f"Org {i}", role="Developer", years=2)
+            for i in range(5)
+        )
+        for i in range(projects):
+            project = Project.objects.create(
+                profile=organization.profile, project_description=f"Project {i}", terms_of_contract="Fixed price",
+            )
+            project.required_skills.add(tags[i % len(tags)])
+            if i % 5 == 0:
+                project.collaborators.add(freelancer)
+                MatchRequest.objects.create(freelancer=freelancer, project=project)
+        return freelancer, organization
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home.db import backoff_delay, is_lock_error
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark read/write throughput of a scratch SQLite database with many "
+        "concurrent workers, using Django's default SQLite setup and the "
+        "SQLITE_HIGH_CONCURRENCY profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--write-ratio", type=float, default=0.2,
+                            help="Fraction of operations that are writes.")
+
+    def handle(self, *args, **options):
+        profiles = [
+            ("default", {"pragmas": {}, "begin": "BEGIN", "timeout": 5.0, "retries": 0}),
+            ("high-concurrency", {
+                "pragmas": settings.SQLITE_PRAGMAS,
+                "begin": "BEGIN IMMEDIATE",
+                "timeout": 20.0,
+                "retries": 5,
+            }),
+        ]
+
+        self.stdout.write(
+            f"{options['workers']} workers, {options['seconds']}s, "
+            f"write ratio {options['write_ratio']}"
+        )
+        self.stdout.write(
+            f"{'profile':<18}{'reads/s':>10}{'writes/s':>10}{'lock errors':>13}{'other errors':>14}"
+        )
+        for name, profile in profiles:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.sqlite3")
+                self._create_schema(path)
+                totals = self._run(path, profile, options)
+            elapsed = options["seconds"]
+            self.stdout.write(
+                f"{name:<18}{totals['reads'] / elapsed:>10.0f}{totals['writes'] / elapsed:>10.0f}"
+                f"{totals['lock_errors']:>13}{len(totals['other_errors']):>14}"
+            )
+            # Anything but lock contention is a broken setup, not a result
+            for message in sorted(set(totals["other_errors"])):
+                self.stderr.write(f"  {name}: {message}")
+
+    def _create_schema(self, path):
+        conn = sqlite3.connect(path)
+        # Mirrors the shape of home_post / home_matchrequest closely enough for locking behaviour.
+        conn.executescript(
+            """
+            CREATE TABLE post (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                title VARCHAR(255) NOT NULL,
+                content TEXT NOT NULL,
+                created_at DATETIME NOT NULL
+            );
+            CREATE INDEX post_user_id ON post (user_id);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO post (user_id, title, content, created_at) VALUES (?, ?, ?, datetime('now'))",
+            [(i % 100, f"Post {i}", "x" * 200) for i in range(2000)],
+        )
+        conn.commit()
+        conn.close()
+
+    def _connect(self, path, profile):
+        conn = sqlite3.connect(path, timeout=profile["timeout"], isolation_level=None,
+                               check_same_thread=False)
+        for name, value in profile["pragmas"].items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _run(self, path, profile, options):
+        totals = {"reads": 0, "writes": 0, "lock_errors": 0, "other_errors": []}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options["seconds"]
+        write_every = max(1, round(1 / options["write_ratio"])) if options["write_ratio"] > 0 else 0
+
+        def worker(worker_id):
+            conn = self._connect(path, profile)
+            reads = writes = lock_errors = 0
+            other_errors = []
+            op = 0
+            while time.perf_counter() < deadline:
+                op += 1
+                if write_every and op % write_every == 0:
+                    try:
+                        if self._write(conn, profile, worker_id):
+                            writes += 1
+                        else:
+                            lock_errors += 1
+                    except sqlite3.Error as exc:
+                        other_errors.append(f"{type(exc).__name__}: {exc}")
+                else:
+                    conn.execute(
+                        "SELECT id, title FROM post WHERE user_id = ? ORDER BY created_at DESC LIMIT 20",
+                        (worker_id % 100,),
+                    ).fetchall()
+                    reads += 1
+            conn.close()
+            with lock:
+                totals["reads"] += reads
+                totals["writes"] += writes
+                totals["lock_errors"] += lock_errors
+                totals["other_errors"].extend(other_errors)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options["workers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return totals
+
+    def _write(self, conn, profile, worker_id):
+        """True once written, False when still locked after the retries; other errors propagate."""
+        for attempt in range(profile["retries"] + 1):
+            try:
+                conn.execute(profile["begin"])
+                # Read-then-write, like get_or_create, which is what upgrades a
+                # deferred transaction's lock and deadlocks under contention.
+                conn.execute("SELECT COUNT(*) FROM post WHERE user_id = ?", (worker_id % 100,)).fetchone()
+                conn.execute(
+                    "INSERT INTO post (user_id, title, content, created_at) VALUES (?, ?, ?, datetime('now'))",
+                    (worker_id % 100, "bench", "y" * 200),
+                )
+                conn.execute("COMMIT")
+                return True
+            except sqlite3.Error as exc:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                if not is_lock_error(exc):
+                    raise
+                if attempt == profile["retries"]:
+                    return False
+                time.sleep(backoff_delay(attempt))
+        return False
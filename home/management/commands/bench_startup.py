@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a worker does before its first request: set up the app registry, then
+# load the URLconf. Only the second part is attributed to the URLconf.
+STARTUP_CODE = "import django; django.setup(); import {urlconf}"
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(code):
+    """
+    Run ``code`` in a fresh interpreter under ``python -X importtime`` and
+    return ``{module: (self_us, cumulative_us, depth)}`` for every module it
+    imported. The child inherits the environment, settings module included.
+    """
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "SkillNexus.settings")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            times[module] = (int(own), int(cumulative), len(indent) // 2)
+    return times
+
+
+def subtree(times, root):
+    """Modules first imported while importing ``root``."""
+    # importtime prints children before their parent, one level deeper
+    modules = list(times)
+    end = modules.index(root)
+    start = end
+    while start > 0 and times[modules[start - 1]][2] > times[root][2]:
+        start -= 1
+    return modules[start:end]
+
+
+def urlconf_import_times(urlconf=None):
+    return import_times(STARTUP_CODE.format(urlconf=urlconf or settings.ROOT_URLCONF))
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold-start import cost of the URLconf with python -X importtime "
+        "(best of --repeat fresh interpreters) and list the most expensive modules it pulls in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15)
+
+    def handle(self, *args, **options):
+        urlconf = settings.ROOT_URLCONF
+        best = None
+        for _ in range(options["repeat"]):
+            times = urlconf_import_times(urlconf)
+            if best is None or times[urlconf][1] < best[urlconf][1]:
+                best = times
+
+        modules = subtree(best, urlconf)
+
+        self.stdout.write(f"{urlconf}: {best[urlconf][1] / 1000:.1f} ms cumulative, "
+                          f"{len(modules)} modules, best of {options['repeat']}")
+        self.stdout.write(f"{'module':<50}{'self ms':>10}{'cum ms':>10}")
+        for module in sorted(modules, key=lambda m: -best[m][1])[:options["top"]]:
+            own, cumulative, _ = best[module]
+            self.stdout.write(f"{module:<50}{own / 1000:>10.1f}{cumulative / 1000:>10.1f}")
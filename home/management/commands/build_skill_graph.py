@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.cooccurrence import MIN_COUNT, NEIGHBOURS, build_graph, sparse
+from home.models import Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the tag co-occurrence matrix behind related-skill suggestions and "
+        "matching expansion from every profile's and project's skills. Run it "
+        "periodically, e.g. nightly; web processes pick up the new build within minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--neighbours", type=int, default=NEIGHBOURS, help="Related tags kept per tag")
+        parser.add_argument("--min-count", type=int, default=MIN_COUNT,
+                            help="Drop pairs listed together by fewer profiles and projects")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        graph, matrix = build_graph(options["neighbours"], options["min_count"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Built skill graph in {elapsed:.1f}s with {'SciPy' if sparse else 'Python'}: "
+            f"{graph.tags} tags, {graph.pairs} pairs, {len(graph.data) / 1024:.1f} KiB stored"
+        ))
+
+        # Lookup cost, served from memory
+        sample = matrix.tag_ids[:1000]
+        if sample:
+            started = time.perf_counter()
+            for tag_id in sample:
+                matrix.related([tag_id])
+            per_lookup = (time.perf_counter() - started) / len(sample) * 1e6
+            busiest = max(sample, key=lambda tag_id: len(matrix.neighbours(tag_id)))
+            names = Tag.objects.in_bulk([busiest, *(tag_id for tag_id, _ in matrix.neighbours(busiest)[:5])])
+            self.stdout.write(f"Lookup: {per_lookup:.1f} µs on average")
+            if busiest in names:
+                self.stdout.write(
+                    f"e.g. {names[busiest].name}: "
+                    + ", ".join(f"{names[t].name} ({s:.2f})" for t, s in matrix.neighbours(busiest)[:5] if t in names)
+                )
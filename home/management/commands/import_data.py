@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.importer import KINDS, import_file, validate_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import users, experiences or projects from a CSV or JSONL file. "
+        "The file is validated in a streaming pass first, then inserted in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row, or a .jsonl file")
+        parser.add_argument("--kind", choices=KINDS, required=True,
+                            help="users: email, password, first_name, last_name, user_type, bio, website, "
+                                 "industry, company_name, skills | experiences: email, organization, role, "
+                                 "years, details | projects: organization_email, project_description, "
+                                 "terms_of_contract, status, required_skills")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Processes used for password hashing (default: CPU count)")
+        parser.add_argument("--validate-only", action="store_true")
+
+    def handle(self, *args, **options):
+        path, kind = options["path"], options["kind"]
+
+        started = time.perf_counter()
+        try:
+            total, problems = validate_file(path, kind)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        for line, errors in problems[:20]:
+            self.stderr.write(f"row {line}: {', '.join(errors)}")
+        if problems:
+            raise CommandError(f"{len(problems)} of {total} rows are invalid, nothing imported")
+        self.stdout.write(f"Validated {total} rows in {time.perf_counter() - started:.1f}s")
+        if options["validate_only"]:
+            return
+
+        started = time.perf_counter()
+
+        def progress(created):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"  {created} {kind} created ({created / elapsed:.0f} rows/s)")
+
+        created = import_file(path, kind, batch_size=options["batch_size"],
+                              workers=options["workers"], on_batch=progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} of {total} {kind} in {elapsed:.1f}s "
+            f"({created / elapsed if elapsed else 0:.0f} rows/s); {total - created} skipped"
+        ))
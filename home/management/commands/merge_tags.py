@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from home.models import Tag
+from home.skills import SIMILARITY_THRESHOLD, merge_tags, similar_tags, tag_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold duplicate skill tags into one. Name the tags to merge with --into, "
+        "use --auto to merge tags that differ only in case or spacing, or --suggest "
+        "to list likely duplicates found through the trigram index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("sources", nargs="*", help="Names of the tags to merge away")
+        parser.add_argument("--into", help="Name of the tag to keep")
+        parser.add_argument("--auto", action="store_true",
+                            help="Merge tags whose names are equal after normalization into the most used one")
+        parser.add_argument("--suggest", action="store_true", help="List near-duplicate pairs, change nothing")
+        parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+
+    def handle(self, *args, **options):
+        if options["suggest"]:
+            return self._suggest(options["threshold"])
+        if options["auto"]:
+            return self._auto()
+        if not options["sources"] or not options["into"]:
+            raise CommandError("Give the tags to merge and --into, or use --auto or --suggest")
+
+        names = [*options["sources"], options["into"]]
+        tags = Tag.objects.in_bulk(names, field_name="name")
+        unknown = [name for name in names if name not in tags]
+        if unknown:
+            raise CommandError(f"Unknown tags: {', '.join(unknown)}")
+        changed = merge_tags([tags[name] for name in options["sources"]], tags[options["into"]])
+        self.stdout.write(self.style.SUCCESS(
+            f"Merged {len(options['sources'])} tags into {options['into']!r}; {changed} profiles and projects updated"
+        ))
+
+    def _auto(self):
+        groups = defaultdict(list)
+        tags = Tag.objects.annotate(uses=Count("profile", distinct=True) + Count("project", distinct=True))
+        for tag in tags.order_by("-uses", "id"):
+            groups[tag_key(tag.name)].append(tag)
+
+        merged = changed = 0
+        for target, *sources in groups.values():
+            if sources:
+                changed += merge_tags(sources, target)
+                merged += len(sources)
+                self.stdout.write(f"  {', '.join(tag.name for tag in sources)} -> {target.name}")
+        self.stdout.write(self.style.SUCCESS(f"Merged {merged} tags; {changed} profiles and projects updated"))
+
+    def _suggest(self, threshold):
+        seen = set()
+        for tag in Tag.objects.order_by("name").iterator():
+            for other, score in similar_tags(tag.name, threshold=threshold, exclude=[tag.id]):
+                pair = frozenset((tag.id, other.id))
+                if pair not in seen:
+                    seen.add(pair)
+                    self.stdout.write(f"{score:.2f}  {tag.name!r}  {other.name!r}")
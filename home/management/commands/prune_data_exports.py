@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home.exports import EXPORT_RETENTION, prune_exports
+
+
+class Command(BaseCommand):
+    help = f"Delete data exports, and their files, finished more than {EXPORT_RETENTION.days} days ago. Run daily."
+
+    def handle(self, *args, **options):
+        deleted = prune_exports()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} export(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from home.sync import TOMBSTONE_RETENTION, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = f"Delete post tombstones older than {TOMBSTONE_RETENTION.days} days. Run daily."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstone(s)"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from home.counters import RECONCILE_BATCH_SIZE, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the connection, pending request and collaborator counters on profiles and "
+        "projects in batches of primary keys and correct the rows that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        def progress(model, upto, fixed):
+            if fixed:
+                self.stdout.write(f"  {model.__name__} ids below {upto}: {fixed} corrected")
+
+        corrected = reconcile_counters(options["batch_size"], on_batch=progress)
+        self.stdout.write(self.style.SUCCESS(
+            "Reconciled counters: " + ", ".join(f"{n} {name.lower()}(s) corrected" for name, n in corrected.items())
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from home.analytics import reconcile_tag_stats
+
+
+class Command(BaseCommand):
+    help = "Repair drift between TagStats buckets and the actual project/profile skill counts. Also backfills on first run."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = reconcile_tag_stats()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled tag stats, {drifted} tag(s) corrected"))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.textmatch import TOP_K, refresh_text_matches, sparse
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the TF-IDF text matches between freelancers (bio, experience) and projects "
+        "(description). Only texts edited since the last run are reindexed; --full rescores "
+        "everything with current document frequencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true")
+        parser.add_argument("--top", type=int, default=TOP_K, help="Projects kept per freelancer")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = refresh_text_matches(full=options["full"], k=options["top"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Reindexed {stats['profiles']} profiles and {stats['projects']} projects, "
+            f"rewrote {stats['lists']} freelancers' lists ({stats['matches']} matches) in {time.perf_counter() - started:.1f}s "
+            f"({'SciPy' if sparse else 'Python'} scoring)"
+        ))
@@ -0,0 +1,37 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+
+import home.tasks  # noqa: F401  registers the task functions
+from home.queue import claim_tasks, release_stale_tasks, run_task
+
+
+class Command(BaseCommand):
+    help = "Process background tasks from the database queue. Run one per process; workers share the queue safely."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10, help="Tasks claimed per poll.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the due tasks and exit.")
+        parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}")
+
+    def handle(self, *args, **options):
+        worker_id = options["worker_id"]
+        self.stdout.write(f"Worker {worker_id} started")
+
+        try:
+            while True:
+                release_stale_tasks()
+                tasks = claim_tasks(worker_id, limit=options["batch_size"])
+                for task in tasks:
+                    ok = run_task(task)
+                    self.stdout.write(f"{'done' if ok else 'failed'}: {task}")
+
+                if not tasks:
+                    if options["once"]:
+                        break
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write(f"Worker {worker_id} stopped")
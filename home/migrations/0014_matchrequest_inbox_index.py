@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0013_task'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchrequest',
+            index=models.Index(fields=['project', 'status', 'created_at'], name='home_matchr_project_688237_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0014_matchrequest_inbox_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('demand', models.IntegerField(default=0)),
+                ('supply', models.IntegerField(default=0)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='home.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'tag'], name='home_tagsta_day_8e7401_idx')],
+                'unique_together': {('tag', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0018_post_updated_at_posttombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
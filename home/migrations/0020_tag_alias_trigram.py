@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_aliases_and_trigrams(apps, schema_editor):
+    # Same rules as home.skills.tag_key/trigrams at the time of writing
+    Tag = apps.get_model('home', 'Tag')
+    TagAlias = apps.get_model('home', 'TagAlias')
+    TagTrigram = apps.get_model('home', 'TagTrigram')
+
+    aliases, grams = {}, []
+    for tag_id, name in Tag.objects.order_by('id').values_list('id', 'name').iterator():
+        key = ' '.join(name.split()).casefold()
+        # Tags that only differ in case or spacing keep the oldest as the
+        # canonical one until "manage.py merge_tags --auto" folds them in
+        aliases.setdefault(key, tag_id)
+        tag_grams = set()
+        for word in key.split():
+            padded = f"  {word} "
+            tag_grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        grams.extend(TagTrigram(trigram=gram, tag_id=tag_id) for gram in tag_grams)
+    TagAlias.objects.bulk_create([TagAlias(alias=key, tag_id=tag_id) for key, tag_id in aliases.items() if key],
+                                 batch_size=1000)
+    TagTrigram.objects.bulk_create(grams, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0019_profile_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='home.tag')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TagTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='home.tag')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['trigram', 'tag'], name='home_tagtri_trigram_b2d810_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_aliases_and_trigrams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0021_skill_graph'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50, unique=True)),
+                ('documents', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TextVector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('profile', 'Profile'), ('project', 'Project')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('digest', models.CharField(max_length=32)),
+                ('terms', models.BinaryField()),
+                ('stale', models.BooleanField(default=False)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'stale'], name='home_textve_kind_3db887_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TextMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_matches', to='home.profile')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_matches', to='home.project')),
+            ],
+            options={
+                'unique_together': {('profile', 'project')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    # Same counts as home.counters.actual_counts() at the time of writing
+    Connection = apps.get_model('home', 'Connection')
+    MatchRequest = apps.get_model('home', 'MatchRequest')
+    Profile = apps.get_model('home', 'Profile')
+    Project = apps.get_model('home', 'Project')
+    Collaborators = Project.collaborators.through
+
+    def count(queryset, key):
+        return Coalesce(Subquery(queryset.order_by().values(key).annotate(n=Count('*')).values('n')), Value(0))
+
+    pending = MatchRequest.objects.filter(status='pending')
+    Profile.objects.update(
+        connections_count=count(Connection.objects.filter(user_id=OuterRef('user_id')), 'user_id'),
+        pending_requests_count=count(pending.filter(freelancer_id=OuterRef('user_id')), 'freelancer_id')
+        + count(pending.filter(project__profile_id=OuterRef('pk')), 'project__profile_id'),
+    )
+    Project.objects.update(
+        pending_requests_count=count(pending.filter(project_id=OuterRef('pk')), 'project_id'),
+        collaborators_count=count(Collaborators.objects.filter(project_id=OuterRef('pk')), 'project_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0022_text_matching'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='connections_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='pending_requests_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='collaborators_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='pending_requests_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0023_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='dataexport',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('user',), name='one_pending_export_per_user'),
+        ),
+    ]
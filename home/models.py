@@ -3,6 +3,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 # ========== Custom User Manager ==========
 class CustomUserManager(BaseUserManager):
@@ -49,12 +50,29 @@ class Tag(models.Model):
     def __str__(self):
         return self.name
 
+class TagAlias(models.Model):
+    """A normalized spelling of a skill (see home.skills.tag_key) and the tag it stands for."""
+    alias = models.CharField(max_length=100, unique=True)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="aliases")
+
+    def __str__(self):
+        return f"{self.alias} → {self.tag_id}"
+
+class TagTrigram(models.Model):
+    """Trigram index over tag names for fuzzy lookups (home.skills.similar_tags)."""
+    trigram = models.CharField(max_length=3)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="trigrams")
+
+    class Meta:
+        indexes = [models.Index(fields=['trigram', 'tag'])]
+
 # ========== Post Model ==========
 class Post(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="posts")
     title = models.CharField(max_length=255, default="Untitled Post")
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.title} by {self.user.email}"
@@ -62,6 +80,14 @@ class Post(models.Model):
     class Meta:
         ordering = ['-created_at']
 
+class PostTombstone(models.Model):
+    """Deleted posts, so clients syncing with ?since= can drop them from their cache."""
+    post_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Post {self.post_id} deleted at {self.deleted_at}"
+
 # ========== Experience for Freelancers ==========
 class Experience(models.Model):
     profile = models.ForeignKey("Profile", on_delete=models.CASCADE, related_name="experiences")
@@ -90,6 +116,14 @@ class Profile(models.Model):
     company_name = models.CharField(max_length=255, blank=True, null=True)
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
 
+    # Bumped whenever anything in the profile API payload changes (home.etags)
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Kept up to date by home.counters; reconcile_counters repairs drift
+    connections_count = models.IntegerField(default=0, editable=False)
+    # Pending match requests sent (freelancers) or received (organizations)
+    pending_requests_count = models.IntegerField(default=0, editable=False)
+
     def __str__(self):
         return f"Profile of {self.user.email}"
 
@@ -117,6 +151,10 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=StatusChoices.choices, default=StatusChoices.ONGOING)
     collaborators = models.ManyToManyField(CustomUser, blank=True, limit_choices_to={"user_type": "freelancer"})
 
+    # Kept up to date by home.counters
+    pending_requests_count = models.IntegerField(default=0, editable=False)
+    collaborators_count = models.IntegerField(default=0, editable=False)
+
     def __str__(self):
         return f"Project for {self.profile.company_name or self.profile.user.email}"
 
@@ -152,6 +190,163 @@ class MatchRequest(models.Model):
 
     class Meta:
         unique_together = ('freelancer', 'project')  # Prevent duplicate requests
+        indexes = [models.Index(fields=['project', 'status', 'created_at'])]  # Inbox filters and cursor
 
     def __str__(self):
         return f"{self.freelancer.email} → {self.project.profile.company_name} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets home.counters tell whether a save moves the request out of pending
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+# ========== Background Tasks ==========
+class Task(models.Model):
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+    idempotency_key = models.CharField(max_length=255, unique=True, blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+# ========== Skill Usage Analytics ==========
+class TagStats(models.Model):
+    """
+    Daily change in how many projects require a tag (demand) and how many
+    profiles list it (supply). Summing every bucket gives the current usage;
+    summing a window gives what is trending in it.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="daily_stats")
+    day = models.DateField()
+    demand = models.IntegerField(default=0)
+    supply = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('tag', 'day')
+        indexes = [models.Index(fields=['day', 'tag'])]
+
+    def __str__(self):
+        return f"{self.tag.name} on {self.day}: demand {self.demand:+d}, supply {self.supply:+d}"
+
+class SkillGraph(models.Model):
+    """
+    A build of the tag co-occurrence matrix (home.cooccurrence): the strongest
+    neighbours of every tag as packed, compressed CSR arrays. Only the newest
+    build is read.
+    """
+    built_at = models.DateTimeField(auto_now_add=True)
+    tags = models.PositiveIntegerField(default=0)
+    pairs = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return f"Skill graph of {self.built_at:%Y-%m-%d %H:%M} ({self.tags} tags, {self.pairs} pairs)"
+
+# ========== Text Matching ==========
+class TextTerm(models.Model):
+    """A word of the text-matching vocabulary and how many indexed texts contain it."""
+    term = models.CharField(max_length=50, unique=True)
+    documents = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term} ({self.documents})"
+
+class TextVector(models.Model):
+    """
+    Term counts of a freelancer's bio and experience, or of a project
+    description, packed by home.textmatch. Edits mark the row stale so the
+    next refresh reindexes only what changed.
+    """
+    class KindChoices(models.TextChoices):
+        PROFILE = "profile", "Profile"
+        PROJECT = "project", "Project"
+
+    kind = models.CharField(max_length=10, choices=KindChoices.choices)
+    object_id = models.BigIntegerField()
+    digest = models.CharField(max_length=32)
+    terms = models.BinaryField()
+    stale = models.BooleanField(default=False)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+        indexes = [models.Index(fields=['kind', 'stale'])]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}{' (stale)' if self.stale else ''}"
+
+class TextMatch(models.Model):
+    """One of a freelancer's nearest projects by TF-IDF cosine similarity."""
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="text_matches")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="text_matches")
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ('profile', 'project')
+
+    def __str__(self):
+        return f"Profile {self.profile_id} ~ project {self.project_id}: {self.score:.2f}"
+
+# ========== Account Deletion ==========
+class AccountDeletion(models.Model):
+    """Progress of a background account purge. Keeps plain ids since it outlives the user."""
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+
+    user_id = models.BigIntegerField(unique=True)
+    email = models.EmailField()
+    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+    step = models.CharField(max_length=50, blank=True, default="")
+    rows_deleted = models.PositiveIntegerField(default=0)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Deletion of {self.email} ({self.status}, {self.rows_deleted} rows)"
+
+# ========== Personal Data Export ==========
+class DataExport(models.Model):
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="data_exports")
+    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+    file_path = models.CharField(max_length=255, blank=True, default="")
+    rows_exported = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # A second request while one is being built reuses it (home.exports.start_export)
+            models.UniqueConstraint(
+                fields=['user'], condition=models.Q(status='pending'), name='one_pending_export_per_user',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Export for {self.user.email} ({self.status})"
@@ -0,0 +1,121 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from home.models import Task
+
+logger = logging.getLogger(__name__)
+
+# name -> function, filled by the @task decorator when home.tasks is imported.
+registry = {}
+
+
+def task(name=None, max_attempts=5):
+    """
+    Register a function as a background task.
+
+    The function receives the JSON payload as keyword arguments and must be safe
+    to run more than once: a worker can die after the work committed but before
+    the task was marked done.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        registry[task_name] = func
+
+        def enqueue(idempotency_key=None, delay=None, **payload):
+            return enqueue_task(task_name, payload, idempotency_key=idempotency_key,
+                                delay=delay, max_attempts=max_attempts)
+
+        func.task_name = task_name
+        func.enqueue = enqueue
+        return func
+
+    return decorator
+
+
+def enqueue_task(name, payload=None, idempotency_key=None, delay=None, max_attempts=5):
+    """
+    Store a task for the workers. A second enqueue with the same idempotency key
+    returns the existing task instead of creating a duplicate.
+    """
+    fields = {
+        "name": name,
+        "payload": payload or {},
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + (delay or timedelta()),
+    }
+    if idempotency_key is None:
+        return Task.objects.create(**fields)
+
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def claim_tasks(worker_id, limit=10):
+    """Atomically mark up to ``limit`` due tasks as running for this worker."""
+    now = timezone.now()
+    due = Task.objects.filter(
+        status=Task.StatusChoices.PENDING, run_after__lte=now
+    ).order_by("run_after", "id")
+    claim = {
+        "status": Task.StatusChoices.RUNNING,
+        "locked_by": worker_id,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            Task.objects.filter(id__in=ids).update(**claim)
+    else:
+        # SQLite has no row locks: claim each row with a compare-and-swap on its
+        # status so two workers can never both win the same task.
+        ids = [
+            task_id
+            for task_id in due.values_list("id", flat=True)[:limit]
+            if Task.objects.filter(id=task_id, status=Task.StatusChoices.PENDING).update(**claim)
+        ]
+
+    return list(Task.objects.filter(id__in=ids).order_by("run_after", "id"))
+
+
+def run_task(task_obj):
+    func = registry.get(task_obj.name)
+    try:
+        if func is None:
+            raise LookupError(f"No task registered as {task_obj.name!r}")
+        func(**task_obj.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Task %s failed (attempt %s)", task_obj, task_obj.attempts)
+        if task_obj.attempts >= task_obj.max_attempts:
+            Task.objects.filter(id=task_obj.id).update(
+                status=Task.StatusChoices.FAILED, last_error=error, locked_by="", locked_at=None
+            )
+        else:
+            retry_in = timedelta(seconds=min(2 ** task_obj.attempts, 300))
+            Task.objects.filter(id=task_obj.id).update(
+                status=Task.StatusChoices.PENDING, last_error=error, locked_by="", locked_at=None,
+                run_after=timezone.now() + retry_in,
+            )
+        return False
+
+    Task.objects.filter(id=task_obj.id).update(
+        status=Task.StatusChoices.DONE, locked_by="", locked_at=None
+    )
+    return True
+
+
+def release_stale_tasks(lease=timedelta(minutes=10)):
+    """Hand tasks held by crashed workers back to the queue."""
+    return Task.objects.filter(
+        status=Task.StatusChoices.RUNNING, locked_at__lt=timezone.now() - lease
+    ).update(status=Task.StatusChoices.PENDING, locked_by="", locked_at=None)
@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional speedup, falls back to the stdlib encoder
+    orjson = None
+
+# "Z" for UTC matches the strings DRF's DateTimeField produces
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Decimal, lazy strings, querysets etc., exactly as DRF would encode them
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    return _fallback_encoder.encode(data).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DRF's JSONRenderer, but encoded by orjson when it is installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+def stream_json_array(rows):
+    """
+    Encode an iterable of dicts as one JSON array, a row at a time, for a
+    StreamingHttpResponse. Memory use does not grow with the number of rows.
+    """
+    yield b'['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield dumps(row)
+        else:
+            yield b',' + dumps(row)
+    yield b']'
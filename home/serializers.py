@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from home.models import Post, CustomUser, Profile, Experience, Connection
+from home.models import Post, CustomUser, Profile, Experience, Connection, MatchRequest, Project
 
 
 # --- Post Serializer ---
@@ -11,19 +11,52 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ['id', 'title', 'content', 'created_at', 'user_full_name', 'can_edit', 'is_owner']
+        eager_load = ['user']  # used by get_user_full_name
+
+    # Columns from_values() reads, for the post list's streamed path
+    values_fields = ('id', 'title', 'content', 'created_at', 'user_id', 'user__first_name', 'user__last_name')
+
+    @staticmethod
+    def full_name(first_name, last_name):
+        return f"{first_name or ''} {last_name or ''}".strip()
+
+    @classmethod
+    def from_values(cls, row, viewer_id):
+        """
+        The representation of a ``.values(*values_fields)`` row, built without
+        model instances. Must match to_representation(); PostListStreamTests
+        compares the two.
+        """
+        is_owner = viewer_id is not None and viewer_id == row['user_id']
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'created_at': row['created_at'],
+            'user_full_name': cls.full_name(row['user__first_name'], row['user__last_name']),
+            'can_edit': is_owner,
+            'is_owner': is_owner,
+        }
 
     def get_user_full_name(self, obj):
-        first = obj.user.first_name or ''
-        last = obj.user.last_name or ''
-        return f"{first} {last}".strip()
+        return self.full_name(obj.user.first_name, obj.user.last_name)
+
+    def get_viewer_id(self):
+        # The same for every row, so resolve it once per response. The context
+        # dict is shared by all child serializers of a list.
+        if 'viewer_id' not in self.context:
+            request = self.context.get('request')
+            user = getattr(request, 'user', None)
+            self.context['viewer_id'] = user.id if user is not None and user.is_authenticated else None
+        return self.context['viewer_id']
     
     def get_can_edit(self, obj):
-        request = self.context.get('request')
-        return request and request.user == obj.user
+        viewer_id = self.get_viewer_id()
+        return viewer_id is not None and viewer_id == obj.user_id
     
     def get_is_owner(self, obj):
-        request = self.context.get('request')
-        return request and request.user == obj.user
+        viewer_id = self.get_viewer_id()
+        return viewer_id is not None and viewer_id == obj.user_id
 
 # --- Experience Serializer (for freelancer profile) ---
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -34,11 +67,11 @@ class ExperienceSerializer(serializers.ModelSerializer):
 
 # --- Connection Serializer ---
 class ConnectionSerializer(serializers.ModelSerializer):
-    connected_user_email = serializers.EmailField(source='connected_user.email', read_only=True)
+    connected_user_email = serializers.EmailField(source='connected_to.email', read_only=True)
 
     class Meta:
         model = Connection
-        fields = ['id', 'connected_user', 'connected_user_email']
+        fields = ['id', 'connected_to', 'connected_user_email']
 
 
 # --- Profile Serializer (shared for both freelancers and organizations) ---
@@ -53,7 +86,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = [
-            'profile_picture'
+            'profile_picture',
             'user_email',
             'user_type',
             'bio',
@@ -70,6 +103,34 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 
 
+# --- Match Request Serializer (organization inbox) ---
+class MatchRequestSerializer(serializers.ModelSerializer):
+    freelancer_name = serializers.SerializerMethodField()
+    freelancer_email = serializers.EmailField(source='freelancer.email', read_only=True)
+    project_description = serializers.CharField(source='project.project_description', read_only=True)
+
+    class Meta:
+        model = MatchRequest
+        fields = ['id', 'project', 'project_description', 'freelancer', 'freelancer_name',
+                  'freelancer_email', 'status', 'created_at']
+        eager_load = ['freelancer']  # used by get_freelancer_name
+
+    def get_freelancer_name(self, obj):
+        return f"{obj.freelancer.first_name} {obj.freelancer.last_name}".strip()
+
+
+# --- Project Serializer (discovery) ---
+class ProjectSerializer(serializers.ModelSerializer):
+    company_name = serializers.CharField(source='profile.company_name', read_only=True)
+    industry = serializers.CharField(source='profile.industry', read_only=True)
+    required_skills = serializers.SlugRelatedField(slug_field='name', many=True, read_only=True)
+
+    class Meta:
+        model = Project
+        fields = ['id', 'project_description', 'terms_of_contract', 'status',
+                  'company_name', 'industry', 'required_skills']
+
+
 # --- Register Serializer ---
 class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,169 @@
+from django.db.models import Count, F, Min, Sum
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from home.analytics import PROFILE_SKILLS, PROJECT_SKILLS, record_tag_usage
+from home.db import write_transaction
+from home.etags import bump_profile_versions
+from home.models import Tag, TagAlias, TagStats, TagTrigram
+
+# Skill names are canonicalized through TagAlias: every spelling maps, after
+# case and whitespace normalization, to one tag. New names go through
+# canonical_tag_ids() so "python", "Python " and "PYTHON" all land on the same
+# row; spellings normalization cannot catch ("Py", "Pyhton") are found with
+# similar_tags() and folded in with merge_tags().
+
+SIMILARITY_THRESHOLD = 0.3  # same default as Postgres' pg_trgm
+
+
+def normalize_tag_name(name):
+    """Display form: surrounding and repeated whitespace removed."""
+    return ' '.join(str(name).split())
+
+
+def tag_key(name):
+    """Lookup form: normalized and case-folded."""
+    return normalize_tag_name(name).casefold()
+
+
+def trigrams(name):
+    """pg_trgm style trigrams: each word padded with two leading spaces and one trailing."""
+    grams = set()
+    for word in tag_key(name).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# ---------- Lookup and creation ----------
+
+def canonical_tag_ids(names, create=True):
+    """
+    Map each of ``names`` to the id of its canonical tag, creating tags (and
+    their alias) for spellings not seen before unless ``create`` is False.
+    Names that are blank, or unknown with ``create=False``, are left out.
+    """
+    keys = {name: tag_key(name) for name in names}
+    keys = {name: key for name, key in keys.items() if key}
+    if not keys:
+        return {}
+    found = dict(TagAlias.objects.filter(alias__in=set(keys.values())).values_list('alias', 'tag_id'))
+
+    missing = {}
+    for name, key in keys.items():
+        if key not in found:
+            # The first spelling given becomes the new tag's name
+            missing.setdefault(key, normalize_tag_name(name))
+    if missing and create:
+        found.update(_create_tags(missing))
+    return {name: found[key] for name, key in keys.items() if key in found}
+
+
+def _create_tags(missing):
+    """``{key: display name}`` -> ``{key: tag_id}``; safe against concurrent creators."""
+    Tag.objects.bulk_create([Tag(name=name) for name in missing.values()], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.filter(name__in=missing.values()).values_list('name', 'id'))
+    TagAlias.objects.bulk_create(
+        [TagAlias(alias=key, tag_id=tag_ids[name]) for key, name in missing.items()],
+        ignore_conflicts=True,
+    )
+    # Another writer may have claimed an alias first; its mapping wins
+    created = dict(TagAlias.objects.filter(alias__in=missing).values_list('alias', 'tag_id'))
+    index_trigrams(Tag.objects.filter(id__in=set(created.values())).exclude(trigrams__isnull=False))
+    return created
+
+
+def index_trigrams(tags):
+    """(Re)build the trigram rows of ``tags``."""
+    tags = list(tags)
+    TagTrigram.objects.filter(tag__in=tags).delete()
+    TagTrigram.objects.bulk_create(
+        TagTrigram(trigram=gram, tag_id=tag.id) for tag in tags for gram in trigrams(tag.name)
+    )
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, **kwargs):
+    # Tags created or renamed outside canonical_tag_ids(), e.g. in the admin
+    TagAlias.objects.bulk_create([TagAlias(alias=tag_key(instance.name), tag=instance)], ignore_conflicts=True)
+    index_trigrams([instance])
+
+
+def similar_tags(name, limit=5, threshold=SIMILARITY_THRESHOLD, exclude=()):
+    """
+    Tags whose names look like ``name``, best first, as ``(tag, similarity)``.
+    The trigram index narrows the candidates to tags sharing the most
+    trigrams; the similarity itself is computed here.
+    """
+    grams = trigrams(name)
+    if not grams:
+        return []
+    candidates = TagTrigram.objects.filter(trigram__in=grams).exclude(tag_id__in=exclude) \
+        .values('tag_id').annotate(shared=Count('id')).order_by('-shared')[:limit * 10]
+    tags = Tag.objects.in_bulk([row['tag_id'] for row in candidates])
+
+    scored = []
+    for row in candidates:
+        tag = tags.get(row['tag_id'])
+        if tag is not None:
+            score = row['shared'] / (len(grams) + len(trigrams(tag.name)) - row['shared'])
+            if score >= threshold:
+                scored.append((tag, score))
+    scored.sort(key=lambda pair: (-pair[1], pair[0].name))
+    return scored[:limit]
+
+
+# ---------- Merging ----------
+
+def _repoint_links(through, owner_field, source_ids, target_id):
+    """
+    Move every link to a source tag onto the target in three statements.
+    Returns ``(owner ids touched, links dropped as duplicates)``.
+    """
+    rows = through.objects.filter(tag_id__in=source_ids)
+    owners = set(rows.values_list(owner_field, flat=True))
+
+    # Owners already linked to the target, or linked to several sources,
+    # keep a single row
+    has_target = through.objects.filter(tag_id=target_id).values(owner_field)
+    dropped, _ = rows.filter(**{f'{owner_field}__in': has_target}).delete()
+    first_rows = rows.values(owner_field).annotate(first=Min('id')).values('first')
+    more, _ = rows.exclude(id__in=first_rows).delete()
+    rows.update(tag_id=target_id)
+    return owners, dropped + more
+
+
+def _merge_tag_stats(source_ids, target_id):
+    days = TagStats.objects.filter(tag_id__in=source_ids).values('day') \
+        .annotate(day_demand=Sum('demand'), day_supply=Sum('supply')).order_by()
+    TagStats.objects.bulk_create([TagStats(tag_id=target_id, day=row['day']) for row in days], ignore_conflicts=True)
+    for row in days:
+        TagStats.objects.filter(tag_id=target_id, day=row['day']).update(
+            demand=F('demand') + row['day_demand'], supply=F('supply') + row['day_supply'],
+        )
+    TagStats.objects.filter(tag_id__in=source_ids).delete()
+
+
+@write_transaction
+def merge_tags(sources, target):
+    """
+    Fold ``sources`` into ``target``: profile and project links are repointed
+    in bulk, usage stats and aliases move over, and the source tags are
+    deleted. Returns the number of profiles and projects whose skills changed.
+    """
+    source_ids = {tag.id for tag in sources} - {target.id}
+    if not source_ids:
+        return 0
+
+    profiles, dropped_supply = _repoint_links(PROFILE_SKILLS, 'profile_id', source_ids, target.id)
+    projects, dropped_demand = _repoint_links(PROJECT_SKILLS, 'project_id', source_ids, target.id)
+
+    # Bulk updates skip m2m_changed, so keep the dependants in step here;
+    # deleting the source tags invalidates the discovery facets
+    _merge_tag_stats(source_ids, target.id)
+    record_tag_usage(demand={target.id: -dropped_demand}, supply={target.id: -dropped_supply})
+    bump_profile_versions(pk__in=profiles)
+
+    TagAlias.objects.filter(tag_id__in=source_ids).update(tag_id=target.id)
+    Tag.objects.filter(id__in=source_ids).delete()
+    return len(profiles) + len(projects)
@@ -0,0 +1,64 @@
+import base64
+from datetime import datetime, timedelta
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from home.models import Post, PostTombstone
+
+# Writes that started before a sync can commit after it. Each token points
+# this far back so those rows are sent again next time instead of missed;
+# clients upsert by id, so repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones are kept this long; older tokens need a full refetch.
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class SyncTokenExpired(Exception):
+    pass
+
+
+def encode_sync_token(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode()
+
+
+def decode_sync_token(token):
+    """Return the token's timestamp, or ``None`` if it is malformed."""
+    try:
+        return datetime.fromisoformat(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def new_sync_token():
+    return encode_sync_token(timezone.now() - SYNC_OVERLAP)
+
+
+def post_changes(since):
+    """
+    Posts created or edited and ids of posts deleted since ``since``, plus the
+    token for the next sync. Raises ``SyncTokenExpired`` when the tombstones
+    needed to answer have been pruned.
+    """
+    if since < timezone.now() - TOMBSTONE_RETENTION:
+        raise SyncTokenExpired
+
+    next_token = new_sync_token()
+    changed = Post.objects.filter(updated_at__gte=since)
+    deleted = list(PostTombstone.objects.filter(deleted_at__gte=since).values_list('post_id', flat=True))
+    return changed, deleted, next_token
+
+
+def record_post_deletions(post_ids):
+    PostTombstone.objects.bulk_create([PostTombstone(post_id=post_id) for post_id in post_ids])
+
+
+def prune_tombstones():
+    return PostTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()[0]
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    record_post_deletions([instance.pk])
@@ -0,0 +1,47 @@
+from home.db import write_transaction
+from home.deletion import purge_account
+from home.exports import build_export, notify_export_ready
+from home.models import Connection, DataExport, MatchRequest
+from home.queue import task
+
+
+@task(name="accept_match_request")
+@write_transaction
+def accept_match_request(match_request_id):
+    """Connect both sides of an accepted match and add the freelancer as collaborator."""
+    match_request = MatchRequest.objects.select_related('project__profile').filter(
+        id=match_request_id, status=MatchRequest.StatusChoices.ACCEPTED
+    ).first()
+    if match_request is None:
+        return
+
+    freelancer_id = match_request.freelancer_id
+    organization_id = match_request.project.profile.user_id
+
+    # Create mutual connection if not already present
+    Connection.objects.get_or_create(user_id=freelancer_id, connected_to_id=organization_id)
+    Connection.objects.get_or_create(user_id=organization_id, connected_to_id=freelancer_id)
+
+    # add() skips collaborators that are already on the project
+    match_request.project.collaborators.add(freelancer_id)
+
+
+@task(name="delete_user")
+def delete_user(user_id):
+    """Purge a user that was disabled when their account deletion was requested."""
+    purge_account(user_id)
+
+
+@task(name="export_user_data")
+def export_user_data(export_id):
+    """Write a user's data export to disk and tell them where to get it."""
+    export = DataExport.objects.select_related('user').filter(id=export_id).first()
+    if export is None or export.status == DataExport.StatusChoices.DONE:
+        return
+
+    try:
+        build_export(export)
+    except Exception:
+        DataExport.objects.filter(id=export.id).update(status=DataExport.StatusChoices.FAILED)
+        raise
+    notify_export_ready(export)
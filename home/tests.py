@@ -1,3 +1,1315 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from home.deletion import purge_account, request_account_deletion
+from home.models import (
+    Connection, CustomUser, DataExport, Experience, Post, Profile, Project, Task, TextMatch, TextTerm, TextVector,
+)
+from home.serializers import PostSerializer, ProfileSerializer
+from home.textmatch import refresh_text_matches
+
+
+# Throttle buckets in memory, so repeated runs never share them
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="freelancer@example.com", password="pass")
+        Post.objects.create(user=self.user, title="First", content="Hello")
+        self.client.force_login(self.user)
+
+    def test_post_list_not_modified_skips_serializer(self):
+        response = self.client.get("/api/posts/")
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with mock.patch.object(PostSerializer, "to_representation") as to_representation:
+            # session, user and the validator aggregate
+            with self.assertNumQueries(3):
+                response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        to_representation.assert_not_called()
+
+    def test_post_list_etag_changes_on_edit_and_delete(self):
+        etag = self.client.get("/api/posts/")["ETag"]
+
+        post = Post.objects.create(user=self.user, content="Second")
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        post.delete()
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_not_modified_until_experience_added(self):
+        response = self.client.get("/api/profile/")
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with mock.patch.object(ProfileSerializer, "to_representation") as to_representation:
+            response = self.client.get("/api/profile/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        to_representation.assert_not_called()
+
+        Experience.objects.create(profile=self.user.profile, organization="Acme", role="Dev", years=1)
+        response = self.client.get("/api/profile/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["experiences"][0]["organization"], "Acme")
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get("/api/posts/")["ETag"]
+        other = CustomUser.objects.create_user(email="other@example.com", password="pass")
+        self.client.force_login(other)
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class StartupImportTests(SimpleTestCase):
+    # Loading the URLconf must not import view code; each views submodule is
+    # imported on the first request routed to it. How long the import takes
+    # is measured by bench_startup, not here.
+    VIEW_MODULES = (
+        "home.views.pages", "home.views.matching", "home.views.api", "home.views.admin",
+        "home.serializers", "home.forms", "rest_framework.views", "rest_framework.generics",
+    )
+    # Run in a fresh interpreter: this one has imported everything already.
+    # Prints which of the modules are loaded after the URLconf, after
+    # resolving an API URL and after dispatching a request to it.
+    DISPATCH_CODE = """
+import json, sys
+import django
+django.setup()
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import resolve
+__import__(settings.ROOT_URLCONF)
+modules = %r
+loaded = lambda: sorted(m for m in modules if m in sys.modules)
+stages = {"urlconf": loaded()}
+match = resolve("/api/match-requests/")
+stages["resolved"] = loaded()
+request = RequestFactory().get("/api/match-requests/")
+request.user = AnonymousUser()
+stages["status"] = match.func(request).status_code
+stages["dispatched"] = loaded()
+print(json.dumps(stages))
+"""
+
+    @classmethod
+    def setUpClass(cls):
+        import json
+        import os
+        import subprocess
+        import sys
+
+        from django.conf import settings
+
+        super().setUpClass()
+        result = subprocess.run(
+            [sys.executable, "-c", cls.DISPATCH_CODE % (cls.VIEW_MODULES,)],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, check=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "SkillNexus.settings")},
+        )
+        cls.stages = json.loads(result.stdout)
+
+    def test_urlconf_does_not_import_view_code(self):
+        self.assertEqual(self.stages["urlconf"], [])
+
+    def test_resolving_does_not_import_view_code(self):
+        self.assertEqual(self.stages["resolved"], [])
+
+    def test_dispatch_imports_only_its_submodule(self):
+        self.assertEqual(self.stages["status"], 403)
+        self.assertIn("home.views.api", self.stages["dispatched"])
+        self.assertIn("rest_framework.views", self.stages["dispatched"])
+        for module in ("home.views.pages", "home.views.matching", "home.views.admin", "home.forms"):
+            self.assertNotIn(module, self.stages["dispatched"])
+
+    def test_views_resolve_from_package(self):
+        from home.views import PostListView
+        from home.views.api import PostListView as api_view
+        self.assertIs(PostListView, api_view)
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class LazyViewDispatchTests(TestCase):
+    def test_api_views_stay_csrf_exempt(self):
+        # CsrfViewMiddleware sees the lazy wrapper, not DRF's csrf_exempt view
+        client = Client(enforce_csrf_checks=True)
+        response = client.post("/api/login/", {"email": "nobody@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_pages_still_require_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post("/login/", {"email": "nobody@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class ThrottleTests(TestCase):
+    def test_login_attempts_are_throttled_per_address(self):
+        for _ in range(10):
+            response = self.client.post("/api/login/", {"email": "nobody@example.com", "password": "x"})
+            self.assertEqual(response.status_code, 401)
+        response = self.client.post("/api/login/", {"email": "nobody@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+        # Another address has a bucket of its own
+        response = self.client.post(
+            "/api/login/", {"email": "nobody@example.com", "password": "x"}, REMOTE_ADDR="10.0.0.2",
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class CompressionTests(TestCase):
+    def test_pages_are_gzipped_when_accepted(self):
+        import gzip
+
+        plain = self.client.get("/")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip;q=1, br;q=0")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_compressed_length_is_padded_at_random(self):
+        # BREACH mitigation: the same page compresses to different lengths
+        # (ten equal lengths in a row would have a 1e-18 chance)
+        import gzip
+
+        from home.compression import brotli, compress
+
+        body = b"<html><input name='csrfmiddlewaretoken' value='secret'>" + b"<p>Hello</p>" * 200
+        encodings = ["gzip"] + (["br"] if brotli is not None else [])
+        for encoding in encodings:
+            compressed = [compress(body, encoding, 6) for _ in range(10)]
+            self.assertGreater(len({len(data) for data in compressed}), 1, encoding)
+            decompress = gzip.decompress if encoding == "gzip" else brotli.decompress
+            self.assertEqual(decompress(compressed[0]), body)
+
+
+class PurgeTextMatchTests(TestCase):
+    def setUp(self):
+        self.freelancer = CustomUser.objects.create_user(
+            email="dev@example.com", password="pass", user_type="freelancer",
+        )
+        Profile.objects.filter(user=self.freelancer).update(bio="Django developer building REST APIs")
+        self.organization = CustomUser.objects.create_user(
+            email="org@example.com", password="pass", user_type="organization",
+        )
+        self.project = Project.objects.create(
+            profile=self.organization.profile, project_description="REST APIs in Django", terms_of_contract="Hourly",
+        )
+        refresh_text_matches(full=True)
+        self.assertTrue(TextMatch.objects.filter(project=self.project).exists())
+
+    def purge(self, user):
+        request_account_deletion(user)
+        purge_account(user.id)
+        self.assertFalse(CustomUser.objects.filter(id=user.id).exists())
+
+    def test_purging_an_organization_removes_its_matches_and_texts(self):
+        self.purge(self.organization)
+        self.assertFalse(TextMatch.objects.exists())
+        self.assertFalse(TextVector.objects.filter(kind=TextVector.KindChoices.PROJECT).exists())
+        # Only the freelancer's bio still counts towards the vocabulary
+        self.assertEqual(TextTerm.objects.get(term="rest").documents, 1)
+
+    def test_purging_a_freelancer_removes_their_matches_and_texts(self):
+        profile_id = self.freelancer.profile.id
+        self.purge(self.freelancer)
+        self.assertFalse(TextMatch.objects.exists())
+        self.assertFalse(TextVector.objects.filter(kind=TextVector.KindChoices.PROFILE, object_id=profile_id).exists())
+        self.assertEqual(TextTerm.objects.get(term="developer").documents, 0)
+        self.assertEqual(TextTerm.objects.get(term="rest").documents, 1)
+
+
+class DataExportTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        self.exports_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.exports_root)
+        self.enterContext(override_settings(EXPORTS_ROOT=self.exports_root, SITE_URL="https://skillnexus.example"))
+        self.user = CustomUser.objects.create_user(email="export@example.com", password="pass")
+        self.client.force_login(self.user)
+
+    def run_export(self):
+        from home.tasks import export_user_data
+
+        export = DataExport.objects.get(user=self.user, status=DataExport.StatusChoices.PENDING)
+        export_user_data(export_id=export.id)
+        export.refresh_from_db()
+        return export
+
+    def test_a_pending_export_is_reused(self):
+        self.client.post("/portfolio/export/")
+        self.client.post("/portfolio/export/")
+        self.assertEqual(DataExport.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(Task.objects.filter(name="export_user_data").count(), 1)
+
+    def test_email_links_to_the_site_and_old_exports_are_replaced(self):
+        import os
+
+        from django.core import mail
+
+        self.client.post("/portfolio/export/")
+        first = self.run_export()
+        self.client.post("/portfolio/export/")
+        second = self.run_export()
+
+        self.assertIn(f"https://skillnexus.example/portfolio/export/{second.id}/", mail.outbox[-1].body)
+        self.assertFalse(DataExport.objects.filter(id=first.id).exists())
+        self.assertEqual(os.listdir(self.exports_root), [second.file_path])
+
+    def test_expired_exports_are_pruned_with_their_files(self):
+        import os
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from home.exports import EXPORT_RETENTION, prune_exports
+
+        self.client.post("/portfolio/export/")
+        export = self.run_export()
+        DataExport.objects.filter(id=export.id).update(finished_at=timezone.now() - EXPORT_RETENTION - timedelta(hours=1))
+
+        self.assertEqual(self.client.get(f"/portfolio/export/{export.id}/").status_code, 404)
+        self.assertEqual(prune_exports(), 1)
+        self.assertEqual(os.listdir(self.exports_root), [])
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class PostListStreamTests(TestCase):
+    def test_streamed_list_matches_the_serializer(self):
+        import json
+
+        author = CustomUser.objects.create_user(email="author@example.com", first_name="Ada", last_name="Lovelace")
+        viewer = CustomUser.objects.create_user(email="viewer@example.com")
+        Post.objects.create(user=author, title="First", content="Hello")
+        Post.objects.create(user=viewer, title="Second", content="World")
+        self.client.force_login(viewer)
+
+        serialized = self.client.get("/api/posts/")
+        self.assertFalse(serialized.streaming)
+        streamed = self.client.get("/api/posts/?stream=1")
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(json.loads(b"".join(streamed.streaming_content)), serialized.json())
+
+
+class ConnectionProfileTests(TestCase):
+    def setUp(self):
+        self.viewer = CustomUser.objects.create_user(email="viewer@example.com", user_type="freelancer")
+        self.target = CustomUser.objects.create_user(email="target@example.com", user_type="freelancer")
+        self.client.force_login(self.viewer)
+
+    def test_strangers_are_redirected_before_the_profile_is_read(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/network/{self.target.id}/")
+        self.assertRedirects(response, "/network/", fetch_redirect_response=False)
+        tables = " ".join(query["sql"] for query in queries)
+        for table in ("home_post", "home_experience", "home_project", "home_profile_skills"):
+            self.assertNotIn(table, tables)
+
+    def test_connections_see_the_profile(self):
+        Connection.objects.create(user=self.viewer, connected_to=self.target)
+        Post.objects.create(user=self.target, title="Hello", content="World")
+        response = self.client.get(f"/network/{self.target.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Hello")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                                       "LOCATION": "single-flight-tests"}})
+class SingleFlightCacheTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        self.cache = cache
+        cache.clear()
+        self.calls = 0
+
+    def compute(self, value=None, delay=0):
+        import time
+
+        def run():
+            self.calls += 1
+            time.sleep(delay)
+            return self.calls if value is None else value
+        return run
+
+    def test_cold_key_is_computed_once(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from home.caching import get_or_compute
+
+        compute = self.compute(delay=0.2)
+        with ThreadPoolExecutor(10) as pool:
+            values = list(pool.map(lambda _: get_or_compute("cold", compute, 60), range(10)))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(values, [1] * 10)
+
+    def test_stale_value_is_served_while_another_worker_holds_the_lock(self):
+        from home.caching import get_or_compute
+
+        get_or_compute("stale", self.compute("old"), 60, version=1)
+        self.cache.add("stale:lock", "other worker", 30)
+        self.assertEqual(get_or_compute("stale", self.compute("new"), 60, version=2), "old")
+        self.assertEqual(self.calls, 1)
+
+    def test_version_change_recomputes(self):
+        from home.caching import get_or_compute
+
+        get_or_compute("versioned", self.compute("v1"), 60, version=1)
+        self.assertEqual(get_or_compute("versioned", self.compute("v1 again"), 60, version=1), "v1")
+        self.assertEqual(get_or_compute("versioned", self.compute("v2"), 60, version=2, background=False), "v2")
+        self.assertEqual(self.calls, 2)
+
+    def test_background_refresh_serves_stale_then_stores_new_value(self):
+        import time
+
+        from home.caching import get_or_compute
+
+        get_or_compute("background", self.compute("old"), 60, version=1)
+        self.assertEqual(get_or_compute("background", self.compute("new"), 60, version=2), "old")
+        deadline = time.monotonic() + 5
+        while self.cache.get("background")["value"] != "new" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(get_or_compute("background", self.compute("newer"), 60, version=2), "new")
+        self.assertFalse(self.cache.has_key("background:lock"))
+
+    def test_failed_compute_releases_the_lock(self):
+        from home.caching import get_or_compute
+
+        def fail():
+            raise RuntimeError("database unavailable")
+
+        with self.assertRaises(RuntimeError):
+            get_or_compute("failing", fail, 60)
+        self.assertFalse(self.cache.has_key("failing:lock"))
+        self.assertEqual(get_or_compute("failing", self.compute("ok"), 60), "ok")
+
+    def test_early_refresh_grows_near_expiry(self):
+        import time
+
+        from home.caching import _should_refresh
+
+        # Draws near 1 - U = e^-1 give an early margin of delta * beta
+        entry = {"version": None, "delta": 2.0, "expires_at": time.time() + 1}
+        with mock.patch("home.caching.random.random", return_value=1 - 0.3679):
+            self.assertTrue(_should_refresh(entry, None, beta=1.0))
+            self.assertFalse(_should_refresh(entry, None, beta=0))
+            self.assertFalse(_should_refresh({**entry, "expires_at": time.time() + 60}, None, beta=1.0))
+
+
+class MatchInboxLiveUpdateTests(TestCase):
+    def test_new_requests_are_announced_without_a_reload(self):
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        self.client.force_login(organization)
+        response = self.client.get("/organization_matches/")
+        self.assertContains(response, 'id="new-requests"')
+        self.assertNotContains(response, "location.reload")
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class ProjectFacetTests(TestCase):
+    def setUp(self):
+        from home.skills import canonical_tag_ids
+
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        python = canonical_tag_ids(["Python"])["Python"]
+        for status, count in (("ongoing", 2), ("completed", 1)):
+            for _ in range(count):
+                project = Project.objects.create(
+                    profile=organization.profile, project_description="Work", terms_of_contract="Hourly", status=status,
+                )
+                project.required_skills.add(python)
+        Project.objects.create(profile=organization.profile, project_description="Other", terms_of_contract="Hourly")
+        self.client.force_login(organization)
+
+    def test_status_counts_ignore_the_selected_status(self):
+        facets = self.client.get("/api/projects/?skills=python&status=completed").json()["facets"]
+        self.assertEqual(facets["status"], {"ongoing": 2, "completed": 1})
+        self.assertEqual(facets["skills"], [{"id": facets["skills"][0]["id"], "name": "Python", "count": 1}])
+
+
+class AdminDashboardStatsTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.admin = CustomUser.objects.create_superuser(email="admin@example.com", password="pass")
+        CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+
+    def test_counts_are_cached_until_a_counted_row_changes(self):
+        from home.dashboard import dashboard_stats
+
+        self.assertEqual(dashboard_stats()["users"], 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(dashboard_stats()["organizations"], 1)
+
+        post = Post.objects.create(user=self.admin, title="Hello", content="Hi")
+        self.assertEqual(dashboard_stats()["posts"], 1)
+        post.delete()
+        self.assertEqual(dashboard_stats()["posts"], 0)
+
+    def test_dashboard_shows_the_counts(self):
+        self.client.force_login(self.admin)
+        response = self.client.get("/admin-dashboard/")
+        self.assertEqual(
+            {card["title"]: card["value"] for card in response.context["stats"]},
+            {"Total Users": 2, "Freelancers": 1, "Organizations": 1, "Projects": 0, "Posts": 0, "Matches": 0},
+        )
+
+
+# Not a TestCase: write_transaction only retries outside an atomic block
+class WriteTransactionTests(SimpleTestCase):
+    databases = {"default"}
+
+    def _flaky(self, errors):
+        from django.db import OperationalError
+
+        calls = []
+
+        def write():
+            calls.append(1)
+            if len(calls) <= len(errors):
+                raise OperationalError(errors[len(calls) - 1])
+            return "written"
+
+        return write, calls
+
+    @mock.patch("home.db.time.sleep")
+    def test_lock_errors_are_retried(self, sleep):
+        from home.db import write_transaction
+
+        write, calls = self._flaky(["database is locked", "database is locked"])
+        self.assertEqual(write_transaction(write)(), "written")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("home.db.time.sleep")
+    def test_other_errors_are_not_retried(self, sleep):
+        from django.db import OperationalError
+        from home.db import write_transaction
+
+        write, calls = self._flaky(["no such table: home_post"])
+        with self.assertRaises(OperationalError):
+            write_transaction(write)()
+        self.assertEqual(len(calls), 1)
+        sleep.assert_not_called()
+
+    @mock.patch("home.db.time.sleep")
+    def test_gives_up_after_the_last_attempt(self, sleep):
+        from django.db import OperationalError
+        from home.db import write_transaction
+
+        write, calls = self._flaky(["database is locked"] * 3)
+        with self.assertRaises(OperationalError):
+            write_transaction(write, attempts=3)()
+        self.assertEqual(len(calls), 3)
+
+    @mock.patch("home.db.time.sleep")
+    def test_runs_once_inside_an_outer_transaction(self, sleep):
+        from django.db import OperationalError, transaction
+        from home.db import write_transaction
+
+        write, calls = self._flaky(["database is locked"])
+        with self.assertRaises(OperationalError), transaction.atomic():
+            write_transaction(write)()
+        self.assertEqual(len(calls), 1)
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        from home.models import MatchRequest
+
+        self.organization = CustomUser.objects.create_user(
+            email="org@example.com", password="pass", user_type="organization",
+        )
+        self.project = Project.objects.create(
+            profile=self.organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        self.freelancers = [
+            CustomUser.objects.create_user(email=f"dev{i}@example.com", password="pass", user_type="freelancer")
+            for i in range(2)
+        ]
+        self.requests = [
+            MatchRequest.objects.create(freelancer=freelancer, project=self.project) for freelancer in self.freelancers
+        ]
+
+    def counts(self, user):
+        return Profile.objects.values_list('connections_count', 'pending_requests_count').get(user=user)
+
+    def assertNoDrift(self):
+        from home.counters import reconcile_counters
+
+        self.assertEqual(reconcile_counters(), {"Profile": 0, "Project": 0})
+
+    def bulk_accept(self):
+        self.client.force_login(self.organization)
+        self.client.post(
+            "/organization/match-requests/bulk/",
+            {"action": "accept", "ids": [str(request.id) for request in self.requests]},
+        )
+        self.project.refresh_from_db()
+
+    def test_created_requests_are_counted(self):
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.pending_requests_count, 2)
+        self.assertEqual(self.counts(self.organization), (0, 2))
+        self.assertEqual(self.counts(self.freelancers[0]), (0, 1))
+        self.assertNoDrift()
+
+    def test_bulk_accept(self):
+        self.bulk_accept()
+        self.assertEqual(self.project.pending_requests_count, 0)
+        self.assertEqual(self.project.collaborators_count, 2)
+        self.assertEqual(self.counts(self.organization), (2, 0))
+        self.assertEqual(self.counts(self.freelancers[0]), (1, 0))
+        self.assertNoDrift()
+
+    def test_bulk_accept_skips_other_organizations_requests(self):
+        from home.models import MatchRequest
+
+        other = CustomUser.objects.create_user(email="other@example.com", password="pass", user_type="organization")
+        other_project = Project.objects.create(
+            profile=other.profile, project_description="Other", terms_of_contract="Hourly",
+        )
+        foreign = MatchRequest.objects.create(freelancer=self.freelancers[0], project=other_project)
+        self.requests.append(foreign)
+
+        self.bulk_accept()
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, MatchRequest.StatusChoices.PENDING)
+        self.assertFalse(other_project.collaborators.exists())
+        self.assertEqual(self.counts(other), (0, 1))
+        self.assertNoDrift()
+
+    def test_deleting_a_collaborator(self):
+        self.bulk_accept()
+        self.freelancers[0].delete()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.collaborators_count, 1)
+        self.assertEqual(self.counts(self.organization), (1, 0))
+        self.assertNoDrift()
+
+    def test_purging_a_collaborator(self):
+        self.bulk_accept()
+        request_account_deletion(self.freelancers[0])
+        purge_account(self.freelancers[0].id)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.collaborators_count, 1)
+        self.assertEqual(self.counts(self.organization), (1, 0))
+        self.assertNoDrift()
+
+
+class RequestLoaderTests(TestCase):
+    def setUp(self):
+        from home.models import MatchRequest
+
+        self.organization = CustomUser.objects.create_user(
+            email="org@example.com", password="pass", user_type="organization",
+        )
+        project = Project.objects.create(
+            profile=self.organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        for i in range(3):
+            freelancer = CustomUser.objects.create_user(
+                email=f"dev{i}@example.com", password="pass", user_type="freelancer",
+            )
+            MatchRequest.objects.create(freelancer=freelancer, project=project)
+
+    def test_attach_loads_each_model_once_per_hop(self):
+        from django.test import RequestFactory
+        from home.loaders import loaders_for
+        from home.models import MatchRequest
+
+        request = RequestFactory().get("/")
+        request.user = self.organization
+        loaders = loaders_for(request)
+        matches = list(MatchRequest.objects.all())
+
+        # Freelancers and projects, then profiles; the organization is request.user
+        with self.assertNumQueries(3), loaders.batch():
+            loaders.attach(matches, "freelancer")
+            loaders.attach(matches, "project__profile__user")
+        with self.assertNumQueries(0):
+            self.assertEqual(sorted(m.freelancer.email for m in matches), [f"dev{i}@example.com" for i in range(3)])
+            for match in matches:
+                self.assertIs(match.project, matches[0].project)
+                self.assertIs(match.project.profile.user, self.organization)
+
+        # Rows already in the identity map are not fetched again
+        with self.assertNumQueries(0):
+            self.assertIs(loaders.users.get(matches[0].freelancer_id), matches[0].freelancer)
+            self.assertIs(loaders.profiles_by_user.get(self.organization.id), matches[0].project.profile)
+
+
+class TaskQueueTests(TestCase):
+    def test_enqueue_is_idempotent_per_key(self):
+        from home.queue import enqueue_task
+
+        first = enqueue_task("noop", {"n": 1}, idempotency_key="noop:1")
+        second = enqueue_task("noop", {"n": 2}, idempotency_key="noop:1")
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(Task.objects.get().payload, {"n": 1})
+
+    def test_a_task_is_claimed_once_and_only_when_due(self):
+        from datetime import timedelta
+
+        from home.queue import claim_tasks, enqueue_task
+
+        due = enqueue_task("noop")
+        enqueue_task("noop", delay=timedelta(hours=1))
+        self.assertEqual([t.id for t in claim_tasks("worker-1")], [due.id])
+        self.assertEqual(claim_tasks("worker-2"), [])
+
+        due.refresh_from_db()
+        self.assertEqual((due.status, due.locked_by, due.attempts), (Task.StatusChoices.RUNNING, "worker-1", 1))
+
+    def test_failed_tasks_are_retried_with_backoff_then_given_up(self):
+        from django.utils import timezone
+        from home.queue import claim_tasks, enqueue_task, registry, run_task
+
+        def fail(**payload):
+            raise ValueError("boom")
+
+        enqueue_task("fail", max_attempts=2)
+        with mock.patch.dict(registry, {"fail": fail}), self.assertLogs("home.queue", "ERROR"):
+            self.assertFalse(run_task(claim_tasks("worker")[0]))
+            retried = Task.objects.get()
+            self.assertEqual(retried.status, Task.StatusChoices.PENDING)
+            self.assertGreater(retried.run_after, timezone.now())
+            self.assertIn("ValueError: boom", retried.last_error)
+
+            Task.objects.update(run_after=timezone.now())
+            self.assertFalse(run_task(claim_tasks("worker")[0]))
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.StatusChoices.FAILED, 2))
+
+    def test_stale_tasks_are_released(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from home.queue import claim_tasks, enqueue_task, release_stale_tasks
+
+        enqueue_task("noop")
+        claim_tasks("crashed-worker")
+        self.assertEqual(release_stale_tasks(), 0)
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale_tasks(), 1)
+        self.assertEqual(Task.objects.get().status, Task.StatusChoices.PENDING)
+
+    def test_accepting_a_match_request_is_safe_to_repeat(self):
+        from home.models import MatchRequest
+        from home.queue import run_task
+        from home.tasks import accept_match_request
+
+        organization = CustomUser.objects.create_user(
+            email="org@example.com", password="pass", user_type="organization",
+        )
+        freelancer = CustomUser.objects.create_user(email="dev@example.com", password="pass", user_type="freelancer")
+        project = Project.objects.create(
+            profile=organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        match_request = MatchRequest.objects.create(
+            freelancer=freelancer, project=project, status=MatchRequest.StatusChoices.ACCEPTED,
+        )
+
+        task = accept_match_request.enqueue(match_request_id=match_request.id)
+        self.assertTrue(run_task(task))
+        self.assertTrue(run_task(task))
+        self.assertEqual(Connection.objects.count(), 2)
+        self.assertEqual(list(project.collaborators.all()), [freelancer])
+        self.assertEqual(Task.objects.get().status, Task.StatusChoices.DONE)
+
+
+class BulkRespondTests(TestCase):
+    def setUp(self):
+        from home.models import MatchRequest
+
+        self.organization = CustomUser.objects.create_user(
+            email="org@example.com", password="pass", user_type="organization",
+        )
+        project = Project.objects.create(
+            profile=self.organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        self.freelancer = CustomUser.objects.create_user(
+            email="dev@example.com", password="pass", user_type="freelancer",
+        )
+        self.match_request = MatchRequest.objects.create(freelancer=self.freelancer, project=project)
+
+    def respond(self, user, action):
+        self.client.force_login(user)
+        self.client.post(
+            "/organization/match-requests/bulk/", {"action": action, "ids": [str(self.match_request.id), "x"]},
+        )
+        self.match_request.refresh_from_db()
+        return self.match_request.status
+
+    def test_reject_connects_no_one(self):
+        self.assertEqual(self.respond(self.organization, "reject"), "rejected")
+        self.assertFalse(Connection.objects.exists())
+
+    def test_accept_connects_both_sides(self):
+        self.assertEqual(self.respond(self.organization, "accept"), "accepted")
+        self.assertTrue(Connection.objects.filter(user=self.freelancer, connected_to=self.organization).exists())
+        self.assertTrue(Connection.objects.filter(user=self.organization, connected_to=self.freelancer).exists())
+
+    def test_only_pending_requests_of_the_organization_change(self):
+        self.assertEqual(self.respond(self.freelancer, "accept"), "pending")
+        other = CustomUser.objects.create_user(email="other@example.com", password="pass", user_type="organization")
+        self.assertEqual(self.respond(other, "accept"), "pending")
+
+        self.assertEqual(self.respond(self.organization, "reject"), "rejected")
+        self.assertEqual(self.respond(self.organization, "accept"), "rejected")
+
+
+class MatchInboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from django.utils import timezone
+        from home.models import MatchRequest
+
+        cls.organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        cls.project = Project.objects.create(
+            profile=cls.organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        for i in range(25):
+            freelancer = CustomUser.objects.create_user(email=f"dev{i}@example.com", user_type="freelancer")
+            MatchRequest.objects.create(
+                freelancer=freelancer, project=cls.project,
+                status=MatchRequest.StatusChoices.REJECTED if i < 5 else MatchRequest.StatusChoices.PENDING,
+            )
+        # Equal timestamps, so pages are told apart by the primary key alone
+        MatchRequest.objects.update(created_at=timezone.now())
+
+    def test_cursor_walks_every_request_once(self):
+        from home.inbox import match_inbox
+
+        seen, cursor = [], None
+        while True:
+            page = match_inbox(self.organization, {"cursor": cursor} if cursor else {})
+            seen += [m.id for m in page["match_requests"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(seen, sorted(set(seen), reverse=True))
+
+    def test_counts_cover_every_status(self):
+        from home.inbox import match_inbox
+
+        page = match_inbox(self.organization, {"project": str(self.project.id), "status": "rejected"})
+        self.assertEqual(len(page["match_requests"]), 5)
+        self.assertIsNone(page["next_cursor"])
+        self.assertEqual(page["counts"], {"total": 25, "pending": 20, "accepted": 0, "rejected": 5})
+
+    @override_settings(THROTTLE_SQLITE_PATH=":memory:")
+    def test_api_returns_the_first_page(self):
+        self.client.force_login(self.organization)
+        body = self.client.get("/api/match-requests/").json()
+        self.assertEqual(len(body["results"]), 20)
+        self.assertEqual(body["counts"]["total"], 25)
+        self.assertIsNotNone(body["next_cursor"])
+
+    def test_malformed_cursor_starts_over(self):
+        from home.inbox import match_inbox
+
+        first = match_inbox(self.organization, {})
+        self.assertEqual(match_inbox(self.organization, {"cursor": "not-a-cursor"})["match_requests"],
+                         first["match_requests"])
+
+
+class TagStatsTests(TestCase):
+    def setUp(self):
+        from home.models import Tag
+
+        self.python, self.django = Tag.objects.create(name="Python"), Tag.objects.create(name="Django")
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        self.project = Project.objects.create(
+            profile=organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        self.freelancer = CustomUser.objects.create_user(email="dev@example.com", user_type="freelancer")
+
+    def totals(self, tag):
+        from django.db.models import Sum
+        from home.models import TagStats
+
+        return TagStats.objects.filter(tag=tag).aggregate(demand=Sum("demand"), supply=Sum("supply"))
+
+    def test_adding_and_removing_skills(self):
+        self.project.required_skills.add(self.python, self.django)
+        self.freelancer.profile.skills.add(self.python)
+        self.project.required_skills.remove(self.django)
+        self.python.project_set.clear()
+        self.assertEqual(self.totals(self.python), {"demand": 0, "supply": 1})
+        self.assertEqual(self.totals(self.django), {"demand": 0, "supply": 0})
+
+    def test_deleting_a_project_removes_its_demand(self):
+        from home.analytics import reconcile_tag_stats
+
+        self.project.required_skills.add(self.python, self.django)
+        self.project.delete()
+        self.assertEqual(self.totals(self.python)["demand"], 0)
+        self.assertEqual(reconcile_tag_stats(), 0)
+
+    def test_reconcile_books_drift_in_todays_bucket(self):
+        from home.analytics import PROFILE_SKILLS, reconcile_tag_stats
+
+        # bulk_create skips m2m_changed
+        PROFILE_SKILLS.objects.bulk_create([PROFILE_SKILLS(profile=self.freelancer.profile, tag=self.django)])
+        self.assertEqual(reconcile_tag_stats(), 1)
+        self.assertEqual(self.totals(self.django)["supply"], 1)
+        self.assertEqual(reconcile_tag_stats(), 0)
+
+    def test_trending_skills(self):
+        from home.analytics import trending_skills
+
+        self.project.required_skills.add(self.python, self.django)
+        self.freelancer.profile.skills.add(self.python)
+        trending = trending_skills()
+        self.assertEqual([row["name"] for row in trending["demand"]], ["Django", "Python"])
+        self.assertEqual([row["name"] for row in trending["gap"]], ["Django"])
+
+
+class PurgeAccountTests(TestCase):
+    def setUp(self):
+        from home.models import MatchRequest, Tag
+
+        self.freelancer = CustomUser.objects.create_user(email="dev@example.com", user_type="freelancer")
+        self.organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        self.project = Project.objects.create(
+            profile=self.organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        self.python = Tag.objects.create(name="Python")
+        self.freelancer.profile.skills.add(self.python)
+        for i in range(5):
+            Post.objects.create(user=self.freelancer, title=f"Post {i}", content="Hello")
+            Experience.objects.create(profile=self.freelancer.profile, organization="ACME", role="Dev", years=1)
+        Connection.objects.create(user=self.freelancer, connected_to=self.organization)
+        Connection.objects.create(user=self.organization, connected_to=self.freelancer)
+        MatchRequest.objects.create(freelancer=self.freelancer, project=self.project)
+
+    def test_request_disables_the_account_and_queues_one_purge(self):
+        from home.models import AccountDeletion
+
+        request_account_deletion(self.freelancer)
+        request_account_deletion(self.freelancer)
+        self.assertFalse(CustomUser.objects.get(id=self.freelancer.id).is_active)
+        self.assertEqual(AccountDeletion.objects.get().status, AccountDeletion.StatusChoices.PENDING)
+        self.assertEqual(Task.objects.filter(name="delete_user").count(), 1)
+
+    def test_purge_in_small_batches(self):
+        from django.db.models import Sum
+        from home.models import AccountDeletion, MatchRequest, TagStats
+
+        request_account_deletion(self.freelancer)
+        purge_account(self.freelancer.id, batch_size=2)
+
+        self.assertFalse(CustomUser.objects.filter(id=self.freelancer.id).exists())
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Experience.objects.exists())
+        self.assertFalse(Connection.objects.exists())
+        self.assertFalse(MatchRequest.objects.exists())
+        deletion = AccountDeletion.objects.get()
+        self.assertEqual(deletion.status, AccountDeletion.StatusChoices.DONE)
+        self.assertGreaterEqual(deletion.rows_deleted, 14)
+
+        # The other side's counters and the skill stats follow the raw deletes
+        self.assertEqual(Profile.objects.get(user=self.organization).connections_count, 0)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.pending_requests_count, 0)
+        self.assertEqual(TagStats.objects.filter(tag=self.python).aggregate(n=Sum("supply"))["n"], 0)
+
+    def test_active_accounts_are_left_alone(self):
+        purge_account(self.freelancer.id)
+        self.assertTrue(CustomUser.objects.filter(id=self.freelancer.id).exists())
+        self.assertEqual(Post.objects.count(), 5)
+
+    def test_rerunning_a_finished_purge_does_nothing(self):
+        request_account_deletion(self.freelancer)
+        purge_account(self.freelancer.id)
+        purge_account(self.freelancer.id)
+        self.assertTrue(CustomUser.objects.filter(id=self.organization.id).exists())
+
+    def test_facets_drop_purged_projects_right_away(self):
+        from django.core.cache import cache
+        from home.discovery import parse_filters, project_facets
+
+        cache.clear()
+        self.project.required_skills.add(self.python)
+        filters = parse_filters({})
+        self.assertEqual(project_facets(filters)["skills"][0]["count"], 1)
+
+        request_account_deletion(self.organization)
+        purge_account(self.organization.id)
+        self.assertEqual(project_facets(filters), {"skills": [], "status": {}})
+
+
+class ImportDataTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, text):
+        import os
+
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        return path
+
+    def test_invalid_rows_abort_the_whole_import(self):
+        from django.core.management import CommandError, call_command
+
+        path = self.write("users.csv", "email,user_type\na@example.com,freelancer\nnot-an-email,freelancer\n"
+                                       "A@EXAMPLE.com,admin\n")
+        with self.assertRaisesMessage(CommandError, "2 of 3 rows are invalid"):
+            call_command("import_data", path, kind="users", stderr=mock.Mock(), stdout=mock.Mock())
+        self.assertFalse(CustomUser.objects.exists())
+
+    def test_users_then_experiences_and_projects(self):
+        from home.importer import import_file
+        from home.models import Tag
+
+        CustomUser.objects.create_user(email="taken@example.com", user_type="freelancer")
+        users = self.write(
+            "users.csv",
+            "email,first_name,user_type,bio,skills\n"
+            "dev@example.com,Dev,freelancer,Django developer,Python; python ;Django\n"
+            "org@example.com,Org,organization,,\n"
+            "taken@example.com,Taken,freelancer,,\n",
+        )
+        self.assertEqual(import_file(users, "users", batch_size=2, workers=1), 2)
+        dev = CustomUser.objects.get(email="dev@example.com")
+        self.assertEqual(dev.profile.bio, "Django developer")
+        self.assertEqual(sorted(dev.profile.skills.values_list("name", flat=True)), ["Django", "Python"])
+
+        experiences = self.write(
+            "experiences.jsonl",
+            '{"email": "dev@example.com", "organization": "ACME", "role": "Dev", "years": 2.5}\n'
+            '{"email": "nobody@example.com", "organization": "ACME", "role": "Dev", "years": 1}\n',
+        )
+        self.assertEqual(import_file(experiences, "experiences", workers=1), 1)
+
+        projects = self.write(
+            "projects.jsonl",
+            '{"organization_email": "org@example.com", "project_description": "API", '
+            '"terms_of_contract": "Hourly", "required_skills": ["PYTHON", "Rust"]}\n'
+            # Freelancers have no projects
+            '{"organization_email": "dev@example.com", "project_description": "API", "terms_of_contract": "Hourly"}\n',
+        )
+        self.assertEqual(import_file(projects, "projects", workers=1), 1)
+        project = Project.objects.get()
+        self.assertEqual(sorted(project.required_skills.values_list("name", flat=True)), ["Python", "Rust"])
+        self.assertEqual(Tag.objects.count(), 3)
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class PostDeltaSyncTests(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        self.user = CustomUser.objects.create_user(email="dev@example.com")
+        self.kept, self.edited, self.deleted = (
+            Post.objects.create(user=self.user, title=title, content="Hello") for title in ("kept", "edited", "deleted")
+        )
+        # Old enough to fall outside the token's overlap
+        Post.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+        self.client.force_login(self.user)
+
+    def test_changes_and_tombstones_since_the_token(self):
+        token = self.client.get("/api/posts/")["X-Sync-Token"]
+        self.edited.content = "Edited"
+        self.edited.save()
+        deleted_id = self.deleted.id
+        self.deleted.delete()
+        created = Post.objects.create(user=self.user, title="new", content="Hello")
+
+        body = self.client.get("/api/posts/", {"since": token}).json()
+        self.assertEqual(sorted(post["id"] for post in body["posts"]), [self.edited.id, created.id])
+        self.assertEqual(body["deleted"], [deleted_id])
+
+        # Nothing changed since the second token but the overlap's repeats
+        body = self.client.get("/api/posts/", {"since": body["sync_token"]}).json()
+        self.assertNotIn(self.kept.id, [post["id"] for post in body["posts"]])
+
+    def test_bad_and_expired_tokens(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from home.sync import TOMBSTONE_RETENTION, encode_sync_token
+
+        self.assertEqual(self.client.get("/api/posts/", {"since": "garbage"}).status_code, 400)
+        expired = encode_sync_token(timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1))
+        self.assertEqual(self.client.get("/api/posts/", {"since": expired}).status_code, 410)
+
+    def test_old_tombstones_are_pruned(self):
+        from django.utils import timezone
+        from home.models import PostTombstone
+        from home.sync import TOMBSTONE_RETENTION, prune_tombstones
+
+        self.deleted.delete()
+        self.assertEqual(prune_tombstones(), 0)
+        PostTombstone.objects.update(deleted_at=timezone.now() - TOMBSTONE_RETENTION * 2)
+        self.assertEqual(prune_tombstones(), 1)
+
+
+@override_settings(THROTTLE_SQLITE_PATH=":memory:")
+class EagerLoadingTests(TestCase):
+    def test_lookups_follow_the_serializer_fields(self):
+        from home.eager import eager_load_lookups
+        from home.serializers import MatchRequestSerializer, ProjectSerializer
+
+        self.assertEqual(eager_load_lookups(PostSerializer()), ({"user"}, set()))
+        self.assertEqual(eager_load_lookups(MatchRequestSerializer()), ({"freelancer", "project"}, set()))
+        self.assertEqual(eager_load_lookups(ProjectSerializer()), ({"profile"}, {"required_skills"}))
+        select, prefetch = eager_load_lookups(ProfileSerializer())
+        self.assertEqual(select, {"user"})
+        self.assertTrue({"skills", "experiences", "user__posts"} <= prefetch)
+
+    def queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_list_queries_do_not_grow_with_the_rows(self):
+        from home.models import Tag
+
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        python = Tag.objects.create(name="Python")
+        self.client.force_login(organization)
+
+        def add_rows(n):
+            for _ in range(n):
+                author = CustomUser.objects.create_user(email=f"dev{Post.objects.count()}@example.com")
+                Post.objects.create(user=author, title="Post", content="Hello")
+                project = Project.objects.create(
+                    profile=organization.profile, project_description="API", terms_of_contract="Hourly",
+                )
+                project.required_skills.add(python)
+
+        add_rows(2)
+        few = self.queries("/api/posts/"), self.queries("/api/projects/")
+        add_rows(5)
+        self.assertEqual((self.queries("/api/posts/"), self.queries("/api/projects/")), few)
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(email="admin@example.com", password="pass")
+        self.client.force_login(self.admin)
+
+    def test_estimated_count_only_for_large_unfiltered_tables(self):
+        from home.pagination import EstimatedCountPaginator
+
+        posts = [Post.objects.create(user=self.admin, title=f"Post {i}", content="Hello") for i in range(5)]
+        posts[0].delete()
+        self.assertEqual(EstimatedCountPaginator(Post.objects.all(), 2).count, 4)
+
+        with mock.patch.object(EstimatedCountPaginator, "exact_below", 1):
+            # MAX(rowid), which still counts the deleted row
+            self.assertEqual(EstimatedCountPaginator(Post.objects.all(), 2).count, posts[-1].id)
+            self.assertEqual(EstimatedCountPaginator(Post.objects.filter(title="Post 1"), 2).count, 1)
+
+    def test_changelist_queries_do_not_grow_with_the_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def queries(url):
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            return len(captured)
+
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        urls = ("/admin/home/post/", "/admin/home/project/", "/admin/home/matchrequest/")
+
+        def add_rows(n):
+            from home.models import MatchRequest
+
+            for _ in range(n):
+                freelancer = CustomUser.objects.create_user(email=f"dev{Post.objects.count()}@example.com")
+                Post.objects.create(user=freelancer, title="Post", content="Hello")
+                project = Project.objects.create(
+                    profile=organization.profile, project_description="API", terms_of_contract="Hourly",
+                )
+                MatchRequest.objects.create(freelancer=freelancer, project=project)
+
+        add_rows(2)
+        few = [queries(url) for url in urls]
+        add_rows(5)
+        self.assertEqual([queries(url) for url in urls], few)
+
+    def test_search_matches_email_prefixes(self):
+        CustomUser.objects.create_user(email="dev@example.com")
+        response = self.client.get("/admin/home/customuser/", {"q": "dev@"})
+        self.assertContains(response, "dev@example.com")
+        self.assertNotContains(response, "admin@example.com</a>")
+
+
+class SkillNameTests(TestCase):
+    def test_spellings_share_one_tag(self):
+        from home.models import Tag
+        from home.skills import canonical_tag_ids
+
+        ids = canonical_tag_ids(["python", "Python ", " PYTHON", "  "])
+        self.assertEqual(set(ids), {"python", "Python ", " PYTHON"})
+        self.assertEqual(len(set(ids.values())), 1)
+        self.assertEqual(Tag.objects.get().name, "python")
+        self.assertEqual(canonical_tag_ids(["Rust"], create=False), {})
+        self.assertEqual(canonical_tag_ids(["pyTHon"], create=False), {"pyTHon": ids["python"]})
+
+    def test_similar_tags_finds_typos(self):
+        from home.models import Tag
+        from home.skills import similar_tags
+
+        python = Tag.objects.create(name="Python")
+        Tag.objects.create(name="Rust")
+        self.assertEqual([tag for tag, _ in similar_tags("Pythn")], [python])
+
+    def test_merge_keeps_one_link_and_the_stats(self):
+        from home.analytics import reconcile_tag_stats
+        from home.models import Tag
+        from home.skills import canonical_tag_ids, merge_tags
+
+        python, typo = Tag.objects.create(name="Python"), Tag.objects.create(name="Pyhton")
+        freelancer = CustomUser.objects.create_user(email="dev@example.com", user_type="freelancer")
+        freelancer.profile.skills.add(python, typo)
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        project = Project.objects.create(
+            profile=organization.profile, project_description="API", terms_of_contract="Hourly",
+        )
+        project.required_skills.add(typo)
+
+        self.assertEqual(merge_tags([typo], python), 2)
+        self.assertEqual(list(freelancer.profile.skills.all()), [python])
+        self.assertEqual(list(project.required_skills.all()), [python])
+        self.assertFalse(Tag.objects.filter(id=typo.id).exists())
+        self.assertEqual(canonical_tag_ids(["pyhton"], create=False), {"pyhton": python.id})
+        self.assertEqual(reconcile_tag_stats(), 0)
+
+    def test_auto_merges_case_and_spacing_variants_into_the_most_used(self):
+        from django.core.management import call_command
+        from home.models import Tag
+
+        Tag.objects.create(name="machine learning")
+        used = Tag.objects.create(name="Machine  Learning")
+        freelancer = CustomUser.objects.create_user(email="dev@example.com", user_type="freelancer")
+        freelancer.profile.skills.add(used)
+        call_command("merge_tags", auto=True, stdout=mock.Mock())
+        self.assertEqual(list(Tag.objects.all()), [used])
+
+
+class SkillGraphTests(TestCase):
+    def setUp(self):
+        from home import cooccurrence
+        from home.models import Tag
+
+        # Builds replace the process-wide graph; put the old one back afterwards
+        for name in ("_loaded", "_checked_at"):
+            patcher = mock.patch.object(cooccurrence, name, getattr(cooccurrence, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.python, self.django, self.rust = (Tag.objects.create(name=name) for name in ("Python", "Django", "Rust"))
+        for i, skills in enumerate([(self.python, self.django)] * 2 + [(self.python, self.rust)]):
+            user = CustomUser.objects.create_user(email=f"dev{i}@example.com", user_type="freelancer")
+            user.profile.skills.add(*skills)
+
+    def test_pairs_seen_together_often_enough_are_related(self):
+        from home.cooccurrence import build_graph, related_skill_names
+
+        _, matrix = build_graph()
+        # Two shared documents out of three and two: 2 / sqrt(3 * 2)
+        [(tag_id, score)] = matrix.neighbours(self.python.id)
+        self.assertEqual(tag_id, self.django.id)
+        self.assertAlmostEqual(score, 2 / 6 ** 0.5, places=5)
+        # Python and Rust share a single document, under MIN_COUNT
+        self.assertEqual(matrix.neighbours(self.rust.id), [])
+        self.assertEqual(related_skill_names([self.django.id]), ["Python"])
+
+    def test_stored_graph_round_trips_and_is_reloaded(self):
+        from home import cooccurrence
+        from home.models import SkillGraph
+
+        _, matrix = cooccurrence.build_graph()
+        cooccurrence._use(None, cooccurrence.EMPTY)
+        cooccurrence._checked_at = None
+        loaded = cooccurrence.get_graph()
+        self.assertEqual(SkillGraph.objects.count(), 1)
+        self.assertEqual(loaded.neighbours(self.python.id), matrix.neighbours(self.python.id))
+
+    def test_sparse_and_python_builds_agree(self):
+        from home import cooccurrence
+
+        if cooccurrence.sparse is None:
+            self.skipTest("SciPy is not installed")
+        links = list(cooccurrence._links())
+        python = cooccurrence._build_python(links, cooccurrence.NEIGHBOURS, 1)
+        scipy = cooccurrence._build_sparse(links, cooccurrence.NEIGHBOURS, 1)
+        for tag in (self.python, self.django, self.rust):
+            self.assertEqual(
+                [(other, round(score, 5)) for other, score in python.neighbours(tag.id)],
+                [(other, round(score, 5)) for other, score in scipy.neighbours(tag.id)],
+            )
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                                       "LOCATION": "text-match-tests"}}, ASYNC_CONCURRENT_READS=False)
+class TextMatchRankingTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from home.models import Tag
+
+        cache.clear()
+        self.freelancer = CustomUser.objects.create_user(email="dev@example.com", user_type="freelancer")
+        Profile.objects.filter(user=self.freelancer).update(bio="Django developer building REST APIs")
+        python = Tag.objects.create(name="Python")
+        self.freelancer.profile.skills.add(python)
+        organization = CustomUser.objects.create_user(email="org@example.com", user_type="organization")
+        self.api, self.admin, self.logo = (
+            Project.objects.create(profile=organization.profile, project_description=text, terms_of_contract="Hourly")
+            for text in ("REST APIs in Django", "Django admin theme", "Logo design for a bakery")
+        )
+        for project in (self.api, self.admin, self.logo):
+            project.required_skills.add(python)
+        refresh_text_matches(full=True)
+
+    def scores(self):
+        return dict(TextMatch.objects.filter(profile__user=self.freelancer).values_list("project_id", "score"))
+
+    def test_closer_descriptions_score_higher(self):
+        scores = self.scores()
+        self.assertGreater(scores[self.api.id], scores[self.admin.id])
+        self.assertNotIn(self.logo.id, scores)
+
+    def test_edited_projects_are_rescored_incrementally(self):
+        self.logo.project_description = "Django REST APIs for a bakery"
+        self.logo.save()
+        self.assertEqual(refresh_text_matches()["projects"], 1)
+        self.assertGreater(self.scores()[self.logo.id], self.scores()[self.admin.id])
+        self.assertEqual(refresh_text_matches()["projects"], 0)
+
+    def test_matches_page_ranks_equal_skill_matches_by_text(self):
+        self.client.force_login(self.freelancer)
+        response = self.client.get("/freelancer_matches/")
+        self.assertEqual([p.id for p in response.context["matched_projects"]], [self.api.id, self.admin.id, self.logo.id])
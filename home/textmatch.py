@@ -0,0 +1,328 @@
+import hashlib
+import heapq
+import math
+import re
+from array import array
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, Min
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from home.db import write_transaction
+from home.models import CustomUser, Experience, Profile, Project, TextMatch, TextTerm, TextVector
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional speedup, the pure Python scoring gives the same neighbours
+    np = sparse = None
+
+# Text matching between freelancers (bio plus experience roles and details)
+# and projects (description). refresh_text_matches() runs offline, from
+# manage.py refresh_text_matches: it tokenizes the texts that changed since the
+# last run, keeps their term counts and the vocabulary's document frequencies
+# up to date, and stores each freelancer's nearest projects by TF-IDF cosine
+# similarity in TextMatch. Requests only read those rows.
+
+PROFILE = TextVector.KindChoices.PROFILE
+PROJECT = TextVector.KindChoices.PROJECT
+
+TOP_K = 50            # projects kept per freelancer
+MIN_SCORE = 0.05      # weaker similarities are not stored
+BATCH_SIZE = 500
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOP_WORDS = frozenset(
+    "about an and are as at be been but by can do for from has have he her his i in into is it its "
+    "me my no not of on or our she so than that the their them they this to us was we were will "
+    "with you your".split()
+)
+
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def _pack(counts):
+    term_ids = sorted(counts)
+    return array('I', term_ids).tobytes() + array('I', (counts[term_id] for term_id in term_ids)).tobytes()
+
+
+def _unpack(data):
+    values = array('I')
+    values.frombytes(data)
+    half = len(values) // 2
+    return dict(zip(values[:half], values[half:]))
+
+
+# ---------- Indexing ----------
+
+def _owners(kind):
+    if kind == PROFILE:
+        return Profile.objects.filter(user__user_type=CustomUser.UserType.FREELANCER)
+    return Project.objects.all()
+
+
+def _texts(kind, ids):
+    if kind == PROJECT:
+        return dict(Project.objects.filter(id__in=ids).values_list('id', 'project_description'))
+    parts = {pk: [bio or ''] for pk, bio in _owners(PROFILE).filter(id__in=ids).values_list('id', 'bio')}
+    for profile_id, role, details in Experience.objects.filter(profile_id__in=parts) \
+            .order_by('id').values_list('profile_id', 'role', 'details'):
+        parts[profile_id] += [role, details or '']
+    return {pk: '\n'.join(texts) for pk, texts in parts.items()}
+
+
+def _count_documents(deltas):
+    """Apply per-term document count changes, one F() update per distinct delta."""
+    by_delta = defaultdict(list)
+    for term_id, n in deltas.items():
+        if n:
+            by_delta[n].append(term_id)
+    for n, term_ids in by_delta.items():
+        TextTerm.objects.filter(id__in=term_ids).update(documents=F('documents') + n)
+
+
+def _term_ids(terms):
+    TextTerm.objects.bulk_create([TextTerm(term=term) for term in terms], ignore_conflicts=True)
+    return dict(TextTerm.objects.filter(term__in=terms).values_list('term', 'id'))
+
+
+@write_transaction
+def _index_batch(kind, ids):
+    """Re-tokenize ``ids``; returns those whose text actually changed."""
+    existing = {vector.object_id: vector for vector in TextVector.objects.filter(kind=kind, object_id__in=ids)}
+    changed = {}
+    for pk, text in _texts(kind, ids).items():
+        digest = hashlib.md5(text.encode()).hexdigest()
+        if pk not in existing or existing[pk].digest != digest:
+            changed[pk] = (digest, Counter(tokenize(text)))
+    # Touched but unchanged, e.g. a profile saved with the same bio
+    TextVector.objects.filter(kind=kind, object_id__in=set(ids) - changed.keys()).update(stale=False)
+    if not changed:
+        return set()
+
+    term_ids = _term_ids({term for _, counts in changed.values() for term in counts})
+    deltas, vectors = Counter(), []
+    for pk, (digest, counts) in changed.items():
+        counts = {term_ids[term]: n for term, n in counts.items()}
+        if pk in existing:
+            deltas.subtract(_unpack(existing[pk].terms).keys())
+        deltas.update(counts.keys())
+        vectors.append(TextVector(kind=kind, object_id=pk, digest=digest, terms=_pack(counts)))
+    TextVector.objects.bulk_create(
+        vectors, update_conflicts=True, unique_fields=['kind', 'object_id'],
+        update_fields=['digest', 'terms', 'stale', 'indexed_at'],
+    )
+    _count_documents(deltas)
+    return set(changed)
+
+
+def _forget_terms(vectors):
+    """Take the terms of the ``vectors`` queryset out of the document counts."""
+    deltas = Counter()
+    for terms in vectors.values_list('terms', flat=True):
+        deltas.subtract(_unpack(terms).keys())
+    _count_documents(deltas)
+
+
+def count_deleted_vectors(ids):
+    """Document count changes for vectors about to be removed with a raw DELETE (account purge)."""
+    _forget_terms(TextVector.objects.filter(pk__in=ids))
+
+
+@write_transaction
+def _drop_removed(kind):
+    """Forget texts whose profile or project is gone, or is no longer a freelancer's."""
+    gone = TextVector.objects.filter(kind=kind).exclude(object_id__in=_owners(kind).values('id'))
+    _forget_terms(gone)
+    removed = set(gone.values_list('object_id', flat=True))
+    gone.delete()
+    if kind == PROFILE:
+        TextMatch.objects.filter(profile_id__in=removed).delete()
+    return removed
+
+
+def _index(kind, full):
+    _drop_removed(kind)
+    todo = _owners(kind).order_by('id')
+    if not full:
+        todo = todo.exclude(id__in=TextVector.objects.filter(kind=kind, stale=False).values('object_id'))
+    todo = list(todo.values_list('id', flat=True))
+    changed = set()
+    for start in range(0, len(todo), BATCH_SIZE):
+        changed |= _index_batch(kind, todo[start:start + BATCH_SIZE])
+    return changed
+
+
+# ---------- Scoring ----------
+
+def _idf():
+    # Smoothed, as in scikit-learn's TfidfVectorizer
+    total = TextVector.objects.count()
+    return {
+        term_id: math.log((1 + total) / (1 + documents)) + 1
+        for term_id, documents in TextTerm.objects.filter(documents__gt=0).values_list('id', 'documents')
+    }
+
+
+def _vectors(kind, idf, ids=None):
+    """``{object_id: {term_id: weight}}``: sublinear TF-IDF, L2-normalized."""
+    rows = TextVector.objects.filter(kind=kind)
+    if ids is not None:
+        rows = rows.filter(object_id__in=ids)
+    vectors = {}
+    for object_id, terms in rows.values_list('object_id', 'terms').iterator(chunk_size=2000):
+        weights = {term_id: (1 + math.log(n)) * idf.get(term_id, 0) for term_id, n in _unpack(terms).items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm:
+            vectors[object_id] = {term_id: w / norm for term_id, w in weights.items() if w}
+    return vectors
+
+
+def _nearest_python(queries, documents, k):
+    # An inverted index turns the sparse product into per-term accumulation
+    postings = defaultdict(list)
+    for doc_id, vector in documents.items():
+        for term_id, weight in vector.items():
+            postings[term_id].append((doc_id, weight))
+    nearest = {}
+    for query_id, vector in queries.items():
+        scores = defaultdict(float)
+        for term_id, weight in vector.items():
+            for doc_id, doc_weight in postings.get(term_id, ()):
+                scores[doc_id] += weight * doc_weight
+        nearest[query_id] = heapq.nlargest(k, ((s, doc_id) for doc_id, s in scores.items() if s >= MIN_SCORE))
+    return nearest
+
+
+def _csr(vectors, columns):
+    ids, indptr, indices, data = list(vectors), [0], [], []
+    for object_id in ids:
+        for term_id, weight in vectors[object_id].items():
+            indices.append(columns.setdefault(term_id, len(columns)))
+            data.append(weight)
+        indptr.append(len(indices))
+    return ids, (data, indices, indptr)
+
+
+def _nearest_sparse(queries, documents, k):
+    columns = {}
+    query_ids, query_parts = _csr(queries, columns)
+    doc_ids, doc_parts = _csr(documents, columns)
+    query_matrix = sparse.csr_matrix(query_parts, shape=(len(query_ids), len(columns)))
+    doc_matrix = sparse.csr_matrix(doc_parts, shape=(len(doc_ids), len(columns))).T.tocsc()
+
+    nearest = {}
+    for start in range(0, len(query_ids), BATCH_SIZE):
+        scores = (query_matrix[start:start + BATCH_SIZE] @ doc_matrix).tocsr()
+        for row in range(scores.shape[0]):
+            values = scores.data[scores.indptr[row]:scores.indptr[row + 1]]
+            cols = scores.indices[scores.indptr[row]:scores.indptr[row + 1]]
+            keep = values >= MIN_SCORE
+            values, cols = values[keep], cols[keep]
+            if len(values) > k:
+                best = np.argpartition(-values, k)[:k]
+                values, cols = values[best], cols[best]
+            nearest[query_ids[start + row]] = sorted(
+                ((float(score), doc_ids[col]) for score, col in zip(values, cols)), reverse=True,
+            )
+    return nearest
+
+
+@write_transaction
+def _store(profile_ids, matches):
+    """Replace the stored matches of ``profile_ids``; ``None`` means every profile."""
+    rows = TextMatch.objects.all() if profile_ids is None else TextMatch.objects.filter(profile_id__in=profile_ids)
+    rows.delete()
+    TextMatch.objects.bulk_create(
+        (TextMatch(profile_id=profile_id, project_id=project_id, score=score)
+         for profile_id, nearest in matches.items() for score, project_id in nearest),
+        batch_size=2000,
+    )
+
+
+def _merge_projects(changed_projects, projects, changed_profiles, idf, nearest, k):
+    """
+    Score every other freelancer against the changed projects and rewrite
+    the lists those projects were on or now make it into.
+    """
+    others = {pk: v for pk, v in _vectors(PROFILE, idf).items() if pk not in changed_profiles}
+    changed = {pk: projects[pk] for pk in changed_projects if pk in projects}
+    candidates = defaultdict(list)
+    for project_id, scored in nearest(changed, others, len(others)).items():
+        for score, profile_id in scored:
+            candidates[profile_id].append((score, project_id))
+
+    # A full list only takes candidates that beat its weakest entry
+    floor = {
+        profile_id: low
+        for profile_id, size, low in TextMatch.objects.values('profile_id')
+        .annotate(size=Count('id'), low=Min('score')).values_list('profile_id', 'size', 'low')
+        if size >= k
+    }
+    had = set(TextMatch.objects.filter(project_id__in=changed_projects).values_list('profile_id', flat=True))
+    affected = (had - changed_profiles) | {
+        profile_id for profile_id, scored in candidates.items() if max(scored)[0] > floor.get(profile_id, 0)
+    }
+
+    current = defaultdict(list)
+    kept = TextMatch.objects.filter(profile_id__in=affected).exclude(project_id__in=changed_projects) \
+        .values_list('profile_id', 'score', 'project_id')
+    for profile_id, score, project_id in kept.iterator(chunk_size=2000):
+        current[profile_id].append((score, project_id))
+    merged = {pk: heapq.nlargest(k, current[pk] + candidates.get(pk, [])) for pk in affected}
+    _store(list(merged), merged)
+    return merged
+
+
+def refresh_text_matches(full=False, k=TOP_K):
+    """
+    Reindex the texts edited since the last run (all of them with ``full``)
+    and update the stored matches they affect: changed freelancers get a new
+    list, and changed projects are merged into the lists they affect.
+    Scores of pairs neither side of which changed keep the IDF of the run
+    that computed them until the next full run.
+    """
+    changed_profiles, changed_projects = _index(PROFILE, full), _index(PROJECT, full)
+    if not full and not changed_profiles and not changed_projects:
+        return {'profiles': 0, 'projects': 0, 'lists': 0, 'matches': 0}
+
+    nearest = _nearest_sparse if sparse is not None else _nearest_python
+    idf = _idf()
+    projects = _vectors(PROJECT, idf)
+    profiles = _vectors(PROFILE, idf, None if full else changed_profiles)
+    matches = nearest(profiles, projects, k)
+    _store(None if full else changed_profiles, matches)
+
+    if not full and changed_projects:
+        matches.update(_merge_projects(changed_projects, projects, changed_profiles, idf, nearest, k))
+
+    return {
+        'profiles': len(changed_profiles), 'projects': len(changed_projects),
+        'lists': len(matches), 'matches': sum(len(scored) for scored in matches.values()),
+    }
+
+
+# ---------- Change tracking ----------
+
+def mark_stale(kind, ids):
+    """Queue texts for reindexing by the next refresh."""
+    TextVector.objects.filter(kind=kind, object_id__in=ids, stale=False).update(stale=True)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, **kwargs):
+    mark_stale(PROFILE, [instance.pk])
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def experience_changed(sender, instance, **kwargs):
+    mark_stale(PROFILE, [instance.profile_id])
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    mark_stale(PROJECT, [instance.pk])
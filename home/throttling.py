@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# Token-bucket rate limiting for the API. A bucket holds up to ``capacity``
+# tokens and refills at ``rate`` tokens per second; each request takes one.
+# Buckets live in a store shared by all worker processes, and every decision
+# is a single atomic read-modify-write there: no database query, no lock
+# held across requests.
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a small SQLite file of their own, shared by the processes of
+    one host. Each decision is one UPSERT, atomic under SQLite's write lock.
+    Nothing touches the application database.
+    """
+
+    # SQLite evaluates every SET expression against the old row, so the
+    # refill, the decision and the new level all come out of one statement
+    TAKE = """
+        INSERT INTO bucket (key, tokens, updated, expires, allowed) VALUES (:key, :capacity - 1, :now, :expires, 1)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = MIN(:capacity, tokens + (:now - updated) * :rate)
+                - (MIN(:capacity, tokens + (:now - updated) * :rate) >= 1),
+            allowed = MIN(:capacity, tokens + (:now - updated) * :rate) >= 1,
+            updated = :now,
+            expires = :expires
+        RETURNING allowed, tokens
+    """
+    PRUNE_EVERY = 1000  # decisions between deletions of idle buckets
+
+    def __init__(self, path=None):
+        self.path = str(path or settings.THROTTLE_SQLITE_PATH)
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")  # losing the last few decisions on a crash is fine
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL, updated REAL, "
+                "expires REAL, allowed INTEGER)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, rate, capacity):
+        """Take a token from ``key``'s bucket: ``(allowed, tokens left)``."""
+        now = time.time()
+        connection = self._connection()
+        allowed, tokens = connection.execute(self.TAKE, {
+            'key': key, 'rate': rate, 'capacity': capacity, 'now': now,
+            # A bucket idle this long is full again, the same as no row at all
+            'expires': now + capacity / rate,
+        }).fetchone()
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            connection.execute("DELETE FROM bucket WHERE expires < ?", (now,))
+        return bool(allowed), tokens
+
+
+class CacheBucketStore:
+    """
+    Buckets in the Django cache named by ``THROTTLE_CACHE``, for deployments
+    with several hosts. On Django's RedisCache the decision runs as a Lua
+    script, atomic in one round trip. Other backends read and write the
+    bucket in two calls, so concurrent requests may slip a token or two past
+    the limit.
+    """
+
+    SCRIPT = """
+        local key, rate, capacity, now = KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+        local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        local allowed = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+            allowed = 1
+        end
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'updated', tostring(now))
+        redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+        return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or settings.THROTTLE_CACHE]
+        self._script = None
+        client = getattr(self.cache, '_cache', None)
+        if hasattr(client, 'get_client'):  # django.core.cache.backends.redis.RedisCache
+            self._script = client.get_client(write=True).register_script(self.SCRIPT)
+
+    def take(self, key, rate, capacity):
+        now = time.time()
+        key = f'throttle:{key}'
+        if self._script is not None:
+            allowed, tokens = self._script(keys=[self.cache.make_key(key)], args=[rate, capacity, now])
+            return bool(allowed), float(tokens)
+
+        tokens, updated = self.cache.get(key, default=(capacity, now))
+        tokens = min(capacity, tokens + max(0, now - updated) * rate)
+        allowed = tokens >= 1
+        tokens -= allowed
+        self.cache.set(key, (tokens, now), timeout=capacity / rate)
+        return allowed, tokens
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.THROTTLE_STORE)()
+    return _store
+
+
+@receiver(setting_changed)
+def reset_bucket_store(setting, **kwargs):
+    global _store
+    if setting in ('THROTTLE_STORE', 'THROTTLE_SQLITE_PATH', 'THROTTLE_CACHE'):
+        _store = None
+
+
+def parse_rate(rate):
+    """DRF's ``"10/min"`` as a bucket: ``(tokens per second, capacity)``."""
+    count, period = rate.split('/')
+    seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(count) / seconds, int(count)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles views that set ``throttle_scope``, with the rate configured in
+    ``DEFAULT_THROTTLE_RATES`` under ``"<scope>.<kind>"`` (e.g.
+    ``"login.ip": "10/min"``). A scope without a rate for this kind is not
+    throttled by it.
+    """
+
+    kind = None
+
+    def get_bucket(self, request, view):
+        """The bucket this request draws from, or None to let it through."""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.kind}') if scope else None
+        bucket = self.get_bucket(request, view) if rate else None
+        if bucket is None:
+            return True
+
+        self.rate, capacity = parse_rate(rate)
+        allowed, self.tokens = get_bucket_store().take(f'{scope}.{self.kind}:{bucket}', self.rate, capacity)
+        return allowed
+
+    def wait(self):
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    """One bucket per signed-in user; anonymous requests are left to IPBucketThrottle."""
+    kind = 'user'
+
+    def get_bucket(self, request, view):
+        return request.user.pk if request.user.is_authenticated else None
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    """One bucket per client address (honours ``NUM_PROXIES`` like DRF's throttles)."""
+    kind = 'ip'
+
+    def get_bucket(self, request, view):
+        return self.get_ident(request)
+
+
+class EndpointBucketThrottle(TokenBucketThrottle):
+    """One bucket shared by all clients of the endpoint, to cap its total cost."""
+    kind = 'endpoint'
+
+    def get_bucket(self, request, view):
+        return 'all'
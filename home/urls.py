@@ -2,55 +2,62 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
-from home import views
+from home.views import lazy_view
 
 urlpatterns = [
-    path('', views.index, name='index'),
-    path("about/", views.about, name='about'),
-    path("engagements/", views.engagements, name='engagements'),  # Frontend page
-    path("network/", views.network, name='network'),
-    path("network/<int:user_id>/", views.connection_profile, name="connection_profile"),
-    path("network/<int:user_id>/remove/", views.remove_connection, name="remove_connection"),
-
-    path("freelancer_matches/", views.freelancer_matches, name='freelancer_matches'),
-    path('project/<int:project_id>/request/', views.send_match_request, name='send_match_request'),
-    path('organization_matches/', views.organization_match_requests, name='organization_match_requests'),
-    path('organization/match-requests/', views.organization_match_requests, name='organization_match_requests'),
-    path('organization/match-request/<int:pk>/respond/', views.respond_match_request, name='respond_match_request'),
-
-    path("portfolio/", views.portfolio, name='portfolio'),
-    path("delete_profile/", views.delete_profile, name='delete_profile'),
-    path('portfolio/engagements/', views.user_posts_view, name='user_posts'),
-    path('create-post/', views.create_post, name='create_post'),
-    path("post/<int:pk>/edit/", views.edit_post, name="edit_post"),
-    path("post/<int:pk>/delete/", views.delete_post, name="delete_post"),
-
-    path("signup/", views.signup, name='signup'),
-    path("login/", views.login_view, name='login'),  # HTML form login
-    path("logout/", views.logout_view, name='logout'),  # HTML logout
+    path('', lazy_view('pages.index'), name='index'),
+    path("about/", lazy_view('pages.about'), name='about'),
+    path("engagements/", lazy_view('pages.engagements'), name='engagements'),  # Frontend page
+    path("network/", lazy_view('pages.network', is_async=True), name='network'),
+    path("network/<int:user_id>/", lazy_view('pages.connection_profile', is_async=True), name="connection_profile"),
+    path("network/<int:user_id>/remove/", lazy_view('pages.remove_connection'), name="remove_connection"),
+
+    path("freelancer_matches/", lazy_view('matching.freelancer_matches', is_async=True), name='freelancer_matches'),
+    path('project/<int:project_id>/request/', lazy_view('matching.send_match_request'), name='send_match_request'),
+    path('organization_matches/', lazy_view('matching.organization_match_requests'), name='organization_match_requests'),
+    path('organization/match-requests/', lazy_view('matching.organization_match_requests'), name='organization_match_requests'),
+    path('organization/match-request/<int:pk>/respond/', lazy_view('matching.respond_match_request'), name='respond_match_request'),
+    path('organization/match-requests/bulk/', lazy_view('matching.bulk_respond_match_requests'), name='bulk_respond_match_requests'),
+    path('events/matches/', lazy_view('matching.match_events', is_async=True), name='match_events'),
+
+    path("portfolio/", lazy_view('pages.portfolio', is_async=True), name='portfolio'),
+    path("delete_profile/", lazy_view('pages.delete_profile'), name='delete_profile'),
+    path("portfolio/export/", lazy_view('pages.request_data_export'), name='request_data_export'),
+    path("portfolio/export/<int:pk>/", lazy_view('pages.download_data_export'), name='download_data_export'),
+    path('portfolio/engagements/', lazy_view('pages.user_posts_view'), name='user_posts'),
+    path('create-post/', lazy_view('pages.create_post'), name='create_post'),
+    path("post/<int:pk>/edit/", lazy_view('pages.edit_post'), name="edit_post"),
+    path("post/<int:pk>/delete/", lazy_view('pages.delete_post'), name="delete_post"),
+
+    path("signup/", lazy_view('pages.signup'), name='signup'),
+    path("login/", lazy_view('pages.login_view'), name='login'),  # HTML form login
+    path("logout/", lazy_view('pages.logout_view'), name='logout'),  # HTML logout
     
     # API for Engagements (Posts)
-    path("api/posts/", views.PostListView.as_view(), name='api-posts'),
+    path("api/posts/", lazy_view('api.PostListView', as_view=True), name='api-posts'),
 
     # Login, Logout and Register (SignUp) APIs
-    path('api/login/', views.LoginView.as_view(), name='api-login'),
-    path('api/logout/', views.LogoutView.as_view(), name='api-logout'),
-    path('api/register/', views.RegisterView.as_view(), name='api-register'),
-    path("api/profile/", views.UserProfileView.as_view(), name="api-profile"),
+    path('api/login/', lazy_view('api.LoginView', as_view=True), name='api-login'),
+    path('api/logout/', lazy_view('api.LogoutView', as_view=True), name='api-logout'),
+    path('api/register/', lazy_view('api.RegisterView', as_view=True), name='api-register'),
+    path("api/profile/", lazy_view('api.UserProfileView', as_view=True), name="api-profile"),
+    path("api/projects/", lazy_view('api.ProjectDiscoveryView', as_view=True), name="api-projects"),
+    path("api/skills/trending/", lazy_view('api.TrendingSkillsView', as_view=True), name="api-trending-skills"),
+    path("api/match-requests/", lazy_view('api.MatchRequestInboxView', as_view=True), name="api-match-requests"),
 
     #experience editing
-    path('experience/add/', views.add_experience, name='add_experience'),
-    path('experience/<int:pk>/edit/', views.edit_experience, name='edit_experience'),
-    path('experience/<int:pk>/delete/', views.delete_experience, name='delete_experience'),
-
-    path('project/add/', views.add_project, name='add_project'),
-    path('project/<int:pk>/edit/', views.edit_project, name='edit_project'),
-    path('project/<int:pk>/delete/', views.delete_project, name='delete_project'),
-
-    path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
-    path("admin-dashboard/delete_user/<int:user_id>/", views.admin_delete_user, name="admin_delete_user"),
-    path("admin-dashboard/delete_post/<int:post_id>/", views.admin_delete_post, name="admin_delete_post"),
-    path("admin-dashboard/delete_project/<int:project_id>/", views.admin_delete_project, name="admin_delete_project"),
+    path('experience/add/', lazy_view('pages.add_experience'), name='add_experience'),
+    path('experience/<int:pk>/edit/', lazy_view('pages.edit_experience'), name='edit_experience'),
+    path('experience/<int:pk>/delete/', lazy_view('pages.delete_experience'), name='delete_experience'),
+
+    path('project/add/', lazy_view('pages.add_project'), name='add_project'),
+    path('project/<int:pk>/edit/', lazy_view('pages.edit_project'), name='edit_project'),
+    path('project/<int:pk>/delete/', lazy_view('pages.delete_project'), name='delete_project'),
+
+    path('admin-dashboard/', lazy_view('admin.admin_dashboard'), name='admin_dashboard'),
+    path("admin-dashboard/delete_user/<int:user_id>/", lazy_view('admin.admin_delete_user'), name="admin_delete_user"),
+    path("admin-dashboard/delete_post/<int:post_id>/", lazy_view('admin.admin_delete_post'), name="admin_delete_post"),
+    path("admin-dashboard/delete_project/<int:project_id>/", lazy_view('admin.admin_delete_project'), name="admin_delete_project"),
 
 
 ]
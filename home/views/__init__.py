@@ -0,0 +1,62 @@
+"""
+Views, split by area so no worker pays for code it has not dispatched to yet:
+
+    pages     server-rendered pages: network, portfolio, posts, experiences, projects, auth
+    matching  match requests and the match event stream
+    api       DRF endpoints under /api/
+    admin     the superuser dashboard
+
+The URLconf refers to views through ``lazy_view``, so loading it imports
+none of these modules (nor DRF, the serializers or the forms); each one is
+imported on the first request routed to it. ``from home.views import X``
+keeps working and imports only the submodule defining ``X``.
+"""
+import functools
+from importlib import import_module
+
+SUBMODULES = ('pages', 'matching', 'api', 'admin')
+
+
+def _import_view(name):
+    for submodule in SUBMODULES:
+        module = import_module(f'{__name__}.{submodule}')
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def lazy_view(path, as_view=False, is_async=False):
+    """
+    URLconf stand-in for the view at ``"<submodule>.<name>"``, imported on
+    first dispatch. ``as_view`` calls ``as_view()`` on a class-based view;
+    ``is_async`` must be set for ``async def`` views, since Django decides
+    how to run a view before calling it.
+    """
+    module_name, name = path.rsplit('.', 1)
+
+    @functools.cache
+    def resolve():
+        view = getattr(import_module(f'{__name__}.{module_name}'), name)
+        return view.as_view() if as_view else view
+
+    if is_async:
+        async def view(request, *args, **kwargs):
+            return await resolve()(request, *args, **kwargs)
+    else:
+        def view(request, *args, **kwargs):
+            return resolve()(request, *args, **kwargs)
+
+    view.__name__ = view.__qualname__ = name
+    view.__module__ = f'{__name__}.{module_name}'
+    if as_view:
+        # APIView.as_view() is always csrf_exempt, and CsrfViewMiddleware reads
+        # the flag off the URLconf callback before the view is imported.
+        view.csrf_exempt = True
+    return view
+
+
+def __getattr__(name):
+    # Module-level __getattr__ (PEP 562): "from home.views import PostListView"
+    value = _import_view(name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,105 @@
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.shortcuts import render, redirect, get_object_or_404
+from home.dashboard import dashboard_stats
+from home.deletion import request_account_deletion
+from home.loaders import loaders_for
+from home.models import Post, CustomUser, Project, MatchRequest
+
+
+def is_admin(user):
+    return user.is_superuser
+
+@login_required
+@user_passes_test(is_admin)
+def admin_dashboard(request):
+    loaders = loaders_for(request)
+
+    # The users table lists everyone, so post authors, freelancers and project
+    # owners below all come from the identity map instead of a query per row.
+    users = list(CustomUser.objects.all())
+    projects = list(Project.objects.all())
+    loaders.prime(*users, *projects)
+
+    posts = list(Post.objects.all())
+    matches = list(MatchRequest.objects.all())
+    with loaders.batch():
+        loaders.attach(posts, 'user')
+        loaders.attach(matches, 'freelancer', 'project')
+        loaders.attach(projects, 'profile__user')
+
+    counts = dashboard_stats()
+    freelancer_count = counts['freelancers']
+    org_count = counts['organizations']
+    total_projects = counts['projects']
+    total_matches = counts['matches']
+    post_count = counts['posts']
+
+    stats = [
+        {'title': 'Total Users', 'value': counts['users'], 'color': 'primary'},
+        {'title': 'Freelancers', 'value': freelancer_count, 'color': 'success'},
+        {'title': 'Organizations', 'value': org_count, 'color': 'warning'},
+        {'title': 'Projects', 'value': total_projects, 'color': 'dark'},
+        {'title': 'Posts', 'value': post_count, 'color': 'info'},
+        {'title': 'Matches', 'value': total_matches, 'color': 'secondary'}
+    ]
+
+
+    context = {
+        'stats': stats,
+        'users': users,
+        'posts': posts,
+        'projects': projects,
+        'matches': matches,
+        'freelancer_count': freelancer_count,
+        'org_count': org_count,
+        'total_projects': total_projects,
+        'total_matches': total_matches,
+        'post_count': post_count,
+    }
+    return render(request, 'admin_dashboard.html', context)
+
+User = get_user_model()
+
+@login_required
+def admin_delete_user(request, user_id):
+    if not request.user.is_superuser:
+        messages.error(request, "Unauthorized access.")
+        return redirect('admin_dashboard')
+
+    try:
+        user_to_delete = User.objects.get(pk=user_id)
+        if user_to_delete == request.user:
+            messages.error(request, "You cannot delete yourself.")
+        else:
+            request_account_deletion(user_to_delete)
+            messages.success(request, "User disabled; their data is being deleted in the background.")
+    except User.DoesNotExist:
+        messages.error(request, "User not found.")
+    
+    return redirect('admin_dashboard')
+
+@login_required
+def admin_delete_post(request, post_id):
+    if not request.user.is_superuser:
+        messages.error(request, "Unauthorized access.")
+        return redirect('admin_dashboard')
+
+    try:
+        post = Post.objects.get(id=post_id)
+        post.delete()
+        messages.success(request, "Post deleted successfully.")
+    except Post.DoesNotExist:
+        messages.error(request, "Post not found.")
+
+    return redirect('admin_dashboard')
+
+@login_required
+def admin_delete_project(request, project_id):
+    if not request.user.is_superuser:
+        return redirect("portfolio")
+
+    project = get_object_or_404(Project, id=project_id)
+    project.delete()
+    return redirect("admin_dashboard")
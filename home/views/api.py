@@ -0,0 +1,196 @@
+import json
+
+from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework import generics, status
+from rest_framework.generics import RetrieveUpdateDestroyAPIView
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from home.analytics import trending_skills
+from home.db import write_transaction
+from home.discovery import filter_projects, parse_filters, project_facets
+from home.eager import EagerLoadingMixin
+from home.etags import post_list_etag, profile_etag
+from home.inbox import match_inbox
+from home.models import Post, Profile
+from home.renderers import FastJSONRenderer, stream_json_array
+from home.serializers import PostSerializer, ProfileSerializer, MatchRequestSerializer, ProjectSerializer
+from home.sync import SyncTokenExpired, decode_sync_token, new_sync_token, post_changes
+
+
+class MatchRequestInboxView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.user_type != 'organization':
+            return Response({"error": "Only organizations have a match request inbox"},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        inbox = match_inbox(request.user, request.query_params)
+        return Response({
+            "results": MatchRequestSerializer(inbox['match_requests'], many=True).data,
+            "counts": inbox['counts'],
+            "next_cursor": inbox['next_cursor'],
+        })
+
+
+User = get_user_model()
+
+class RegisterView(APIView):
+    throttle_scope = 'register'
+
+    def post(self, request):
+        data = json.loads(request.body)
+
+        user = User.objects.create_user(
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            email=data["email"],
+            password=data["password"],
+            user_type=data["user_type"]
+        )
+
+        user.backend = 'django.contrib.auth.backends.ModelBackend'
+        login(request, user)
+
+        return JsonResponse({"message": "User created successfully"})
+
+class LoginView(APIView):
+    permission_classes = [AllowAny]
+    throttle_scope = 'login'
+
+    def post(self, request):
+        email = request.data.get("email")
+        password = request.data.get("password")
+        user = authenticate(request, username=email, password=password)
+
+        if user is not None:
+            login(request, user)
+            return redirect("/engagements/")
+        else:
+            return Response({"error": "Invalid email or password"}, status=status.HTTP_401_UNAUTHORIZED)
+
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        logout(request)
+        return redirect("/login/")
+
+class SessionCheckView(APIView):
+    def get(self, request):
+        if request.user.is_authenticated:
+            return JsonResponse({"isAuthenticated": True, "username": request.user.username})
+        return JsonResponse({"isAuthenticated": False})
+
+@method_decorator(condition(etag_func=post_list_etag), name='get')
+class PostListView(EagerLoadingMixin, generics.ListCreateAPIView):
+    """
+    Full list by default. With ?since=<sync_token> only posts created or edited
+    since the token are returned, plus the ids of deleted posts. Every response
+    carries the token for the next sync in the X-Sync-Token header. JSON
+    clients can ask for the full list with ?stream=1 to have it streamed.
+    """
+    queryset = Post.objects.all()
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'posts'
+
+    def list(self, request, *args, **kwargs):
+        since_token = request.query_params.get('since')
+        if since_token is None:
+            next_token = new_sync_token()
+            stream = request.query_params.get('stream') == '1'
+            if stream and isinstance(request.accepted_renderer, FastJSONRenderer):
+                response = self.stream_list(request)
+            else:
+                response = super().list(request, *args, **kwargs)
+            response['X-Sync-Token'] = next_token
+            return response
+
+        since = decode_sync_token(since_token)
+        if since is None:
+            return Response({"error": "Invalid sync token"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            changed, deleted, next_token = post_changes(since)
+        except SyncTokenExpired:
+            return Response({"error": "Sync token expired, fetch the full list"}, status=status.HTTP_410_GONE)
+
+        serializer = self.get_serializer(self.eager_load(changed), many=True)
+        response = Response({"posts": serializer.data, "deleted": deleted, "sync_token": next_token})
+        response['X-Sync-Token'] = next_token
+        return response
+
+    def stream_list(self, request):
+        """
+        Same JSON as PostSerializer, built by PostSerializer.from_values() from
+        a .values() projection and streamed row by row instead of serializing
+        model instances.
+        """
+        viewer_id = request.user.id
+        rows = Post.objects.values(*PostSerializer.values_fields).iterator(chunk_size=2000)
+        return StreamingHttpResponse(
+            stream_json_array(PostSerializer.from_values(row, viewer_id) for row in rows),
+            content_type='application/json',
+        )
+
+    def perform_create(self, serializer):
+        write_transaction(serializer.save)(user=self.request.user)
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['request'] = self.request
+        return context
+
+class ProjectDiscoveryPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ProjectDiscoveryView(EagerLoadingMixin, generics.ListAPIView):
+    """
+    Browse projects by required skills (?skills=Python,Django&match=any|all),
+    status and organization industry, with facet counts for the sidebar.
+    """
+    serializer_class = ProjectSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ProjectDiscoveryPagination
+
+    def get_queryset(self):
+        self.filters = parse_filters(self.request.query_params)
+        return self.eager_load(filter_projects(self.filters).order_by('-id'))
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['facets'] = project_facets(self.filters)
+        return response
+
+class TrendingSkillsView(APIView):
+    """Top skills by demand, supply and gap over the last ?days=30, limited to ?limit=10."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 365)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return Response({"error": "days and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"days": days, **trending_skills(days=days, limit=limit)})
+
+@method_decorator(condition(etag_func=profile_etag), name='get')
+class UserProfileView(EagerLoadingMixin, RetrieveUpdateDestroyAPIView):
+    serializer_class = ProfileSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        profile = self.eager_load(Profile.objects.filter(user=self.request.user)).first()
+        if profile is None:
+            profile = Profile.objects.create(user=self.request.user)
+        return profile
@@ -0,0 +1,261 @@
+import asyncio
+import functools
+import json
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from home.analytics import PROJECT_SKILLS
+from home.caching import get_or_compute
+from home.cooccurrence import expand_skills
+from home.counters import adjust_collaborators, adjust_connections, adjust_pending_requests
+from home.db import gather_reads, write_transaction
+from home.etags import bump_profile_versions
+from home.events import get_broadcast, publish_match_event
+from home.inbox import match_inbox
+from home.models import Project, MatchRequest, Connection, Profile, Tag, TextMatch
+from home.tasks import accept_match_request
+
+
+MATCHES_TIMEOUT = 60
+
+
+def _rank_matches(user_id):
+    """
+    ``[(project_id, related_match, match_score)]`` for the projects sharing at
+    least one skill with the freelancer, exact skill matches first, best first.
+    The counts run over the filtered join, so they count the skills the two
+    have in common; the text score was precomputed by refresh_text_matches.
+    """
+    skill_ids = set(Tag.objects.filter(profile__user_id=user_id).values_list('id', flat=True))
+    related_ids = set()
+    if settings.MATCH_RELATED_SKILLS:
+        # Also match projects asking for skills often listed with the freelancer's
+        related_ids = set(expand_skills(skill_ids))
+
+    text_score = TextMatch.objects.filter(profile__user_id=user_id, project=OuterRef('pk')).values('score')[:1]
+    required = PROJECT_SKILLS.objects.filter(project_id=OuterRef('pk')).order_by() \
+        .values('project_id').annotate(n=Count('*')).values('n')
+    rows = Project.objects.filter(required_skills__in=skill_ids | related_ids).exclude(profile__user_id=user_id) \
+        .annotate(
+            shared_skills=Count('required_skills', distinct=True),
+            own_skills=Count('required_skills', filter=Q(required_skills__in=skill_ids), distinct=True),
+            required=Subquery(required),
+            text_score=Subquery(text_score),
+        ).values_list('id', 'shared_skills', 'own_skills', 'required', 'text_score')
+
+    weight = settings.TEXT_MATCH_WEIGHT
+    ranking = []
+    for project_id, shared_skills, own_skills, required, text_score in rows:
+        skill_score = shared_skills / required if required else 0
+        match_score = (1 - weight) * skill_score + weight * (text_score or 0)
+        ranking.append((project_id, bool(related_ids) and not own_skills, match_score))
+    ranking.sort(key=lambda match: (match[1], -match[2]))
+    return ranking
+
+
+@login_required
+async def freelancer_matches(request):
+    user = await request.auser()
+    if user.user_type != 'freelancer':
+        return redirect('portfolio')  # safety redirect for non-freelancers
+
+    # The ranking is cached per freelancer and recomputed by one request at a
+    # time; editing the profile's skills bumps its version and so refreshes it.
+    # New and edited projects show up once the entry expires.
+    version = await Profile.objects.filter(user=user).values_list('version', flat=True).afirst()
+    ranking = await sync_to_async(get_or_compute)(
+        f'freelancer_matches:{user.id}', functools.partial(_rank_matches, user.id), MATCHES_TIMEOUT,
+        version=version,
+    )
+
+    # The ranked projects and the freelancer's match request statuses, fetched concurrently
+    projects, match_statuses = await gather_reads(
+        Project.objects.filter(id__in=[project_id for project_id, _, _ in ranking])
+        .select_related('profile').prefetch_related('required_skills'),
+        MatchRequest.objects.filter(freelancer=user).values_list('project_id', 'status'),
+    )
+
+    # Attach the match request status to each project
+    projects = {project.id: project for project in projects}
+    match_statuses = dict(match_statuses)
+    matched_projects = []
+    for project_id, related_match, match_score in ranking:
+        project = projects.get(project_id)
+        if project is None:
+            continue  # deleted since the ranking was computed
+        project.match_status = match_statuses.get(project_id)
+        project.related_match = related_match
+        project.match_score = match_score
+        matched_projects.append(project)
+
+    return await sync_to_async(render)(request, "freelancer_matches.html", {
+        "matched_projects": matched_projects,
+    })
+
+@login_required
+def send_match_request(request, project_id):
+    project = get_object_or_404(Project, id=project_id)
+
+    if request.user.user_type != 'freelancer':
+        return redirect('portfolio')
+
+    # Prevent duplicate
+    match, created = write_transaction(MatchRequest.objects.get_or_create)(
+        freelancer=request.user,
+        project=project
+    )
+
+    if created:
+        # success message could go here
+        pass
+
+    return redirect("freelancer_matches")
+
+
+@login_required
+def organization_match_requests(request):
+    if request.user.user_type != 'organization':
+        return redirect('portfolio')
+
+    context = match_inbox(request.user, request.GET)
+    context['projects'] = Project.objects.filter(profile__user=request.user) \
+        .only('id', 'project_description', 'pending_requests_count')
+    context['status_choices'] = MatchRequest.StatusChoices.choices
+
+    return render(request, 'organization_matches.html', context)
+
+
+@write_transaction
+def _accept_match_request(match_request):
+    match_request.status = MatchRequest.StatusChoices.ACCEPTED
+    match_request.save()
+
+    # Connections and collaborator are added by the worker
+    accept_match_request.enqueue(
+        match_request_id=match_request.id,
+        idempotency_key=f"accept_match_request:{match_request.id}",
+    )
+
+
+@write_transaction
+def _reject_match_request(match_request):
+    match_request.status = MatchRequest.StatusChoices.REJECTED
+    match_request.save()
+
+
+@login_required
+def respond_match_request(request, pk):
+    match_request = get_object_or_404(MatchRequest, id=pk, project__profile__user=request.user)
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+
+        if action == 'accept':
+            _accept_match_request(match_request)
+
+        elif action == 'reject':
+            _reject_match_request(match_request)
+
+    return redirect('organization_match_requests')
+
+
+@write_transaction
+def _bulk_respond_match_requests(organization, ids, action):
+    # Ownership check: only pending requests on the organization's own projects
+    match_requests = list(
+        MatchRequest.objects.filter(
+            id__in=ids,
+            project__profile__user=organization,
+            status=MatchRequest.StatusChoices.PENDING,
+        ).only('id', 'freelancer_id', 'project_id', 'status')
+    )
+    if not match_requests:
+        return 0
+
+    new_status = (
+        MatchRequest.StatusChoices.ACCEPTED if action == 'accept'
+        else MatchRequest.StatusChoices.REJECTED
+    )
+    MatchRequest.objects.filter(id__in=[m.id for m in match_requests]).update(status=new_status)
+    adjust_pending_requests(((m.freelancer_id, m.project_id) for m in match_requests), -1)
+
+    if action == 'accept':
+        freelancer_ids = {m.freelancer_id for m in match_requests}
+        connections = {(f, organization.id) for f in freelancer_ids} | {(organization.id, f) for f in freelancer_ids}
+        connections -= set(Connection.objects.filter(
+            Q(user_id__in=freelancer_ids, connected_to_id=organization.id)
+            | Q(user_id=organization.id, connected_to_id__in=freelancer_ids)
+        ).values_list('user_id', 'connected_to_id'))
+        collaborators = {(m.project_id, m.freelancer_id) for m in match_requests}
+        collaborators -= set(Project.collaborators.through.objects.filter(
+            project_id__in={project_id for project_id, _ in collaborators}, customuser_id__in=freelancer_ids,
+        ).values_list('project_id', 'customuser_id'))
+
+        Connection.objects.bulk_create(
+            [Connection(user_id=user_id, connected_to_id=other_id) for user_id, other_id in connections],
+            ignore_conflicts=True,
+        )
+        Project.collaborators.through.objects.bulk_create(
+            [Project.collaborators.through(project_id=project_id, customuser_id=freelancer_id)
+             for project_id, freelancer_id in collaborators],
+            ignore_conflicts=True,
+        )
+        # bulk_create skips post_save and m2m_changed, so refresh the profile
+        # ETags and counters here
+        bump_profile_versions(user_id__in=[organization.id] + [m.freelancer_id for m in match_requests])
+        adjust_connections(Counter(user_id for user_id, _ in connections))
+        adjust_collaborators(Counter(project_id for project_id, _ in collaborators))
+
+    # update() skips post_save, so announce the changes here
+    for m in match_requests:
+        m.status = new_status
+        publish_match_event(m, organization_id=organization.id)
+
+    return len(match_requests)
+
+
+@login_required
+def bulk_respond_match_requests(request):
+    if request.method == 'POST' and request.user.user_type == 'organization':
+        action = request.POST.get('action')
+        ids = [i for i in request.POST.getlist('ids') if i.isdigit()]
+
+        if action in ('accept', 'reject') and ids:
+            count = _bulk_respond_match_requests(request.user, ids, action)
+            verb = 'accepted' if action == 'accept' else 'rejected'
+            messages.success(request, f"{count} match request(s) {verb}.")
+
+    return redirect('organization_match_requests')
+
+
+@login_required
+async def match_events(request):
+    """Server-Sent Events stream of match request changes for the current user."""
+    user = await request.auser()
+    broadcast = get_broadcast()
+
+    async def stream():
+        entry = broadcast.subscribe(user.id)
+        _, queue = entry
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broadcast.unsubscribe(user.id, entry)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
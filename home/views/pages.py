@@ -0,0 +1,457 @@
+import os
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
+from home.cooccurrence import related_skill_names
+from home.db import gather_reads, write_transaction
+from home.deletion import request_account_deletion
+from home.exports import is_expired, start_export
+from home.forms import ExperienceForm, PostForm, ProjectForm
+from home.models import Post, CustomUser, Profile, Experience, Tag, Project, Connection, DataExport
+from home.skills import canonical_tag_ids
+
+
+def index(request):
+    return render(request, 'index.html')
+
+def about(request):
+    return render(request, 'about.html')
+
+@login_required
+async def network(request):
+    user = await request.auser()
+
+    # Get all connections for current user
+    connection_entries = Connection.objects.filter(user=user).select_related('connected_to__profile')
+
+    # Extract the connected users
+    connections = [entry.connected_to async for entry in connection_entries]
+
+    return await sync_to_async(render)(request, "network.html", {
+        "connections": connections
+    })
+
+
+@login_required
+async def connection_profile(request, user_id):
+    user = await request.auser()
+    target_user = await aget_object_or_404(CustomUser, id=user_id)
+
+    # Only connections may see the profile; check before reading any of it
+    if not await Connection.objects.filter(user=user, connected_to=target_user).aexists():
+        return redirect("network")
+
+    # Collaborative projects between the logged-in user and the target user
+    if user.user_type == 'freelancer':
+        collaborations = Project.objects.filter(profile__user=target_user, collaborators=user)
+    else:
+        collaborations = Project.objects.filter(profile__user=user, collaborators=target_user)
+    collaborations = collaborations.distinct().select_related('profile__user')
+
+    # Organization projects minus the collaborations (to avoid duplicates)
+    projects = Project.objects.filter(profile__user=target_user) \
+        .exclude(id__in=collaborations.values('id')) \
+        .prefetch_related('required_skills')
+
+    # None of these depend on each other, so they run concurrently
+    profile, user_posts, experiences, projects, skills, collaborations = await gather_reads(
+        Profile.objects.select_related('user').filter(user=target_user).get,
+        Post.objects.filter(user=target_user),
+        Experience.objects.filter(profile__user=target_user) if target_user.user_type == 'freelancer' else list,
+        projects if target_user.user_type == 'organization' else list,
+        Tag.objects.filter(profile__user=target_user),
+        collaborations,
+    )
+
+    profile_picture = profile.profile_picture if hasattr(profile, 'profile_picture') else None
+
+    return await sync_to_async(render)(request, "connection_profile.html", {
+        "target_user": target_user,
+        "profile_picture": profile_picture,
+        "profile": profile,
+        "posts": user_posts,
+        "experiences": experiences,
+        "projects": projects,
+        "skills": skills,
+        "is_connected": True,
+        "collaborations": collaborations
+    })
+
+
+@login_required
+def remove_connection(request, user_id):
+    target_user = get_object_or_404(CustomUser, id=user_id)
+
+    # Remove both sides of the connection
+    Connection.objects.filter(user=request.user, connected_to=target_user).delete()
+    Connection.objects.filter(user=target_user, connected_to=request.user).delete()
+
+    return redirect("network")
+
+
+@login_required
+async def portfolio(request):
+    user = await request.auser()
+    profile, created = await Profile.objects.select_related('user').aget_or_create(user=user)
+
+    if request.method == "POST":
+        await sync_to_async(_update_portfolio)(request, user, profile)
+        return redirect("portfolio")
+
+    experiences, skills, projects, user_posts, latest_export = await gather_reads(
+        profile.experiences.all(),
+        profile.skills.values_list('id', 'name'),
+        Project.objects.filter(profile=profile).prefetch_related('required_skills', 'collaborators'),
+        Post.objects.filter(user=user),
+        DataExport.objects.filter(user=user).first,
+    )
+
+    # Predefined skill tags
+    skills_list = [
+        "Python", "JavaScript", "Django", "React", "Machine Learning",
+        "UI/UX", "DevOps", "Project Management", "Data Analysis"
+    ]
+    # Plus skills often listed together with the user's own
+    skill_names = [name for _, name in skills]
+    related = await sync_to_async(related_skill_names)([tag_id for tag_id, _ in skills])
+    skills_list += [name for name in related if name not in skills_list and name not in skill_names]
+
+    return await sync_to_async(render)(request, 'portfolio.html', {
+        "latest_export": latest_export,
+        "profile": profile,
+        "experiences": experiences,
+        "user_type": user.user_type,
+        "user_posts": user_posts,
+        "skill_names": skill_names,
+        "skills_list": skills_list,
+        "projects": projects,
+    })
+
+
+def _update_portfolio(request, user, profile):
+    profile.bio = request.POST.get("bio", "")
+    profile.website = request.POST.get("website", "")
+    profile.industry = request.POST.get("industry", "")
+
+    if user.user_type == "organization":
+        profile.company_name = request.POST.get("company_name", "")
+        profile.industry = request.POST.get("industry", "")
+    else:
+        # Social links
+        linkedin = request.POST.get("linkedin", "").strip()
+        github = request.POST.get("github", "").strip()
+        profile.social_links = {
+            "linkedin": linkedin,
+            "github": github
+        }
+    if request.FILES.get("profile_picture"):
+        profile.profile_picture = request.FILES["profile_picture"]
+
+    profile.save()
+
+    # Skills
+    selected_skills = request.POST.get("skills", "")
+    skill_names_input = [s.strip() for s in selected_skills.split(",") if s.strip()]
+    tag_ids = canonical_tag_ids(skill_names_input)
+    profile.skills.set(dict.fromkeys(tag_ids[name] for name in skill_names_input if name in tag_ids))
+
+    messages.success(request, "Profile updated successfully.")
+
+@login_required
+def delete_profile(request):
+    if request.method == 'POST':
+        user = request.user
+
+        # Lock the account now; the worker removes it with all associated data
+        request_account_deletion(user)
+        logout(request)
+
+        # Add a success message
+        messages.success(request, "Your profile has been deleted successfully.")
+        
+        # Redirect to a page after deletion (e.g., homepage or login page)
+        return redirect('index')  # Adjust the redirect to your homepage or login URL
+
+    return redirect('profile')  # If the method is not POST, stay on the profile page
+    
+@login_required
+def request_data_export(request):
+    if request.method == 'POST':
+        _, created = start_export(request.user)
+        if created:
+            messages.success(request, "Your data export has started. We'll email you a download link when it is ready.")
+        else:
+            messages.info(request, "Your data export is already being prepared. We'll email you when it is ready.")
+    return redirect('portfolio')
+
+@login_required
+def download_data_export(request, pk):
+    export = get_object_or_404(DataExport, pk=pk, user=request.user, status=DataExport.StatusChoices.DONE)
+    path = os.path.join(settings.EXPORTS_ROOT, export.file_path)
+    if is_expired(export) or not os.path.exists(path):
+        raise Http404("Export file no longer exists")
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=export.file_path)
+
+@login_required
+def engagements(request):
+    return render(request, 'engagements.html')
+
+@login_required
+def create_post(request):
+    if request.method == "POST":
+        form = PostForm(request.POST)
+        if form.is_valid():
+            post = form.save(commit=False)
+            post.user = request.user
+            write_transaction(post.save)()
+            return redirect("portfolio")  # Redirect back to portfolio
+    else:
+        form = PostForm()
+    return render(request, "create_post.html", 
+                  { "form": form,
+                    "title": "Create Post",
+                    "button_text": "Post",
+    })
+
+@login_required
+def edit_post(request, pk):
+    post = get_object_or_404(Post, pk=pk, user=request.user)
+    if request.method == 'POST':
+        form = PostForm(request.POST, instance=post)
+        if form.is_valid():
+            form.save()
+            return redirect('portfolio')
+    else:
+        form = PostForm(instance=post)
+    return render(request, "create_post.html",{
+        "form": form,
+        "title": "Edit Post",
+        "button_text": "Save Changes",
+    })
+
+@login_required
+def delete_post(request, pk):
+    post = get_object_or_404(Post, pk=pk, user=request.user)
+    if request.method == 'POST':
+        post.delete()
+        return redirect('portfolio')
+
+
+def signup(request):
+    if request.method == 'POST':
+        first_name = request.POST.get("first_name")
+        last_name = request.POST.get("last_name")
+        email = request.POST.get("email")
+        user_type = request.POST.get("user_type")
+        password = request.POST.get("password")
+        confirm_password = request.POST.get("confirm_password")
+
+        try:
+            validate_email(email)
+        except ValidationError:
+            return render(request, 'register.html', {"error": "Invalid email format"})
+
+        if password != confirm_password:
+            return render(request, 'register.html', {"error": "Passwords do not match"})
+
+        if CustomUser.objects.filter(email=email).exists():
+            return render(request, 'register.html', {"error": "Email already registered"})
+
+        try:
+            user = CustomUser.objects.create_user(
+                email=email,
+                password=password,
+                first_name=first_name,
+                last_name=last_name,
+                user_type=user_type
+            )
+            user.save()
+            print(f"User created successfully: {user}")
+            return redirect("/login/")
+
+        except Exception as e:
+            print(f"Error creating user: {e}")
+            return render(request, 'register.html', {"error": "User creation failed. Please try again."})
+
+    return render(request, 'register.html')
+
+def login_view(request):
+    if request.method == 'POST':
+        email = request.POST.get("email")
+        password = request.POST.get("password")
+        user = authenticate(request, username=email, password=password)
+
+        if user is not None:
+            login(request, user)
+            return redirect('/engagements/')
+
+        messages.error(request, "Invalid email or password")
+        return render(request, "login.html")
+
+    return render(request, 'login.html')
+
+def logout_view(request):
+    if request.method == 'POST':
+        logout(request)
+        request.session.flush()
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({"message": "Logout successful", "redirect": "/login/"}, status=200)
+        return redirect("login")
+
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
+
+@login_required
+def add_experience(request):
+    profile = get_object_or_404(Profile, user=request.user)
+    if request.method == 'POST':
+        form = ExperienceForm(request.POST)
+        if form.is_valid():
+            experience = form.save(commit=False)
+            experience.profile = profile
+            experience.save()
+            messages.success(request, "Experience added successfully!")
+            return redirect('portfolio')  # Change to your actual portfolio URL name
+    else:
+        form = ExperienceForm()
+    return render(request, 'experience_form.html', {'form': form, 'title': 'Add Experience'})
+
+@login_required
+def edit_experience(request, pk):
+    experience = get_object_or_404(Experience, pk=pk, profile__user=request.user)
+    if request.method == 'POST':
+        form = ExperienceForm(request.POST, instance=experience)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Experience updated successfully!")
+            return redirect('portfolio')
+    else:
+        form = ExperienceForm(instance=experience)
+    return render(request, 'experience_form.html', {'form': form, 'title': 'Edit Experience'})
+    
+
+@login_required
+def delete_experience(request, pk):
+    experience = get_object_or_404(Experience, pk=pk, profile__user=request.user)
+    if request.method == 'POST':
+        experience.delete()
+        return redirect('portfolio')
+    messages.success(request, "Experience deleted successfully!")
+    return render(request, 'confirm_delete.html', {'object': experience})
+
+@login_required
+def user_posts_view(request):
+    user_posts = Post.objects.filter(user=request.user)
+    return render(request, 'portfolio/user_posts.html', {'user_posts': user_posts})
+
+@login_required
+def add_project(request):
+    profile = request.user.profile
+    skills_list = [
+        "Python", "JavaScript", "Django", "React", "Machine Learning",
+        "UI/UX", "DevOps", "Project Management", "Data Analysis"
+    ]
+
+    if request.method == 'POST':
+        # Get raw input for skills
+        raw_skills = request.POST.get('required_skills', '')
+
+        # Create a mutable copy of POST to inject valid tag IDs
+        post_data = request.POST.copy()
+        skill_names = [s.strip() for s in raw_skills.split(',') if s.strip()]
+        # Spellings of an existing skill ("python", "Python ") map onto its tag
+        canonical = canonical_tag_ids(skill_names)
+        tag_ids = [str(tag_id) for tag_id in dict.fromkeys(canonical[name] for name in skill_names)]
+
+        # Replace raw skills with actual tag IDs so the form can validate
+        post_data.setlist('required_skills', tag_ids)
+
+        # Now pass the modified POST to the form
+        form = ProjectForm(post_data)
+
+        if form.is_valid():
+            project = form.save(commit=False)
+            project.profile = profile
+            project.save()
+            form.save_m2m()  # Save required_skills
+            return redirect("portfolio")
+        else:
+            print("Form errors:", form.errors)
+
+    else:
+        form = ProjectForm()
+
+    return render(request, "project_form.html", {
+        "form": form,
+        "heading": "Add New Project",
+        "button_text": "Add Project",
+        "is_delete": False,
+        "skills_list": skills_list,
+        "required_skill_names": [],
+    })
+
+
+
+@login_required
+def edit_project(request, pk):
+    profile = request.user.profile
+    project = get_object_or_404(Project, pk=pk, profile=profile)
+
+    skills_list = [
+        "Python", "JavaScript", "Django", "React", "Machine Learning",
+        "UI/UX", "DevOps", "Project Management", "Data Analysis"
+    ]
+
+    if request.method == 'POST':
+        raw_skills = request.POST.get('required_skills', '')
+        post_data = request.POST.copy()
+
+        # Convert skill names to tag IDs
+        skill_names = [s.strip() for s in raw_skills.split(',') if s.strip()]
+        # Spellings of an existing skill ("python", "Python ") map onto its tag
+        canonical = canonical_tag_ids(skill_names)
+        tag_ids = [str(tag_id) for tag_id in dict.fromkeys(canonical[name] for name in skill_names)]
+
+        post_data.setlist('required_skills', tag_ids)
+
+        
+        form = ProjectForm(post_data, instance=project)
+
+        if form.is_valid():
+            project = form.save(commit=False)
+            project.profile = profile
+            project.save()
+            form.save_m2m()
+
+            return redirect('portfolio')
+        else:
+            print("Form errors:", form.errors)
+    else:
+        form = ProjectForm(instance=project)
+
+    required_skill_names = [tag.name for tag in project.required_skills.all()]
+
+    return render(request, "project_form.html", {
+        "form": form,
+        "heading": "Edit Project",
+        "button_text": "Edit Project",
+        "is_delete": False,
+        "skills_list": skills_list,
+        "required_skill_names": required_skill_names,
+    })
+
+
+@login_required
+def delete_project(request, pk):
+    project = get_object_or_404(Project, pk=pk, profile=request.user.profile)
+    if request.method == 'POST':
+        project.delete()
+        return redirect('portfolio')
+    return redirect('portfolio')  # fallback in case someone hits the URL directly